@@ -0,0 +1,41 @@
+"""add faturamento_diario rollup
+
+Revision ID: 8f2b1d4c6a10
+Revises: 3c7684031f65
+Create Date: 2026-10-18 16:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2b1d4c6a10'
+down_revision: Union[str, Sequence[str], None] = '3c7684031f65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('faturamento_diario',
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('forma_pagamento', sa.String(length=50), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('dia', 'forma_pagamento')
+    )
+    # Popula o rollup com os pagamentos já existentes.
+    op.execute(
+        "INSERT INTO faturamento_diario (dia, forma_pagamento, total, quantidade) "
+        "SELECT DATE(created_at), forma_pagamento, SUM(valor), COUNT(id) "
+        "FROM pagamentos WHERE status = 'pago' AND created_at IS NOT NULL "
+        "GROUP BY DATE(created_at), forma_pagamento"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('faturamento_diario')
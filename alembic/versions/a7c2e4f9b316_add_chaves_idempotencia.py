@@ -0,0 +1,46 @@
+"""add chaves_idempotencia
+
+Revision ID: a7c2e4f9b316
+Revises: f3b8d2a6c915
+Create Date: 2026-10-18 23:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e4f9b316'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d2a6c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'chaves_idempotencia',
+        sa.Column('chave', sa.String(length=32), nullable=False),
+        sa.Column('impressao', sa.String(length=32), nullable=False),
+        sa.Column('dono', sa.String(length=32), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('corpo', sa.LargeBinary(), nullable=True),
+        sa.Column('expira_em', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('chave'),
+    )
+    op.create_index(
+        op.f('ix_chaves_idempotencia_expira_em'),
+        'chaves_idempotencia',
+        ['expira_em'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_chaves_idempotencia_expira_em'), table_name='chaves_idempotencia'
+    )
+    op.drop_table('chaves_idempotencia')
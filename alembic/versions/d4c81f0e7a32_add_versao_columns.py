@@ -0,0 +1,35 @@
+"""add versao columns for etags
+
+Revision ID: d4c81f0e7a32
+Revises: b71e3a9d2c45
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4c81f0e7a32'
+down_revision: Union[str, Sequence[str], None] = 'b71e3a9d2c45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABELAS = ('pedidos', 'produtos', 'entregas', 'pagamentos')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabela in TABELAS:
+        op.add_column(
+            tabela,
+            sa.Column('versao', sa.Integer(), nullable=False, server_default='1'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabela in TABELAS:
+        op.drop_column(tabela, 'versao')
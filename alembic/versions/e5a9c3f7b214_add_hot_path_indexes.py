@@ -0,0 +1,58 @@
+"""add hot path indexes, drop redundant ones
+
+Revision ID: e5a9c3f7b214
+Revises: d4c81f0e7a32
+Create Date: 2026-10-18 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3f7b214'
+down_revision: Union[str, Sequence[str], None] = 'd4c81f0e7a32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nome, tabela, colunas) dos índices usados pelas consultas quentes.
+NOVOS = (
+    # JOIN do relatório de pedidos por cliente.
+    ('ix_pedidos_cliente_id', 'pedidos', ['cliente_id']),
+    # Pagamentos e entregas de um pedido (inclusive o cascade do DELETE).
+    ('ix_pagamentos_pedido_id', 'pagamentos', ['pedido_id']),
+    ('ix_entregas_pedido_id', 'entregas', ['pedido_id']),
+    # Reconstrução do faturamento: status = 'pago', agrupado por dia.
+    ('ix_pagamentos_status_created_at', 'pagamentos', ['status', 'created_at']),
+    # Relatório de estoque baixo: qtd_estoque < limite.
+    ('ix_produtos_qtd_estoque', 'produtos', ['qtd_estoque']),
+)
+
+# Índices redundantes (a chave primária já é indexada) ou sem consulta que
+# os use (texto livre), que só encarecem as escritas.
+REDUNDANTES = (
+    ('ix_clientes_id', 'clientes', ['id']),
+    ('ix_produtos_id', 'produtos', ['id']),
+    ('ix_pedidos_id', 'pedidos', ['id']),
+    ('ix_entregas_id', 'entregas', ['id']),
+    ('ix_pagamentos_id', 'pagamentos', ['id']),
+    ('ix_pedidos_descricao', 'pedidos', ['descricao']),
+    ('ix_entregas_endereco', 'entregas', ['endereco']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for nome, tabela, colunas in NOVOS:
+        op.create_index(nome, tabela, colunas, unique=False)
+    for nome, tabela, _ in REDUNDANTES:
+        op.drop_index(nome, table_name=tabela)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for nome, tabela, colunas in REDUNDANTES:
+        op.create_index(nome, tabela, colunas, unique=False)
+    for nome, tabela, _ in NOVOS:
+        op.drop_index(nome, table_name=tabela)
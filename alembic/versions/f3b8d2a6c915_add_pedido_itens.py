@@ -0,0 +1,46 @@
+"""add pedido_itens
+
+Revision ID: f3b8d2a6c915
+Revises: e5a9c3f7b214
+Create Date: 2026-10-18 21:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2a6c915'
+down_revision: Union[str, Sequence[str], None] = 'e5a9c3f7b214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'pedido_itens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('pedido_id', sa.Integer(), nullable=False),
+        sa.Column('produto_id', sa.Integer(), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('preco_unitario', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['pedido_id'], ['pedidos.id'], ),
+        sa.ForeignKeyConstraint(['produto_id'], ['produtos.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_pedido_itens_pedido_id'), 'pedido_itens', ['pedido_id'], unique=False
+    )
+    op.create_index(
+        op.f('ix_pedido_itens_produto_id'), 'pedido_itens', ['produto_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pedido_itens_produto_id'), table_name='pedido_itens')
+    op.drop_index(op.f('ix_pedido_itens_pedido_id'), table_name='pedido_itens')
+    op.drop_table('pedido_itens')
@@ -0,0 +1,133 @@
+"""Comandos administrativos do EasyOrder.
+
+Uso:
+    python -m app.admin reconstruir-faturamento
+    python -m app.admin importar clientes clientes.csv [--lote 1000]
+    python -m app.admin purgar-idempotencia [--lote 500]
+    python -m app.admin purgar-outbox [--lote 500] [--retencao 604800]
+    python -m app.admin reprocessar-outbox
+"""
+
+import argparse
+from pathlib import Path
+
+from app import crud, idempotencia, importacao, outbox
+from app.database import SessionLocal
+
+
+def reconstruir_faturamento(args: argparse.Namespace) -> None:
+    """Recalcula do zero o rollup `faturamento_diario`."""
+    db = SessionLocal()
+    try:
+        linhas = crud.reconstruir_faturamento_diario(db)
+    finally:
+        db.close()
+    print(f"✅ Faturamento diário reconstruído ({linhas} linhas).")
+
+
+def importar(args: argparse.Namespace) -> None:
+    """Importa um arquivo CSV/NDJSON de clientes, produtos ou pedidos."""
+    linhas = importacao.ler_arquivo(args.arquivo, args.formato)
+    db = SessionLocal()
+    try:
+        resultado = importacao.importar(db, args.entidade, linhas, args.lote)
+    finally:
+        db.close()
+
+    print(
+        f"✅ {resultado.lidos} lidos, {resultado.inseridos} inseridos, "
+        f"{resultado.duplicados} duplicados, {resultado.erros} com erro."
+    )
+    for mensagem in resultado.mensagens_erro:
+        print(f"⚠️ {mensagem}")
+
+
+def purgar_idempotencia(args: argparse.Namespace) -> None:
+    """Remove as chaves de idempotência vencidas, em lotes."""
+    db = SessionLocal()
+    try:
+        removidas = idempotencia.purgar_expiradas(db, args.lote)
+    finally:
+        db.close()
+    print(f"✅ {removidas} chaves de idempotência vencidas removidas.")
+
+
+def purgar_outbox(args: argparse.Namespace) -> None:
+    """Remove os eventos já enviados da outbox, em lotes."""
+    db = SessionLocal()
+    try:
+        removidos = outbox.purgar_enviados(db, args.retencao, args.lote)
+    finally:
+        db.close()
+    print(f"✅ {removidos} eventos enviados removidos da outbox.")
+
+
+def reprocessar_outbox(args: argparse.Namespace) -> None:
+    """Devolve à fila os eventos da outbox com status `falhou`."""
+    db = SessionLocal()
+    try:
+        devolvidos = outbox.reprocessar_falhados(db)
+    finally:
+        db.close()
+    print(f"✅ {devolvidos} eventos da outbox devolvidos à fila.")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Comandos administrativos do EasyOrder.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    reconstruir = comandos.add_parser(
+        "reconstruir-faturamento",
+        help="Recalcula o rollup de faturamento diário a partir dos pagamentos.",
+    )
+    reconstruir.set_defaults(executar=reconstruir_faturamento)
+
+    importar_cmd = comandos.add_parser(
+        "importar", help="Importa clientes, produtos ou pedidos de um CSV/NDJSON."
+    )
+    importar_cmd.add_argument("entidade", choices=sorted(importacao.ENTIDADES))
+    importar_cmd.add_argument("arquivo", type=Path)
+    importar_cmd.add_argument(
+        "--formato", choices=["csv", "ndjson"], help="Padrão: deduzido pela extensão."
+    )
+    importar_cmd.add_argument(
+        "--lote", type=int, default=importacao.TAMANHO_LOTE_PADRAO,
+        help="Registros por INSERT/commit.",
+    )
+    importar_cmd.set_defaults(executar=importar)
+
+    purgar = comandos.add_parser(
+        "purgar-idempotencia", help="Remove as chaves de idempotência vencidas."
+    )
+    purgar.add_argument(
+        "--lote", type=int, default=idempotencia.IDEMPOTENCIA_PURGA_LOTE,
+        help="Chaves removidas por DELETE/commit.",
+    )
+    purgar.set_defaults(executar=purgar_idempotencia)
+
+    purgar_outbox_cmd = comandos.add_parser(
+        "purgar-outbox", help="Remove os eventos da outbox já enviados."
+    )
+    purgar_outbox_cmd.add_argument(
+        "--lote", type=int, default=outbox.OUTBOX_PURGA_LOTE,
+        help="Eventos removidos por DELETE/commit.",
+    )
+    purgar_outbox_cmd.add_argument(
+        "--retencao", type=int, default=outbox.OUTBOX_RETENCAO,
+        help="Idade mínima (s) dos eventos enviados removidos.",
+    )
+    purgar_outbox_cmd.set_defaults(executar=purgar_outbox)
+
+    reprocessar = comandos.add_parser(
+        "reprocessar-outbox",
+        help="Devolve à fila os eventos da outbox que esgotaram as tentativas.",
+    )
+    reprocessar.set_defaults(executar=reprocessar_outbox)
+
+    args = parser.parse_args(argv)
+    args.executar(args)
+
+
+if __name__ == "__main__":
+    main()
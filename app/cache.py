@@ -0,0 +1,279 @@
+"""Cache read-through das consultas por ID (clientes, pedidos, produtos...).
+
+Guarda o schema Pydantic já serializado de cada entidade, então o valor em
+cache não depende de nenhuma sessão do banco. O backend padrão é um LRU em
+memória com TTL, seguro para as threads do threadpool; outro backend (ex.:
+Redis, compartilhado entre instâncias) pode ser ligado com `usar_backend`,
+implementando `BackendCache`. Cada escrita invalida as chaves que afeta.
+
+Configuração: CACHE_BACKEND (memoria|desligado), CACHE_CAPACIDADE, CACHE_TTL.
+
+Os resultados dos relatórios ficam em um cache à parte (`relatorios`), com
+idade máxima RELATORIOS_MAX_STALENESS e invalidação por relatório.
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import wraps
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app import singleflight
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memoria")
+CACHE_CAPACIDADE = int(os.getenv("CACHE_CAPACIDADE", "10000"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+# Idade máxima (segundos) de um relatório em cache; 0 desliga o cache.
+RELATORIOS_MAX_STALENESS = float(os.getenv("RELATORIOS_MAX_STALENESS", "30"))
+
+
+class BackendCache(ABC):
+    """Interface dos backends de cache.
+
+    `marca()` devolve um contador de invalidações: `definir` recebe a marca
+    lida antes da consulta ao banco e não grava se houve invalidação desde
+    então, evitando repor no cache um valor que uma escrita já tornou velho.
+    """
+
+    @abstractmethod
+    def obter(self, chave: str):
+        """Retorna o valor em cache, ou None se ausente ou expirado."""
+
+    @abstractmethod
+    def definir(self, chave: str, valor, marca: int | None = None) -> None:
+        """Grava o valor, se não houve invalidação desde `marca`."""
+
+    @abstractmethod
+    def invalidar(self, *chaves: str) -> None:
+        """Remove as chaves do cache."""
+
+    @abstractmethod
+    def marca(self) -> int:
+        """Retorna o contador atual de invalidações."""
+
+    @abstractmethod
+    def limpar(self) -> None:
+        """Remove todas as entradas."""
+
+    @abstractmethod
+    def metricas(self) -> dict:
+        """Retorna os contadores do cache."""
+
+
+class CacheLRU(BackendCache):
+    """LRU em memória com TTL, protegido por lock."""
+
+    def __init__(self, capacidade: int = CACHE_CAPACIDADE, ttl: float = CACHE_TTL):
+        """Cria o cache vazio com a capacidade e o TTL (segundos) informados."""
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._dados: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._invalidacoes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirados = 0
+
+    def obter(self, chave: str):
+        """Retorna o valor em cache, ou None se ausente ou expirado."""
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                self.misses += 1
+                return None
+            expira_em, valor = item
+            if expira_em <= time.monotonic():
+                del self._dados[chave]
+                self.expirados += 1
+                self.misses += 1
+                return None
+            self._dados.move_to_end(chave)
+            self.hits += 1
+            return valor
+
+    def definir(self, chave: str, valor, marca: int | None = None) -> None:
+        """Grava o valor, descartando o menos usado se passar da capacidade."""
+        with self._lock:
+            if marca is not None and marca != self._invalidacoes:
+                return
+            self._dados[chave] = (time.monotonic() + self.ttl, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.capacidade:
+                self._dados.popitem(last=False)
+                self.evictions += 1
+
+    def invalidar(self, *chaves: str) -> None:
+        """Remove as chaves do cache."""
+        with self._lock:
+            self._invalidacoes += 1
+            for chave in chaves:
+                self._dados.pop(chave, None)
+
+    def marca(self) -> int:
+        """Retorna o contador atual de invalidações."""
+        with self._lock:
+            return self._invalidacoes
+
+    def limpar(self) -> None:
+        """Remove todas as entradas (os contadores são mantidos)."""
+        with self._lock:
+            self._invalidacoes += 1
+            self._dados.clear()
+
+    def metricas(self) -> dict:
+        """Retorna hits, misses, evictions, expirados e tamanho atual."""
+        with self._lock:
+            return {
+                "backend": "memoria",
+                "tamanho": len(self._dados),
+                "capacidade": self.capacidade,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirados": self.expirados,
+            }
+
+
+class CacheDesligado(BackendCache):
+    """Backend nulo: toda leitura vai ao banco."""
+
+    def obter(self, chave: str):
+        """Sempre ausente."""
+        return None
+
+    def definir(self, chave: str, valor, marca: int | None = None) -> None:
+        """Não grava nada."""
+
+    def invalidar(self, *chaves: str) -> None:
+        """Nada a invalidar."""
+
+    def marca(self) -> int:
+        """Sempre zero."""
+        return 0
+
+    def limpar(self) -> None:
+        """Nada a limpar."""
+
+    def metricas(self) -> dict:
+        """Indica que o cache está desligado."""
+        return {"backend": "desligado"}
+
+
+backend: BackendCache = CacheDesligado() if CACHE_BACKEND == "desligado" else CacheLRU()
+
+
+def usar_backend(novo: BackendCache) -> None:
+    """Troca o backend do cache (ex.: por um compartilhado entre instâncias)."""
+    global backend
+    backend = novo
+
+
+def chave(entidade: str, id_: int) -> str:
+    """Monta a chave de cache de uma entidade."""
+    return f"{entidade}:{id_}"
+
+
+def invalidar(entidade: str, *ids: int) -> None:
+    """Invalida as entradas de uma entidade pelos IDs."""
+    backend.invalidar(*(chave(entidade, id_) for id_ in ids))
+
+
+def em_cache(entidade: str, schema: type[BaseModel]):
+    """Decora uma função `(db, id) -> modelo | None` com leitura via cache.
+
+    No miss, o registro é convertido em `schema` e gravado; o retorno é
+    sempre o schema (ou None, que não é guardado). Misses concorrentes da
+    mesma chave fazem uma única consulta (single-flight).
+    """
+
+    def decorador(
+        buscar: Callable[[Session, int], object]
+    ) -> Callable[[Session, int], BaseModel | None]:
+        @wraps(buscar)
+        def obter(db: Session, id_: int) -> BaseModel | None:
+            chave_cache = chave(entidade, id_)
+            valor = backend.obter(chave_cache)
+            if valor is not None:
+                return valor
+
+            def carregar() -> BaseModel | None:
+                marca = backend.marca()
+                registro = buscar(db, id_)
+                if registro is None:
+                    return None
+                valor = schema.model_validate(registro)
+                backend.definir(chave_cache, valor, marca)
+                return valor
+
+            return singleflight.grupo.executar(chave_cache, carregar)
+
+        return obter
+
+    return decorador
+
+
+class CacheRelatorios:
+    """Resultados de relatórios por (relatório, parâmetros).
+
+    Cada relatório tem um número de geração que faz parte da chave; invalidar
+    um relatório incrementa a geração, tornando inacessíveis todas as suas
+    entradas de uma vez (o LRU as descarta depois). Um cálculo que termina
+    após a invalidação grava na geração antiga e não é servido.
+    """
+
+    def __init__(
+        self, max_staleness: float = RELATORIOS_MAX_STALENESS, capacidade: int = 1000
+    ):
+        """Cria o cache com a idade máxima (segundos) das entradas."""
+        self.max_staleness = max_staleness
+        self._lru = CacheLRU(capacidade=capacidade, ttl=max_staleness)
+        self._lock = threading.Lock()
+        self._geracoes: dict[str, int] = {}
+
+    def obter(self, relatorio: str, parametros: tuple, calcular: Callable[[], object]):
+        """Retorna o resultado em cache ou o calcula (um cálculo por chave).
+
+        Returns:
+            tuple: O resultado e sua idade em segundos.
+        """
+        if self.max_staleness <= 0:
+            return calcular(), 0.0
+        with self._lock:
+            geracao = self._geracoes.get(relatorio, 0)
+        chave_cache = f"{relatorio}:{geracao}:{parametros!r}"
+
+        item = self._lru.obter(chave_cache)
+        if item is None:
+
+            def carregar():
+                novo = (time.time(), calcular())
+                self._lru.definir(chave_cache, novo)
+                return novo
+
+            item = singleflight.grupo.executar(f"relatorio:{chave_cache}", carregar)
+        gerado_em, valor = item
+        return valor, max(time.time() - gerado_em, 0.0)
+
+    def invalidar(self, *relatorios: str) -> None:
+        """Descarta os resultados em cache dos relatórios informados."""
+        with self._lock:
+            for relatorio in relatorios:
+                self._geracoes[relatorio] = self._geracoes.get(relatorio, 0) + 1
+
+    def limpar(self) -> None:
+        """Remove todos os resultados em cache."""
+        self._lru.limpar()
+
+    def metricas(self) -> dict:
+        """Retorna os contadores do cache de relatórios."""
+        return {**self._lru.metricas(), "max_staleness": self.max_staleness}
+
+
+relatorios = CacheRelatorios()
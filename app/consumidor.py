@@ -0,0 +1,291 @@
+"""Consumidor concorrente da fila SQS de eventos de pedidos.
+
+Cada worker faz long polling (até 10 mensagens, espera de 20 s), processa as
+mensagens e confirma as bem-sucedidas com um único delete_message_batch. Uma
+thread auxiliar estende o timeout de visibilidade das mensagens em
+processamento, para que handlers lentos não causem reentrega. Mensagens que
+falham são devolvidas à fila após `atraso_retentativa` segundos e, ao atingir
+`max_recebimentos`, vão para a fila de dead-letter (SQS_DLQ_URL).
+
+Uso como processo separado:
+    python -m app.consumidor
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+from app import sqs
+from app.sqs import MensagemInvalida, decodificar_mensagem
+
+logger = logging.getLogger(__name__)
+
+CONSUMIDOR_CONCORRENCIA = int(os.getenv("CONSUMIDOR_CONCORRENCIA", "4"))
+CONSUMIDOR_VISIBILIDADE = int(os.getenv("CONSUMIDOR_VISIBILIDADE", "30"))
+CONSUMIDOR_MAX_RECEBIMENTOS = int(os.getenv("CONSUMIDOR_MAX_RECEBIMENTOS", "5"))
+SQS_DLQ_URL = os.getenv("SQS_DLQ_URL", "")
+
+# Limites da API do SQS para receive_message.
+ESPERA_LONG_POLLING = 20
+MAXIMO_MENSAGENS_RECEBIMENTO = 10
+
+
+def _processar_pedido_criado(evento: dict) -> None:
+    logger.info(
+        "📦 Pedido %s criado para o cliente %s.",
+        evento.get("pedido_id"),
+        evento.get("cliente_id"),
+    )
+
+
+# Tipo do evento -> handler.
+HANDLERS: dict[str, Callable[[dict], None]] = {
+    "pedido.criado": _processar_pedido_criado,
+}
+
+
+def processar_evento(evento: dict) -> None:
+    """Encaminha o evento ao handler do seu tipo (tipos desconhecidos são ignorados)."""
+    handler = HANDLERS.get(evento.get("tipo"))
+    if handler is None:
+        logger.warning("Evento de tipo desconhecido ignorado: %s", evento.get("tipo"))
+        return
+    handler(evento)
+
+
+class ConsumidorSQS:
+    """Workers de long polling com confirmação em lote e dead-letter."""
+
+    def __init__(
+        self,
+        cliente,
+        url_fila: str,
+        processar: Callable[[dict], None] = processar_evento,
+        concorrencia: int = CONSUMIDOR_CONCORRENCIA,
+        visibilidade: float = CONSUMIDOR_VISIBILIDADE,
+        max_recebimentos: int = CONSUMIDOR_MAX_RECEBIMENTOS,
+        url_dlq: str | None = SQS_DLQ_URL or None,
+        espera: float = ESPERA_LONG_POLLING,
+        max_mensagens: int = MAXIMO_MENSAGENS_RECEBIMENTO,
+        atraso_retentativa: float = 5,
+    ):
+        """Configura o consumidor; as threads só começam em `iniciar()`.
+
+        Args:
+            cliente: Cliente boto3 SQS (ou `FilaMemoria` nos testes).
+            url_fila (str): URL da fila de origem.
+            processar (Callable[[dict], None]): Recebe o evento decodificado;
+                qualquer exceção conta como falha de processamento.
+            concorrencia (int): Quantidade de workers de long polling.
+            visibilidade (float): Timeout de visibilidade, em segundos,
+                renovado enquanto a mensagem está em processamento.
+            max_recebimentos (int): Recebimentos antes de enviar à dead-letter.
+            url_dlq (str | None): Fila de dead-letter; sem ela, as mensagens
+                ficam para a redrive policy da própria fila.
+            espera (float): WaitTimeSeconds do long polling.
+            max_mensagens (int): MaxNumberOfMessages por recebimento.
+            atraso_retentativa (float): Segundos até uma mensagem com falha
+                voltar a ficar visível.
+        """
+        self._cliente = cliente
+        self._url_fila = url_fila
+        self._processar = processar
+        self._concorrencia = concorrencia
+        self._visibilidade = visibilidade
+        self._max_recebimentos = max_recebimentos
+        self._url_dlq = url_dlq
+        self._espera = espera
+        self._max_mensagens = max_mensagens
+        self._atraso_retentativa = atraso_retentativa
+        self._parar = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        # ReceiptHandle -> instante em que a visibilidade expira.
+        self._em_processamento: dict[str, float] = {}
+        self.recebidas = 0
+        self.processadas = 0
+        self.falhas = 0
+        self.dead_letter = 0
+        self.extensoes = 0
+
+    def iniciar(self) -> None:
+        """Inicia os workers e a thread de extensão de visibilidade (idempotente)."""
+        if self._threads:
+            return
+        self._parar.clear()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"consumidor-{i}", daemon=True)
+            for i in range(self._concorrencia)
+        ]
+        self._threads.append(
+            threading.Thread(
+                target=self._estender_visibilidade, name="consumidor-vis", daemon=True
+            )
+        )
+        for thread in self._threads:
+            thread.start()
+
+    def parar(self, timeout: float = ESPERA_LONG_POLLING + 5) -> None:
+        """Sinaliza a parada e espera os recebimentos em andamento terminarem."""
+        self._parar.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def metricas(self) -> dict:
+        """Retorna os contadores do consumidor."""
+        with self._lock:
+            return {
+                "recebidas": self.recebidas,
+                "processadas": self.processadas,
+                "falhas": self.falhas,
+                "dead_letter": self.dead_letter,
+                "extensoes": self.extensoes,
+                "em_processamento": len(self._em_processamento),
+            }
+
+    def receber_e_processar(self) -> int:
+        """Faz um recebimento, processa as mensagens e confirma as concluídas.
+
+        Returns:
+            int: Quantidade de mensagens recebidas.
+        """
+        response = self._cliente.receive_message(
+            QueueUrl=self._url_fila,
+            MaxNumberOfMessages=self._max_mensagens,
+            WaitTimeSeconds=self._espera,
+            VisibilityTimeout=self._visibilidade,
+            AttributeNames=["ApproximateReceiveCount"],
+        )
+        mensagens = response.get("Messages", [])
+        if not mensagens:
+            return 0
+
+        prazo = time.monotonic() + self._visibilidade
+        with self._lock:
+            self.recebidas += len(mensagens)
+            for mensagem in mensagens:
+                self._em_processamento[mensagem["ReceiptHandle"]] = prazo
+
+        concluidas, repetir = [], []
+        try:
+            for mensagem in mensagens:
+                if self._processar_mensagem(mensagem):
+                    concluidas.append(mensagem)
+                else:
+                    repetir.append(mensagem)
+        finally:
+            with self._lock:
+                for mensagem in mensagens:
+                    self._em_processamento.pop(mensagem["ReceiptHandle"], None)
+
+        self._em_lote("delete_message_batch", concluidas)
+        self._em_lote(
+            "change_message_visibility_batch",
+            repetir,
+            VisibilityTimeout=self._atraso_retentativa,
+        )
+        return len(mensagens)
+
+    def _processar_mensagem(self, mensagem: dict) -> bool:
+        """Processa uma mensagem; retorna True se ela deve ser removida da fila."""
+        atributos = mensagem.get("Attributes", {})
+        recebimentos = int(atributos.get("ApproximateReceiveCount", 1))
+        try:
+            self._processar(decodificar_mensagem(mensagem["Body"]))
+        except MensagemInvalida as e:
+            logger.error("Mensagem %s inválida: %s", mensagem["MessageId"], e)
+            return self._enviar_dead_letter(mensagem)
+        except Exception:
+            logger.exception(
+                "Falha ao processar a mensagem %s (recebimento %d).",
+                mensagem["MessageId"],
+                recebimentos,
+            )
+            with self._lock:
+                self.falhas += 1
+            if recebimentos >= self._max_recebimentos:
+                return self._enviar_dead_letter(mensagem)
+            return False
+
+        with self._lock:
+            self.processadas += 1
+        return True
+
+    def _enviar_dead_letter(self, mensagem: dict) -> bool:
+        """Copia a mensagem para a dead-letter; retorna True se foi copiada."""
+        if not self._url_dlq:
+            return False
+        try:
+            self._cliente.send_message(
+                QueueUrl=self._url_dlq, MessageBody=mensagem["Body"]
+            )
+        except Exception as e:
+            logger.error("Erro ao enviar mensagem para a dead-letter: %s", e)
+            return False
+        logger.warning("Mensagem %s enviada à dead-letter.", mensagem["MessageId"])
+        with self._lock:
+            self.dead_letter += 1
+        return True
+
+    def _em_lote(self, operacao: str, mensagens: list[dict], **extras) -> None:
+        """Aplica uma operação *_batch da SQS às mensagens, em grupos de 10."""
+        for inicio in range(0, len(mensagens), sqs.TAMANHO_LOTE_SQS):
+            entradas = [
+                {"Id": str(i), "ReceiptHandle": m["ReceiptHandle"], **extras}
+                for i, m in enumerate(mensagens[inicio:inicio + sqs.TAMANHO_LOTE_SQS])
+            ]
+            try:
+                response = getattr(self._cliente, operacao)(
+                    QueueUrl=self._url_fila, Entries=entradas
+                )
+            except Exception as e:
+                logger.error("Erro em %s: %s", operacao, e)
+                continue
+            for falha in response.get("Failed", []):
+                logger.error("%s falhou para %s: %s", operacao, falha["Id"], falha)
+
+    def _worker(self) -> None:
+        """Laço de um worker: recebe e processa até a parada."""
+        while not self._parar.is_set():
+            try:
+                self.receber_e_processar()
+            except Exception:
+                logger.exception("Erro ao receber mensagens da SQS.")
+                self._parar.wait(1)
+
+    def _estender_visibilidade(self) -> None:
+        """Renova a visibilidade das mensagens cujo prazo está na metade final."""
+        while not self._parar.wait(self._visibilidade / 3):
+            agora = time.monotonic()
+            with self._lock:
+                vencendo = [
+                    recibo
+                    for recibo, prazo in self._em_processamento.items()
+                    if prazo - agora < self._visibilidade / 2
+                ]
+                for recibo in vencendo:
+                    self._em_processamento[recibo] = agora + self._visibilidade
+                self.extensoes += len(vencendo)
+            self._em_lote(
+                "change_message_visibility_batch",
+                [{"ReceiptHandle": recibo} for recibo in vencendo],
+                VisibilityTimeout=self._visibilidade,
+            )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if not sqs.sqs_configurado():
+        raise SystemExit("SQS não configurado (defina SQS_QUEUE_URL).")
+    consumidor = ConsumidorSQS(sqs.sqs_client, sqs.SQS_QUEUE_URL)
+    consumidor.iniciar()
+    logger.info("Consumidor SQS em execução com %d workers.", CONSUMIDOR_CONCORRENCIA)
+    try:
+        while True:
+            time.sleep(60)
+            logger.info("Consumidor SQS: %s", consumidor.metricas())
+    except KeyboardInterrupt:
+        consumidor.parar()
@@ -1,8 +1,99 @@
 """Funções CRUD para clientes, pedidos e relatórios."""
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app import models, schemas
+import json
+from collections.abc import Callable
+from datetime import date
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app import cache, leitura_rapida, models, schemas
+from app.paginacao import paginar
+
+
+class ProdutoNaoEncontrado(LookupError):
+    """Um ou mais produtos de um pedido não existem."""
+
+    def __init__(self, produto_ids: list[int]):
+        """Guarda os IDs dos produtos inexistentes."""
+        super().__init__(f"Produtos não encontrados: {produto_ids}")
+        self.produto_ids = produto_ids
+
+
+class EstoqueInsuficiente(ValueError):
+    """Um ou mais produtos não têm estoque para a quantidade pedida."""
+
+    def __init__(self, produto_ids: list[int]):
+        """Guarda os IDs dos produtos sem estoque suficiente."""
+        super().__init__(f"Estoque insuficiente para os produtos: {produto_ids}")
+        self.produto_ids = produto_ids
+
+
+class ProdutoEmUso(ValueError):
+    """O produto aparece em itens de pedidos e não pode ser removido."""
+
+    def __init__(self, produto_id: int):
+        """Guarda o ID do produto referenciado."""
+        super().__init__(
+            f"Produto {produto_id} está em itens de pedidos e não pode ser removido."
+        )
+        self.produto_id = produto_id
+
+
+# Relatórios em cache, invalidados pelas escritas que os afetam.
+RELATORIO_PEDIDOS_POR_CLIENTE = "pedidos-por-cliente"
+RELATORIO_FATURAMENTO = "faturamento"
+RELATORIO_ESTOQUE_BAIXO = "produtos-estoque-baixo"
+
+
+def obter_versao(db: Session, modelo, id_: int) -> int | None:
+    """Lê só a coluna `versao` de uma linha pela chave primária (para ETags)."""
+    return db.scalar(select(modelo.versao).where(modelo.id == id_))
+
+
+def _atualizar(db: Session, entidade: str, id_: int, valores: dict, *condicoes):
+    """Executa um único `UPDATE ... WHERE id = :id` e incrementa `versao`.
+
+    Com RETURNING (SQLite, PostgreSQL), a linha atualizada volta no próprio
+    UPDATE; sem ele (MySQL), o rowcount decide se houve linha e uma leitura
+    na mesma transação traz as colunas da resposta. Não faz commit.
+
+    Returns:
+        A linha atualizada (colunas da resposta), ou None se nenhuma linha
+        atendeu `id = :id` e as `condicoes`.
+    """
+    coluna_id = leitura_rapida.COLUNAS[entidade][0]
+    tabela = coluna_id.table
+    stmt = (
+        update(tabela)
+        .where(coluna_id == id_, *condicoes)
+        .values(**valores, versao=tabela.c.versao + 1)
+    )
+    if db.get_bind().dialect.update_returning:
+        return db.execute(stmt.returning(*leitura_rapida.colunas(entidade))).first()
+    if db.execute(stmt).rowcount == 0:
+        return None
+    return leitura_rapida.obter(db, entidade, id_)
+
+
+def _deletar(db: Session, entidade: str, id_: int):
+    """Executa um único `DELETE ... WHERE id = :id` (com RETURNING se houver).
+
+    Sem RETURNING, a linha é lida (e travada) antes, na mesma transação.
+    Não faz commit.
+
+    Returns:
+        A linha removida (colunas da resposta), ou None se não existia.
+    """
+    coluna_id = leitura_rapida.COLUNAS[entidade][0]
+    stmt = delete(coluna_id.table).where(coluna_id == id_)
+    if db.get_bind().dialect.delete_returning:
+        return db.execute(stmt.returning(*leitura_rapida.colunas(entidade))).first()
+    consulta = select(*leitura_rapida.colunas(entidade)).where(coluna_id == id_)
+    linha = db.execute(consulta.with_for_update()).first()
+    if linha is not None:
+        db.execute(stmt)
+    return linha
 
 
 # Clientes
@@ -11,55 +102,255 @@ def criar_cliente(db: Session, cliente: schemas.ClienteCreate) -> models.Cliente
     db_cliente = models.Cliente(**cliente.model_dump())
     db.add(db_cliente)
     db.commit()
+    cache.relatorios.invalidar(RELATORIO_PEDIDOS_POR_CLIENTE)
     db.refresh(db_cliente)
     return db_cliente
 
 
-def listar_clientes(db: Session, skip: int = 0, limit: int = 10) -> list:
-    """Lista todos os clientes com paginação."""
-    return db.query(models.Cliente).offset(skip).limit(limit).all()
+def listar_clientes(
+    db: Session,
+    apos_id: int | None = None,
+    limit: int = 10,
+    incluir_pedidos: bool = False,
+) -> list:
+    """Lista os clientes com paginação por cursor (IDs maiores que `apos_id`).
+
+    Com `incluir_pedidos`, os pedidos da página inteira são carregados em uma
+    única consulta extra (selectin). Sem ele, só as colunas do cliente são
+    lidas: as linhas não têm `pedidos`, e a resposta omite o campo.
+    """
+    if incluir_pedidos:
+        query = db.query(models.Cliente).options(selectinload(models.Cliente.pedidos))
+    else:
+        query = db.query(models.Cliente.id, models.Cliente.nome, models.Cliente.email)
+    return paginar(query, models.Cliente.id, apos_id, limit).all()
+
+
+@cache.em_cache("cliente", schemas.Cliente)
+def obter_cliente(db: Session, cliente_id: int) -> schemas.Cliente | None:
+    """Obtém um cliente pelo ID, já com seus pedidos carregados (via cache)."""
+    return (
+        db.query(models.Cliente)
+        .options(selectinload(models.Cliente.pedidos))
+        .filter(models.Cliente.id == cliente_id)
+        .first()
+    )
 
 
-def obter_cliente(db: Session, cliente_id: int) -> models.Cliente | None:
-    """Obtém um cliente pelo ID."""
-    return db.query(models.Cliente).filter(models.Cliente.id == cliente_id).first()
+# Pedidos
+EVENTO_PEDIDO_CRIADO = "pedido.criado"
+
+
+def _evento_pedido_criado(pedido_id: int, cliente_id: int, valor_total) -> dict:
+    """Monta a linha da outbox que anuncia um pedido criado."""
+    return {
+        "tipo": EVENTO_PEDIDO_CRIADO,
+        "payload": json.dumps(
+            {
+                "pedido_id": pedido_id,
+                "cliente_id": cliente_id,
+                "valor_total": str(valor_total),
+            }
+        ),
+    }
+
+
+def _somar_itens(itens: list[schemas.PedidoItemCreate]) -> dict[int, int]:
+    """Agrupa as quantidades por produto (um produto pode vir em vários itens)."""
+    quantidades: dict[int, int] = {}
+    for item in itens:
+        produto_id = item.produto_id
+        quantidades[produto_id] = quantidades.get(produto_id, 0) + item.quantidade
+    return quantidades
 
 
-# Pedidos
 def criar_pedido(
-    db: Session, pedido: schemas.PedidoCreate, cliente_id: int
+    db: Session,
+    pedido: schemas.PedidoCreate,
+    cliente_id: int,
+    antes_do_commit: Callable[[models.Pedido], None] | None = None,
 ) -> models.Pedido:
-    """Cria um novo pedido associado a um cliente."""
-    db_pedido = models.Pedido(**pedido.model_dump(), cliente_id=cliente_id)
+    """Cria um novo pedido associado a um cliente.
+
+    O evento `pedido.criado` é gravado na outbox na mesma transação. Com
+    itens, o `valor_total` é calculado pelos preços atuais e o estoque é
+    reservado por `reservar_estoque` como último comando antes do commit,
+    para que as linhas de produto fiquem travadas o menor tempo possível.
+    `antes_do_commit` recebe o pedido já gravado (flush) e pode escrever na
+    mesma transação (ex. a resposta de uma Idempotency-Key).
+
+    Raises:
+        ProdutoNaoEncontrado: Algum item referencia um produto inexistente.
+        EstoqueInsuficiente: Algum produto não tem estoque para o pedido
+            (nada é gravado).
+    """
+    dados = pedido.model_dump(exclude={"itens"})
+    quantidades = _somar_itens(pedido.itens)
+    if quantidades:
+        precos = dict(
+            db.execute(
+                select(models.Produto.id, models.Produto.preco).where(
+                    models.Produto.id.in_(quantidades)
+                )
+            ).all()
+        )
+        if faltantes := sorted(set(quantidades) - set(precos)):
+            raise ProdutoNaoEncontrado(faltantes)
+        dados["valor_total"] = sum(
+            precos[item.produto_id] * item.quantidade for item in pedido.itens
+        )
+
+    db_pedido = models.Pedido(**dados, cliente_id=cliente_id)
     db.add(db_pedido)
+    db.flush()
+    if quantidades:
+        db.execute(
+            insert(models.PedidoItem.__table__),
+            [
+                {
+                    "pedido_id": db_pedido.id,
+                    "produto_id": item.produto_id,
+                    "quantidade": item.quantidade,
+                    "preco_unitario": precos[item.produto_id],
+                }
+                for item in pedido.itens
+            ],
+        )
+    db.add(
+        models.Outbox(
+            **_evento_pedido_criado(
+                db_pedido.id, cliente_id, db_pedido.valor_total
+            )
+        )
+    )
+    if antes_do_commit is not None:
+        db.flush()
+        antes_do_commit(db_pedido)
+    if quantidades:
+        db.flush()
+        reservar_estoque(db, quantidades)
     db.commit()
+    cache.relatorios.invalidar(RELATORIO_PEDIDOS_POR_CLIENTE)
+    cache.invalidar("cliente", cliente_id)
+    if quantidades:
+        cache.relatorios.invalidar(RELATORIO_ESTOQUE_BAIXO)
+        cache.invalidar("produto", *quantidades)
     db.refresh(db_pedido)
     return db_pedido
 
 
-def listar_pedidos(db: Session, skip: int = 0, limit: int = 10) -> list:
-    """Lista todos os pedidos com paginação."""
-    return db.query(models.Pedido).offset(skip).limit(limit).all()
+def criar_pedidos_lote(
+    db: Session, itens: list[schemas.PedidoLoteItem]
+) -> tuple[list[schemas.Pedido], list[schemas.PedidoLoteFalha]]:
+    """Cria vários pedidos em uma única transação.
+
+    Os clientes são validados com uma só consulta; pedidos de clientes
+    inexistentes são reportados como falha e os demais são inseridos com
+    executemany, junto com seus eventos na outbox, em um único commit.
+
+    Returns:
+        tuple: Pedidos criados e falhas, na ordem do lote recebido.
+    """
+    cliente_ids = {item.cliente_id for item in itens}
+    existentes = set(
+        db.scalars(select(models.Cliente.id).where(models.Cliente.id.in_(cliente_ids)))
+    )
+
+    falhas = []
+    linhas = []
+    for indice, item in enumerate(itens):
+        if item.cliente_id not in existentes:
+            falhas.append(
+                schemas.PedidoLoteFalha(
+                    indice=indice,
+                    cliente_id=item.cliente_id,
+                    erro="Cliente não encontrado",
+                )
+            )
+            continue
+        linhas.append(item.model_dump())
+
+    if not linhas:
+        return [], falhas
+
+    if db.get_bind().dialect.insert_executemany_returning:
+        # executemany com RETURNING (insertmanyvalues): poucos comandos no total.
+        # sort_by_parameter_order devolve as linhas na ordem de `linhas`. O
+        # SQLite não tem como fazer isso em lote (o SQLAlchemy passaria a um
+        # INSERT por linha); lá os rowids de um INSERT seguem a ordem dos
+        # VALUES, então basta ordenar pelo ID.
+        tabela = models.Pedido.__table__
+        ordenar_por_id = db.get_bind().dialect.name == "sqlite"
+        resultado = db.execute(
+            insert(tabela).returning(
+                tabela.c.id,
+                tabela.c.descricao,
+                tabela.c.cliente_id,
+                tabela.c.valor_total,
+                sort_by_parameter_order=not ordenar_por_id,
+            ),
+            linhas,
+        )
+        criados = [schemas.Pedido.model_validate(r) for r in resultado]
+        if ordenar_por_id:
+            criados.sort(key=lambda p: p.id)
+    else:
+        # Sem RETURNING em lote (ex.: MySQL), o flush do ORM obtém cada ID.
+        novos = [models.Pedido(**linha) for linha in linhas]
+        db.add_all(novos)
+        db.flush()
+        # Serializa antes do commit para não recarregar cada pedido expirado.
+        criados = [schemas.Pedido.model_validate(p) for p in novos]
+
+    db.execute(
+        insert(models.Outbox.__table__),
+        [
+            _evento_pedido_criado(p.id, p.cliente_id, p.valor_total)
+            for p in criados
+        ],
+    )
+    db.commit()
+    cache.relatorios.invalidar(RELATORIO_PEDIDOS_POR_CLIENTE)
+    cache.invalidar("cliente", *{p.cliente_id for p in criados})
+    return criados, falhas
+
+
+def listar_pedidos(db: Session, apos_id: int | None = None, limit: int = 10) -> list:
+    """Lista os pedidos com paginação por cursor (IDs maiores que `apos_id`)."""
+    query = db.query(models.Pedido)
+    return paginar(query, models.Pedido.id, apos_id, limit).all()
 
 
-def obter_pedido(db: Session, pedido_id: int) -> models.Pedido | None:
-    """Obtém um pedido pelo ID."""
-    return db.query(models.Pedido).filter(models.Pedido.id == pedido_id).first()
+@cache.em_cache("pedido", schemas.Pedido)
+def obter_pedido(db: Session, pedido_id: int) -> schemas.Pedido | None:
+    """Obtém um pedido pelo ID (via cache; no miss, só as colunas da resposta)."""
+    return leitura_rapida.obter(db, "pedidos", pedido_id)
 
 
-def relatorio_pedidos_por_cliente(db: Session) -> list[schemas.RelatorioPedidosCliente]:
-    """Gera relatório de total de pedidos por cliente."""
-    results = (
+def _consulta_pedidos_por_cliente(db: Session):
+    """Monta a agregação LEFT JOIN/GROUP BY de pedidos por cliente."""
+    return (
         db.query(
             models.Cliente.id.label("cliente_id"),
             models.Cliente.nome.label("nome_cliente"),
             func.count(models.Pedido.id).label("total_pedidos"),
         )
-        .join(models.Pedido, models.Pedido.cliente_id == models.Cliente.id)
+        .outerjoin(models.Pedido, models.Pedido.cliente_id == models.Cliente.id)
         .group_by(models.Cliente.id, models.Cliente.nome)
-        .all()
     )
 
+
+def relatorio_pedidos_por_cliente(
+    db: Session, apos_id: int | None = None, limit: int = 100
+) -> list[schemas.RelatorioPedidosCliente]:
+    """Gera uma página do relatório de total de pedidos por cliente.
+
+    Clientes sem pedidos aparecem com total zero.
+    """
+    results = paginar(
+        _consulta_pedidos_por_cliente(db), models.Cliente.id, apos_id, limit
+    ).all()
+
     return [
         schemas.RelatorioPedidosCliente(
             cliente_id=r.cliente_id,
@@ -70,27 +361,110 @@ def relatorio_pedidos_por_cliente(db: Session) -> list[schemas.RelatorioPedidosC
     ]
 
 
-def atualizar_pedido(
-    db: Session, pedido_id: int, pedido: schemas.PedidoUpdate
-) -> models.Pedido | None:
-    """Atualiza os dados de um pedido existente."""
-    db_pedido = db.query(models.Pedido).filter(models.Pedido.id == pedido_id).first()
-    if db_pedido:
-        for key, value in pedido.model_dump().items():
-            setattr(db_pedido, key, value)
-        db.commit()
-        db.refresh(db_pedido)
+def iterar_relatorio_pedidos_por_cliente(db: Session, lote: int = 1000):
+    """Percorre o relatório inteiro em lotes por cursor, com memória constante."""
+    consulta = _consulta_pedidos_por_cliente(db)
+    apos_id = None
+    while True:
+        pagina = consulta
+        if apos_id is not None:
+            pagina = pagina.filter(models.Cliente.id > apos_id)
+        linhas = pagina.order_by(models.Cliente.id).limit(lote).all()
+        for r in linhas:
+            yield {
+                "cliente_id": r.cliente_id,
+                "nome_cliente": r.nome_cliente,
+                "total_pedidos": r.total_pedidos,
+            }
+        if len(linhas) < lote:
+            return
+        apos_id = linhas[-1].cliente_id
+
+
+def atualizar_pedido(db: Session, pedido_id: int, pedido: schemas.PedidoUpdate):
+    """Atualiza os dados de um pedido existente (um único UPDATE)."""
+    db_pedido = _atualizar(db, "pedidos", pedido_id, pedido.model_dump())
+    if db_pedido is None:
+        return None
+    db.commit()
+    cache.invalidar("pedido", pedido_id)
+    cache.invalidar("cliente", db_pedido.cliente_id)
     return db_pedido
 
 
+def _deletar_pagamentos_do_pedido(db: Session, pedido_id: int) -> list:
+    """Remove os pagamentos de um pedido e tira os pagos do rollup de faturamento.
+
+    Um único DELETE (com RETURNING se houver; sem, as linhas são lidas e
+    travadas antes) e um upsert por (dia, forma) dos pagamentos pagos, na
+    mesma transação. Não faz commit.
+
+    Returns:
+        As linhas removidas (id, status, valor, created_at, forma_pagamento).
+    """
+    tabela = models.Pagamento.__table__
+    colunas = (
+        tabela.c.id,
+        tabela.c.status,
+        tabela.c.valor,
+        tabela.c.created_at,
+        tabela.c.forma_pagamento,
+    )
+    stmt = delete(tabela).where(tabela.c.pedido_id == pedido_id)
+    if db.get_bind().dialect.delete_returning:
+        pagamentos = db.execute(stmt.returning(*colunas)).all()
+    else:
+        consulta = select(*colunas).where(tabela.c.pedido_id == pedido_id)
+        pagamentos = db.execute(consulta.with_for_update()).all()
+        if pagamentos:
+            db.execute(stmt)
+
+    pagos: dict[tuple[date, str], list] = {}
+    for pagamento in pagamentos:
+        if pagamento.status == STATUS_PAGO:
+            soma = pagos.setdefault(
+                (pagamento.created_at.date(), pagamento.forma_pagamento), [0.0, 0]
+            )
+            soma[0] += pagamento.valor
+            soma[1] += 1
+    for (dia, forma), (valor, quantidade) in pagos.items():
+        _acumular_faturamento(db, dia, forma, -valor, -quantidade)
+    return pagamentos
+
+
 def deletar_pedido(db: Session, pedido_id: int) -> bool:
-    """Remove um pedido do banco de dados."""
-    db_pedido = db.query(models.Pedido).filter(models.Pedido.id == pedido_id).first()
-    if db_pedido:
-        db.delete(db_pedido)
-        db.commit()
-        return True
-    return False
+    """Remove um pedido, seus itens e pagamentos (um DELETE por tabela).
+
+    O estoque reservado pelos itens volta aos produtos, e os pagamentos pagos
+    saem do rollup de faturamento, na mesma transação.
+    """
+    item = models.PedidoItem
+    quantidades = dict(
+        db.execute(
+            select(item.produto_id, func.sum(item.quantidade))
+            .where(item.pedido_id == pedido_id)
+            .group_by(item.produto_id)
+        ).all()
+    )
+    if quantidades:
+        db.execute(delete(item).where(item.pedido_id == pedido_id))
+        devolver_estoque(db, quantidades)
+    pagamentos = _deletar_pagamentos_do_pedido(db, pedido_id)
+    db_pedido = _deletar(db, "pedidos", pedido_id)
+    if db_pedido is None:
+        db.rollback()
+        return False
+    db.commit()
+    cache.relatorios.invalidar(RELATORIO_PEDIDOS_POR_CLIENTE)
+    cache.invalidar("pedido", pedido_id)
+    cache.invalidar("cliente", db_pedido.cliente_id)
+    if pagamentos:
+        cache.relatorios.invalidar(RELATORIO_FATURAMENTO)
+        cache.invalidar("pagamento", *(p.id for p in pagamentos))
+    if quantidades:
+        cache.relatorios.invalidar(RELATORIO_ESTOQUE_BAIXO)
+        cache.invalidar("produto", *quantidades)
+    return True
 
 
 # Produtos
@@ -99,45 +473,120 @@ def criar_produto(db: Session, produto: schemas.ProdutoCreate) -> models.Produto
     db_produto = models.Produto(**produto.model_dump())
     db.add(db_produto)
     db.commit()
+    cache.relatorios.invalidar(RELATORIO_ESTOQUE_BAIXO)
     db.refresh(db_produto)
     return db_produto
 
 
-def listar_produtos(db: Session, skip: int = 0, limit: int = 10) -> list:
-    """Lista todos os produtos com paginação."""
-    return db.query(models.Produto).offset(skip).limit(limit).all()
+def listar_produtos(db: Session, apos_id: int | None = None, limit: int = 10) -> list:
+    """Lista os produtos com paginação por cursor (IDs maiores que `apos_id`)."""
+    query = db.query(models.Produto)
+    return paginar(query, models.Produto.id, apos_id, limit).all()
+
+
+@cache.em_cache("produto", schemas.Produto)
+def obter_produto(db: Session, produto_id: int) -> schemas.Produto | None:
+    """Obtém um produto pelo ID (via cache; no miss, só as colunas da resposta)."""
+    return leitura_rapida.obter(db, "produtos", produto_id)
+
+
+def produtos_estoque_baixo(
+    db: Session, limite: int
+) -> list[schemas.RelatorioProdutoEstoqueBaixo]:
+    """Lista os produtos com estoque abaixo de `limite`."""
+    produtos = db.query(
+        models.Produto.id, models.Produto.nome, models.Produto.qtd_estoque
+    ).filter(models.Produto.qtd_estoque < limite)
+    return [
+        schemas.RelatorioProdutoEstoqueBaixo(
+            id=p.id, nome=p.nome, qtd_estoque=p.qtd_estoque
+        )
+        for p in produtos
+    ]
 
 
-def obter_produto(db: Session, produto_id: int) -> models.Produto | None:
-    """Obtém um produto pelo ID."""
-    return db.query(models.Produto).filter(models.Produto.id == produto_id).first()
+def reservar_estoque(db: Session, quantidades: dict[int, int]) -> None:
+    """Baixa o estoque de vários produtos com um único UPDATE condicional.
 
+    `UPDATE produtos SET qtd_estoque = qtd_estoque - :n WHERE id = :id AND
+    qtd_estoque >= :n`, com um CASE por produto: a checagem e a baixa são
+    atômicas no banco, sem leitura prévia nem lock mantido entre comandos,
+    então pedidos simultâneos do mesmo produto não perdem atualizações nem
+    vendem além do estoque. Não faz commit.
 
-def atualizar_produto(
-    db: Session, produto_id: int, produto: schemas.ProdutoBase
-) -> models.Produto | None:
-    """Atualiza os dados de um produto existente."""
-    db_produto = (
-        db.query(models.Produto).filter(models.Produto.id == produto_id).first()
+    Raises:
+        EstoqueInsuficiente: Algum produto não tinha estoque; a transação
+            inteira é desfeita (rollback).
+    """
+    tabela = models.Produto.__table__
+    ids = sorted(quantidades)
+    quantidade = case(quantidades, value=tabela.c.id)
+    stmt = (
+        update(tabela)
+        .where(tabela.c.id.in_(ids), tabela.c.qtd_estoque >= quantidade)
+        .values(qtd_estoque=tabela.c.qtd_estoque - quantidade, versao=tabela.c.versao + 1)
+    )
+    if db.get_bind().dialect.update_returning:
+        reservados = set(db.scalars(stmt.returning(tabela.c.id)))
+        if len(reservados) == len(ids):
+            return
+        db.rollback()
+        raise EstoqueInsuficiente([i for i in ids if i not in reservados])
+
+    if db.execute(stmt).rowcount == len(ids):
+        return
+    db.rollback()
+    estoque = dict(
+        db.execute(select(tabela.c.id, tabela.c.qtd_estoque).where(tabela.c.id.in_(ids)))
+    )
+    raise EstoqueInsuficiente([i for i in ids if estoque.get(i, 0) < quantidades[i]])
+
+
+def devolver_estoque(db: Session, quantidades: dict[int, int]) -> None:
+    """Devolve quantidades ao estoque dos produtos (um único UPDATE)."""
+    tabela = models.Produto.__table__
+    quantidade = case(quantidades, value=tabela.c.id)
+    db.execute(
+        update(tabela)
+        .where(tabela.c.id.in_(quantidades))
+        .values(qtd_estoque=tabela.c.qtd_estoque + quantidade, versao=tabela.c.versao + 1)
     )
-    if db_produto:
-        for key, value in produto.model_dump().items():
-            setattr(db_produto, key, value)
-        db.commit()
-        db.refresh(db_produto)
+
+
+def atualizar_produto(db: Session, produto_id: int, produto: schemas.ProdutoBase):
+    """Atualiza os dados de um produto existente (um único UPDATE)."""
+    db_produto = _atualizar(db, "produtos", produto_id, produto.model_dump())
+    if db_produto is None:
+        return None
+    db.commit()
+    cache.relatorios.invalidar(RELATORIO_ESTOQUE_BAIXO)
+    cache.invalidar("produto", produto_id)
     return db_produto
 
 
 def deletar_produto(db: Session, produto_id: int) -> bool:
-    """Remove um produto do banco de dados."""
-    db_produto = (
-        db.query(models.Produto).filter(models.Produto.id == produto_id).first()
-    )
-    if db_produto:
-        db.delete(db_produto)
-        db.commit()
-        return True
-    return False
+    """Remove um produto do banco de dados (um único DELETE).
+
+    A chave estrangeira de `pedido_itens` é RESTRICT: um produto que aparece
+    em algum pedido não é removido, preservando o histórico dos pedidos.
+
+    Raises:
+        ProdutoEmUso: Se o produto está em itens de pedidos.
+    """
+    try:
+        resultado = db.execute(
+            delete(models.Produto).where(models.Produto.id == produto_id)
+        )
+    except IntegrityError as exc:
+        db.rollback()
+        raise ProdutoEmUso(produto_id) from exc
+    if resultado.rowcount == 0:
+        db.rollback()
+        return False
+    db.commit()
+    cache.relatorios.invalidar(RELATORIO_ESTOQUE_BAIXO)
+    cache.invalidar("produto", produto_id)
+    return True
 
 
 # Entregas
@@ -150,46 +599,155 @@ def criar_entrega(db: Session, entrega: schemas.EntregaCreate) -> models.Entrega
     return db_entrega
 
 
-def listar_entregas(db: Session, skip: int = 0, limit: int = 10) -> list[models.Entrega]:
-    """Lista todas as entregas com paginação."""
-    return db.query(models.Entrega).offset(skip).limit(limit).all()
-
+def listar_entregas(
+    db: Session, apos_id: int | None = None, limit: int = 10
+) -> list[models.Entrega]:
+    """Lista as entregas com paginação por cursor (IDs maiores que `apos_id`)."""
+    query = db.query(models.Entrega)
+    return paginar(query, models.Entrega.id, apos_id, limit).all()
 
-def obter_entrega(db: Session, entrega_id: int) -> models.Entrega | None:
-    """Obtém uma entrega pelo ID."""
-    return db.query(models.Entrega).filter(models.Entrega.id == entrega_id).first()
 
+@cache.em_cache("entrega", schemas.Entrega)
+def obter_entrega(db: Session, entrega_id: int) -> schemas.Entrega | None:
+    """Obtém uma entrega pelo ID (via cache; no miss, só as colunas da resposta)."""
+    return leitura_rapida.obter(db, "entregas", entrega_id)
 
-def atualizar_entrega(
-        db: Session, entrega_id: int, entrega: schemas.EntregaUpdate
-        ) -> models.Entrega | None:
-    """Atualiza os dados de uma entrega existente."""
-    db_entrega = db.query(models.Entrega).filter(models.Entrega.id == entrega_id).first()
-    if not db_entrega:
-        return None
 
-    for key, value in entrega.model_dump(exclude_unset=True).items():
-        setattr(db_entrega, key, value)
+def atualizar_entrega(db: Session, entrega_id: int, entrega: schemas.EntregaUpdate):
+    """Atualiza os campos enviados de uma entrega (um único UPDATE)."""
+    valores = entrega.model_dump(exclude_unset=True)
+    if not valores:
+        return leitura_rapida.obter(db, "entregas", entrega_id)
 
+    db_entrega = _atualizar(db, "entregas", entrega_id, valores)
+    if db_entrega is None:
+        return None
     db.commit()
-    db.refresh(db_entrega)
+    cache.invalidar("entrega", entrega_id)
     return db_entrega
 
 
 def deletar_entrega(db: Session, entrega_id: int) -> bool:
-    """Remove uma entrega do banco de dados."""
-    db_entrega = db.query(models.Entrega).filter(models.Entrega.id == entrega_id).first()
-    if not db_entrega:
+    """Remove uma entrega do banco de dados (um único DELETE)."""
+    resultado = db.execute(delete(models.Entrega).where(models.Entrega.id == entrega_id))
+    if resultado.rowcount == 0:
+        db.rollback()
         return False
-
-    db.delete(db_entrega)
     db.commit()
+    cache.invalidar("entrega", entrega_id)
     return True
 
 
 # Pagamentos
+STATUS_PAGO = "pago"
+
+
+def _acumular_faturamento(
+    db: Session, dia: date, forma_pagamento: str, valor: float, quantidade: int
+) -> None:
+    """Soma valor/quantidade na linha (dia, forma) do rollup de faturamento.
+
+    Usa upsert nativo do dialeto para que escritas concorrentes no mesmo dia
+    não percam incrementos. Deve rodar na mesma transação do pagamento.
+    """
+    tabela = models.FaturamentoDiario.__table__
+    valores = {
+        "dia": dia,
+        "forma_pagamento": forma_pagamento,
+        "total": valor,
+        "quantidade": quantidade,
+    }
+    dialeto = db.get_bind().dialect.name
+
+    if dialeto == "mysql":
+        stmt = mysql.insert(tabela).values(**valores)
+        stmt = stmt.on_duplicate_key_update(
+            total=tabela.c.total + stmt.inserted.total,
+            quantidade=tabela.c.quantidade + stmt.inserted.quantidade,
+        )
+    elif dialeto in ("sqlite", "postgresql"):
+        modulo = sqlite if dialeto == "sqlite" else postgresql
+        stmt = modulo.insert(tabela).values(**valores)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[tabela.c.dia, tabela.c.forma_pagamento],
+            set_={
+                "total": tabela.c.total + stmt.excluded.total,
+                "quantidade": tabela.c.quantidade + stmt.excluded.quantidade,
+            },
+        )
+    else:
+        resultado = db.execute(
+            update(tabela)
+            .where(tabela.c.dia == dia, tabela.c.forma_pagamento == forma_pagamento)
+            .values(
+                total=tabela.c.total + valor,
+                quantidade=tabela.c.quantidade + quantidade,
+            )
+        )
+        if resultado.rowcount:
+            return
+        stmt = insert(tabela).values(**valores)
+
+    db.execute(stmt)
+
+
+def _registrar_faturamento(db: Session, pagamento: models.Pagamento, sinal: int) -> None:
+    """Adiciona (sinal=1) ou remove (sinal=-1) um pagamento do rollup diário."""
+    _acumular_faturamento(
+        db,
+        pagamento.created_at.date(),
+        pagamento.forma_pagamento,
+        sinal * pagamento.valor,
+        sinal,
+    )
+
+
+def total_faturado(db: Session, inicio: date, fim: date) -> float:
+    """Soma o faturamento do período (inclusivo) a partir do rollup diário."""
+    total = (
+        db.query(func.coalesce(func.sum(models.FaturamentoDiario.total), 0.0))
+        .filter(models.FaturamentoDiario.dia >= inicio)
+        .filter(models.FaturamentoDiario.dia <= fim)
+        .scalar()
+    )
+    return float(total)
+
+
+def reconstruir_faturamento_diario(db: Session) -> int:
+    """Recalcula todo o rollup de faturamento a partir da tabela de pagamentos.
+
+    Returns:
+        int: Quantidade de linhas (dia, forma de pagamento) geradas.
+    """
+    tabela = models.FaturamentoDiario.__table__
+    dia = func.date(models.Pagamento.created_at)
+    agregado = (
+        select(
+            dia,
+            models.Pagamento.forma_pagamento,
+            func.sum(models.Pagamento.valor),
+            func.count(models.Pagamento.id),
+        )
+        .where(models.Pagamento.status == STATUS_PAGO)
+        .where(models.Pagamento.created_at.is_not(None))
+        .group_by(dia, models.Pagamento.forma_pagamento)
+    )
+
+    db.execute(delete(tabela))
+    db.execute(
+        insert(tabela).from_select(
+            ["dia", "forma_pagamento", "total", "quantidade"], agregado
+        )
+    )
+    db.commit()
+    cache.relatorios.invalidar(RELATORIO_FATURAMENTO)
+    return db.query(func.count()).select_from(tabela).scalar()
+
+
 def criar_pagamento(
-    db: Session, pagamento: schemas.PagamentoCreate
+    db: Session,
+    pagamento: schemas.PagamentoCreate,
+    antes_do_commit: Callable[[models.Pagamento], None] | None = None,
 ) -> models.Pagamento:
     """
     Cria um novo pagamento no banco de dados.
@@ -197,84 +755,122 @@ def criar_pagamento(
     Args:
         db (Session): Sessão do banco de dados.
         pagamento (PagamentoCreate): Dados do pagamento a ser criado.
+        antes_do_commit (Callable | None): Recebe o pagamento já gravado
+            (flush) e pode escrever na mesma transação.
 
     Returns:
         Pagamento: O pagamento criado.
     """
     db_pagamento = models.Pagamento(**pagamento.model_dump())
     db.add(db_pagamento)
+    db.flush()
+    if db_pagamento.status == STATUS_PAGO:
+        _registrar_faturamento(db, db_pagamento, 1)
+    if antes_do_commit is not None:
+        antes_do_commit(db_pagamento)
     db.commit()
+    cache.relatorios.invalidar(RELATORIO_FATURAMENTO)
     db.refresh(db_pagamento)
     return db_pagamento
 
 
 def listar_pagamentos(
-    db: Session, skip: int = 0, limit: int = 10
+    db: Session, apos_id: int | None = None, limit: int = 10
 ) -> list[models.Pagamento]:
     """
-    Lista os pagamentos existentes com paginação.
+    Lista os pagamentos existentes com paginação por cursor.
 
     Args:
         db (Session): Sessão do banco de dados.
-        skip (int): Quantidade de registros a pular.
+        apos_id (int | None): Último ID da página anterior (None = início).
         limit (int): Quantidade máxima de registros a retornar.
 
     Returns:
-        list[Pagamento]: Lista de pagamentos.
+        list[Pagamento]: Lista de pagamentos ordenada por ID.
     """
-    return db.query(models.Pagamento).offset(skip).limit(limit).all()
+    query = db.query(models.Pagamento)
+    return paginar(query, models.Pagamento.id, apos_id, limit).all()
 
 
+@cache.em_cache("pagamento", schemas.Pagamento)
 def obter_pagamento(
     db: Session, pagamento_id: int
-) -> models.Pagamento | None:
+) -> schemas.Pagamento | None:
     """
-    Obtém um pagamento pelo ID.
+    Obtém um pagamento pelo ID (via cache; no miss, só as colunas da resposta).
 
     Args:
         db (Session): Sessão do banco de dados.
         pagamento_id (int): ID do pagamento.
 
     Returns:
-        Pagamento | None: O pagamento correspondente, ou None se não existir.
+        Pagamento | None: O pagamento correspondente (schema), ou None se
+        não existir.
     """
-    return db.query(models.Pagamento).filter(models.Pagamento.id == pagamento_id).first()
+    return leitura_rapida.obter(db, "pagamentos", pagamento_id)
 
 
 def atualizar_pagamento(
     db: Session,
     pagamento_id: int,
     pagamento: schemas.PagamentoUpdate,
-) -> models.Pagamento | None:
+):
     """
     Atualiza o status de um pagamento existente.
 
+    Cada tentativa é um UPDATE condicional ao status anterior, então a
+    transição de/para "pago" é decidida pelo próprio banco, sem ler e travar
+    a linha antes; o rollup de faturamento diário é ajustado na mesma
+    transação. Na maioria dos casos, um único comando basta.
+
     Args:
         db (Session): Sessão do banco de dados.
         pagamento_id (int): ID do pagamento a ser atualizado.
         pagamento (PagamentoUpdate): Novos dados do pagamento.
 
     Returns:
-        Pagamento | None: O pagamento atualizado, ou None se não existir.
+        O pagamento atualizado (colunas da resposta), ou None se não existir.
     """
-    db_pagamento = (
-        db.query(models.Pagamento)
-        .filter(models.Pagamento.id == pagamento_id)
-        .first()
-    )
-
-    if db_pagamento:
-        for key, value in pagamento.model_dump().items():
-            setattr(db_pagamento, key, value)
-        db.commit()
-        db.refresh(db_pagamento)
-
-    return db_pagamento
+    valores = pagamento.model_dump()
+    status = valores["status"]
+    status_coluna = models.Pagamento.status
+
+    if status == STATUS_PAGO:
+        # Só as linhas que ainda não estavam pagas entram no faturamento.
+        tentativas = [(status_coluna != STATUS_PAGO, 1)]
+    else:
+        # O caso comum (pendente -> cancelado) resolve na primeira tentativa.
+        tentativas = [
+            (status_coluna.not_in([STATUS_PAGO, status]), 0),
+            (status_coluna == STATUS_PAGO, -1),
+        ]
+
+    for _ in range(3):
+        for condicao, sinal in tentativas:
+            db_pagamento = _atualizar(db, "pagamentos", pagamento_id, valores, condicao)
+            if db_pagamento is not None:
+                if sinal:
+                    _registrar_faturamento(db, db_pagamento, sinal)
+                db.commit()
+                cache.relatorios.invalidar(RELATORIO_FATURAMENTO)
+                cache.invalidar("pagamento", pagamento_id)
+                return db_pagamento
+        atual = leitura_rapida.obter(db, "pagamentos", pagamento_id)
+        if atual is None or atual.status == status:
+            # Inexistente, ou já no status pedido (nada a alterar).
+            db.rollback()
+            return atual
+        # O status mudou entre as tentativas (escrita concorrente): repete.
+        db.rollback()
+    raise RuntimeError(f"Pagamento {pagamento_id} alterado concorrentemente demais")
 
 
 def deletar_pagamento(db: Session, pagamento_id: int) -> bool:
     """
-    Remove um pagamento do banco de dados.
+    Remove um pagamento do banco de dados (um único DELETE com RETURNING).
+
+    Se o pagamento estava pago, sai do rollup de faturamento na mesma
+    transação.
 
     Args:
         db (Session): Sessão do banco de dados.
@@ -283,15 +879,14 @@ def deletar_pagamento(db: Session, pagamento_id: int) -> bool:
     Returns:
         bool: True se o pagamento foi deletado, False se não encontrado.
     """
-    db_pagamento = (
-        db.query(models.Pagamento)
-        .filter(models.Pagamento.id == pagamento_id)
-        .first()
-    )
-
-    if db_pagamento:
-        db.delete(db_pagamento)
-        db.commit()
-        return True
+    db_pagamento = _deletar(db, "pagamentos", pagamento_id)
+    if db_pagamento is None:
+        db.rollback()
+        return False
 
-    return False
+    if db_pagamento.status == STATUS_PAGO:
+        _registrar_faturamento(db, db_pagamento, -1)
+    db.commit()
+    cache.relatorios.invalidar(RELATORIO_FATURAMENTO)
+    cache.invalidar("pagamento", pagamento_id)
+    return True
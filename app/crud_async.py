@@ -0,0 +1,89 @@
+"""Versões assíncronas das funções CRUD (AsyncSession).
+
+Cada função executa a versão síncrona de `app.crud` com
+`AsyncSession.run_sync`: a lógica de consulta é a mesma, mas o I/O com o banco
+passa pelo driver assíncrono (aiosqlite/aiomysql) sem ocupar o threadpool.
+As consultas por ID concorrentes da mesma entidade são coalescidas no event
+loop antes de chegar ao banco.
+"""
+
+import functools
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import cache, crud, singleflight
+
+
+def _assincrona(funcao: Callable) -> Callable[..., Awaitable]:
+    """Adapta uma função CRUD síncrona para receber uma AsyncSession."""
+
+    @functools.wraps(funcao)
+    async def executar(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(funcao, *args, **kwargs)
+
+    return executar
+
+
+def _coalescida(entidade: str, funcao: Callable) -> Callable[..., Awaitable]:
+    """Como `_assincrona`, com single-flight por `(entidade, id)`.
+
+    Só a primeira corrotina de cada chave entra em `run_sync`; as demais
+    aguardam o mesmo resultado, sem bloquear o event loop. A busca usa uma
+    sessão própria (no mesmo engine), porque pode continuar depois que a
+    requisição que a iniciou for cancelada e fechar a sessão dela.
+    """
+    executar_sync = _assincrona(funcao)
+
+    async def buscar(bind, id_: int):
+        async with AsyncSession(bind, expire_on_commit=False) as db:
+            return await executar_sync(db, id_)
+
+    @functools.wraps(funcao)
+    async def executar(db: AsyncSession, id_: int):
+        return await singleflight.grupo_async.executar(
+            cache.chave(entidade, id_), lambda: buscar(db.bind, id_)
+        )
+
+    return executar
+
+
+obter_versao = _assincrona(crud.obter_versao)
+
+# Clientes
+criar_cliente = _assincrona(crud.criar_cliente)
+listar_clientes = _assincrona(crud.listar_clientes)
+obter_cliente = _coalescida("cliente", crud.obter_cliente)
+
+# Pedidos
+criar_pedido = _assincrona(crud.criar_pedido)
+criar_pedidos_lote = _assincrona(crud.criar_pedidos_lote)
+listar_pedidos = _assincrona(crud.listar_pedidos)
+obter_pedido = _coalescida("pedido", crud.obter_pedido)
+atualizar_pedido = _assincrona(crud.atualizar_pedido)
+deletar_pedido = _assincrona(crud.deletar_pedido)
+relatorio_pedidos_por_cliente = _assincrona(crud.relatorio_pedidos_por_cliente)
+
+# Produtos
+criar_produto = _assincrona(crud.criar_produto)
+listar_produtos = _assincrona(crud.listar_produtos)
+obter_produto = _coalescida("produto", crud.obter_produto)
+atualizar_produto = _assincrona(crud.atualizar_produto)
+deletar_produto = _assincrona(crud.deletar_produto)
+
+# Entregas
+criar_entrega = _assincrona(crud.criar_entrega)
+listar_entregas = _assincrona(crud.listar_entregas)
+obter_entrega = _coalescida("entrega", crud.obter_entrega)
+atualizar_entrega = _assincrona(crud.atualizar_entrega)
+deletar_entrega = _assincrona(crud.deletar_entrega)
+
+# Pagamentos
+criar_pagamento = _assincrona(crud.criar_pagamento)
+listar_pagamentos = _assincrona(crud.listar_pagamentos)
+obter_pagamento = _coalescida("pagamento", crud.obter_pagamento)
+atualizar_pagamento = _assincrona(crud.atualizar_pagamento)
+deletar_pagamento = _assincrona(crud.deletar_pagamento)
+
+# Relatórios
+total_faturado = _assincrona(crud.total_faturado)
@@ -2,15 +2,42 @@
 
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from app.pool_metricas import QueuePoolMedido, metricas as metricas_pool
+
 # Se não houver DATABASE_URL, cai no SQLite em ./data/easyorder.db
 DEFAULT_SQLITE_URL = "sqlite:///./data/easyorder.db"
 DATABASE_URL = os.getenv("DATABASE_URL", DEFAULT_SQLITE_URL)
 
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
+# Dimensionamento do pool de conexões (padrões do SQLAlchemy: 5 + 10).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+
+# Tokens do threadpool do anyio onde o FastAPI executa rotas síncronas.
+THREADPOOL_LIMIT = int(os.getenv("THREADPOOL_LIMIT", "40"))
+
+# SQLite em memória usa um pool próprio, sem as opções de QueuePool.
+if DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+    pool_args = {}
+else:
+    pool_args = {
+        "poolclass": QueuePoolMedido,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+engine = create_engine(
+    DATABASE_URL, pool_pre_ping=True, connect_args=connect_args, **pool_args
+)
+metricas_pool.observar(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -22,3 +49,50 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Pilha assíncrona (AsyncSession), ativada com DB_ASYNC=true.
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+# Drivers assíncronos equivalentes aos drivers síncronos suportados.
+DRIVERS_ASYNC = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def url_assincrona(url: str) -> str:
+    """Troca o driver da URL síncrona pelo driver assíncrono correspondente."""
+    esquema, separador, resto = url.partition("://")
+    return DRIVERS_ASYNC.get(esquema, esquema) + separador + resto
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", url_assincrona(DATABASE_URL))
+
+# Criados sob demanda para não exigir o driver assíncrono no modo síncrono.
+async_engine = None
+AsyncSessionLocal = None
+
+
+def obter_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Cria (na primeira chamada) o engine e a fábrica de sessões assíncronas."""
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        opcoes_pool = {k: v for k, v in pool_args.items() if k != "poolclass"}
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            pool_pre_ping=True,
+            connect_args=connect_args,
+            **opcoes_pool,
+        )
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+    return AsyncSessionLocal
+
+
+async def get_async_db():
+    """Dependência para obter a sessão assíncrona de banco."""
+    async with obter_async_sessionmaker()() as db:
+        yield db
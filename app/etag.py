@@ -0,0 +1,65 @@
+"""ETags e respostas condicionais (If-None-Match → 304).
+
+A ETag de uma entidade vem da sua coluna `versao`, incrementada por todo
+UPDATE do crud; a de uma página de listagem, dos pares (id, versao) dos itens e
+do cursor da próxima página. Quando o cliente envia uma ETag que ainda vale,
+a rota responde 304 sem serializar o corpo.
+"""
+
+import hashlib
+
+from fastapi import Response
+
+from app.paginacao import CABECALHO_PROXIMO_CURSOR
+
+
+def da_entidade(entidade: str, id_: int, versao: int) -> str:
+    """Monta a ETag forte de uma entidade a partir da sua versão."""
+    return f'"{entidade}-{id_}-v{versao}"'
+
+
+def da_lista(entidade: str, itens: list, proximo_cursor: str | None = None) -> str:
+    """Monta a ETag forte de uma página a partir das versões dos itens."""
+    resumo = hashlib.sha1(entidade.encode())
+    for item in itens:
+        resumo.update(f"|{item.id}:{item.versao}".encode())
+    resumo.update(f"|{proximo_cursor or ''}".encode())
+    return f'"{entidade}-lista-{resumo.hexdigest()[:20]}"'
+
+
+def corresponde(if_none_match: str | None, etag: str) -> bool:
+    """Indica se o If-None-Match contém a ETag (comparação fraca, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etags = (valor.strip() for valor in if_none_match.split(","))
+    return etag in (valor.removeprefix("W/") for valor in etags)
+
+
+def nao_modificado(etag: str, headers: dict[str, str] | None = None) -> Response:
+    """Resposta 304 com a ETag atual e os cabeçalhos informados."""
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
+
+
+def verificar_entidade(
+    if_none_match: str | None, entidade: str, id_: int, versao: int | None
+) -> Response | None:
+    """Retorna 304 se a versão atual da entidade bate com o If-None-Match."""
+    if versao is None:
+        return None
+    etag = da_entidade(entidade, id_, versao)
+    return nao_modificado(etag) if corresponde(if_none_match, etag) else None
+
+
+def responder_lista(
+    response: Response, if_none_match: str | None, entidade: str, itens: list
+) -> Response | None:
+    """Define a ETag da página; retorna 304 se o cliente já tem essa página."""
+    proximo_cursor = response.headers.get(CABECALHO_PROXIMO_CURSOR)
+    etag = da_lista(entidade, itens, proximo_cursor)
+    response.headers["ETag"] = etag
+    if not corresponde(if_none_match, etag):
+        return None
+    extras = {CABECALHO_PROXIMO_CURSOR: proximo_cursor} if proximo_cursor else {}
+    return nao_modificado(etag, extras)
@@ -0,0 +1,137 @@
+"""Fila em memória compatível com o subconjunto do cliente boto3 SQS usado aqui.
+
+Serve para testar o relay da outbox e o consumidor sem AWS: implementa
+send_message(_batch), receive_message com long polling, delete_message_batch e
+change_message_visibility_batch, com timeout de visibilidade e contagem de
+recebimentos (ApproximateReceiveCount). Cada QueueUrl é uma fila separada.
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+
+@dataclass
+class _Mensagem:
+    """Mensagem armazenada e seu estado de visibilidade."""
+
+    id: str
+    corpo: str
+    recebimentos: int = 0
+    visivel_em: float = 0.0
+    recibo: str | None = None
+
+
+class FilaMemoria:
+    """Substituto local e thread-safe do cliente SQS."""
+
+    def __init__(self, visibilidade_padrao: float = 30.0):
+        """Cria o armazenamento vazio das filas."""
+        self.visibilidade_padrao = visibilidade_padrao
+        self._filas: dict[str, list[_Mensagem]] = {}
+        self._condicao = threading.Condition()
+
+    def _fila(self, url: str) -> list[_Mensagem]:
+        return self._filas.setdefault(url, [])
+
+    def send_message(self, QueueUrl, MessageBody, **kwargs):  # noqa: N803
+        """Enfileira uma mensagem."""
+        mensagem = _Mensagem(id=str(uuid.uuid4()), corpo=MessageBody)
+        with self._condicao:
+            self._fila(QueueUrl).append(mensagem)
+            self._condicao.notify_all()
+        return {"MessageId": mensagem.id}
+
+    def send_message_batch(self, QueueUrl, Entries):  # noqa: N803
+        """Enfileira até 10 mensagens."""
+        sucesso = []
+        for entrada in Entries:
+            resposta = self.send_message(QueueUrl, entrada["MessageBody"])
+            sucesso.append({"Id": entrada["Id"], "MessageId": resposta["MessageId"]})
+        return {"Successful": sucesso, "Failed": []}
+
+    def receive_message(
+        self,
+        QueueUrl,  # noqa: N803
+        MaxNumberOfMessages=1,  # noqa: N803
+        WaitTimeSeconds=0,  # noqa: N803
+        VisibilityTimeout=None,  # noqa: N803
+        **kwargs,
+    ):
+        """Recebe mensagens visíveis, esperando até WaitTimeSeconds por elas."""
+        visibilidade = (
+            self.visibilidade_padrao if VisibilityTimeout is None else VisibilityTimeout
+        )
+        limite = time.monotonic() + WaitTimeSeconds
+        with self._condicao:
+            while True:
+                agora = time.monotonic()
+                visiveis = [
+                    m for m in self._fila(QueueUrl) if m.visivel_em <= agora
+                ][:MaxNumberOfMessages]
+                if visiveis or agora >= limite:
+                    break
+                # Acorda ao chegar mensagem ou quando a próxima ficar visível.
+                proxima = min(
+                    (m.visivel_em for m in self._fila(QueueUrl)), default=limite
+                )
+                self._condicao.wait(max(min(limite, proxima) - agora, 0.001))
+
+            resposta = []
+            for mensagem in visiveis:
+                mensagem.recebimentos += 1
+                mensagem.visivel_em = agora + visibilidade
+                mensagem.recibo = str(uuid.uuid4())
+                resposta.append(
+                    {
+                        "MessageId": mensagem.id,
+                        "ReceiptHandle": mensagem.recibo,
+                        "Body": mensagem.corpo,
+                        "Attributes": {
+                            "ApproximateReceiveCount": str(mensagem.recebimentos)
+                        },
+                    }
+                )
+        return {"Messages": resposta} if resposta else {}
+
+    def _por_recibo(self, url: str, recibo: str) -> _Mensagem | None:
+        return next((m for m in self._fila(url) if m.recibo == recibo), None)
+
+    def delete_message_batch(self, QueueUrl, Entries):  # noqa: N803
+        """Remove mensagens pelo ReceiptHandle do último recebimento."""
+        sucesso, falha = [], []
+        with self._condicao:
+            for entrada in Entries:
+                mensagem = self._por_recibo(QueueUrl, entrada["ReceiptHandle"])
+                if mensagem is None:
+                    falha.append({"Id": entrada["Id"], "Code": "ReceiptHandleIsInvalid"})
+                    continue
+                self._fila(QueueUrl).remove(mensagem)
+                sucesso.append({"Id": entrada["Id"]})
+        return {"Successful": sucesso, "Failed": falha}
+
+    def change_message_visibility_batch(self, QueueUrl, Entries):  # noqa: N803
+        """Redefine o timeout de visibilidade a partir de agora."""
+        sucesso, falha = [], []
+        with self._condicao:
+            agora = time.monotonic()
+            for entrada in Entries:
+                mensagem = self._por_recibo(QueueUrl, entrada["ReceiptHandle"])
+                if mensagem is None:
+                    falha.append({"Id": entrada["Id"], "Code": "ReceiptHandleIsInvalid"})
+                    continue
+                mensagem.visivel_em = agora + entrada["VisibilityTimeout"]
+                sucesso.append({"Id": entrada["Id"]})
+            self._condicao.notify_all()
+        return {"Successful": sucesso, "Failed": falha}
+
+    def quantidade(self, url: str) -> int:
+        """Retorna quantas mensagens (visíveis ou não) há na fila."""
+        with self._condicao:
+            return len(self._fila(url))
+
+    def corpos(self, url: str) -> list[str]:
+        """Retorna os corpos das mensagens da fila, na ordem de chegada."""
+        with self._condicao:
+            return [m.corpo for m in self._fila(url)]
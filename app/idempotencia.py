@@ -0,0 +1,348 @@
+"""Idempotency-Key para as rotas de criação (POST /pedidos e POST /pagamentos).
+
+A primeira requisição com uma chave reserva a chave no banco, executa a
+criação e grava a resposta (status e corpo JSON) na tabela
+`chaves_idempotencia`, na mesma transação da criação; as repetições dentro
+de IDEMPOTENCIA_TTL recebem a mesma resposta com o cabeçalho
+`Idempotent-Replayed: true`, ao custo de uma leitura pela chave primária.
+Repetições simultâneas no mesmo processo esperam a primeira (single-flight);
+em outra instância, recebem 409 enquanto a primeira não termina. Reusar a
+chave com outro corpo responde 422.
+
+As chaves vencidas são removidas em lotes pequenos a cada
+IDEMPOTENCIA_PURGA_A_CADA chaves novas, ou por `python -m app.admin
+purgar-idempotencia`.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from typing import NamedTuple
+
+from fastapi import HTTPException, Response
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.singleflight import SingleFlight
+
+CABECALHO = "Idempotency-Key"
+CABECALHO_REPETIDA = "Idempotent-Replayed"
+# Tamanho máximo aceito para a chave enviada pelo cliente.
+CHAVE_MAXIMA = 255
+
+# Validade (s) da resposta gravada para uma chave.
+IDEMPOTENCIA_TTL = int(os.getenv("IDEMPOTENCIA_TTL", "86400"))
+# Prazo (s) da reserva de uma chave em processamento. A reserva é renovada
+# enquanto a requisição roda; só a de um processo que morreu vence.
+IDEMPOTENCIA_PRAZO = int(os.getenv("IDEMPOTENCIA_PRAZO", "60"))
+# Quantas chaves vencidas cada lote da limpeza remove.
+IDEMPOTENCIA_PURGA_LOTE = int(os.getenv("IDEMPOTENCIA_PURGA_LOTE", "500"))
+# A cada quantas chaves novas um lote de chaves vencidas é removido.
+IDEMPOTENCIA_PURGA_A_CADA = int(os.getenv("IDEMPOTENCIA_PURGA_A_CADA", "100"))
+
+tabela = models.ChaveIdempotencia.__table__
+
+logger = logging.getLogger(__name__)
+
+
+class Resposta(NamedTuple):
+    """Resposta gravada para uma chave."""
+
+    status_code: int
+    corpo: bytes
+    repetida: bool
+
+
+def _resumo(texto: str) -> str:
+    return hashlib.blake2b(texto.encode(), digest_size=16).hexdigest()
+
+
+def _em_processamento() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"Requisição com esta {CABECALHO} ainda em processamento.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _reservar(
+    db: Session, chave: str, impressao: str, dono: str, expira_em: int
+) -> bool:
+    """Insere a reserva da chave; retorna False se outra requisição já a tem."""
+    valores = {
+        "chave": chave,
+        "impressao": impressao,
+        "dono": dono,
+        "expira_em": expira_em,
+    }
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "mysql":
+        stmt = mysql.insert(tabela).prefix_with("IGNORE")
+    elif dialeto in ("sqlite", "postgresql"):
+        modulo = sqlite if dialeto == "sqlite" else postgresql
+        stmt = modulo.insert(tabela).on_conflict_do_nothing(
+            index_elements=[tabela.c.chave]
+        )
+    else:
+        try:
+            db.execute(insert(tabela).values(**valores))
+        except IntegrityError:
+            db.rollback()
+            return False
+        return True
+    return db.execute(stmt.values(**valores)).rowcount == 1
+
+
+class _Limpeza:
+    """Conta as chaves novas e dispara um lote de limpeza a cada N."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._novas = 0
+
+    def contar(self) -> bool:
+        """Registra uma chave nova; retorna True quando é hora de limpar."""
+        with self._lock:
+            self._novas += 1
+            if self._novas < IDEMPOTENCIA_PURGA_A_CADA:
+                return False
+            self._novas = 0
+            return True
+
+
+class _Renovador:
+    """Renova as reservas em processamento enquanto seus donos estão rodando.
+
+    Uma única thread, ativa só enquanto há reservas, estende `expira_em` de
+    todas elas a cada IDEMPOTENCIA_PRAZO / 3 com um UPDATE por banco. Assim
+    uma criação demorada nunca perde a reserva; só a de um processo que
+    morreu (e parou de renovar) vence e pode ser tomada.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reservas: dict[str, Engine] = {}
+        self._thread: threading.Thread | None = None
+
+    def registrar(self, dono: str, bind: Engine) -> None:
+        """Passa a renovar a reserva de `dono`."""
+        with self._lock:
+            self._reservas[dono] = bind
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._executar, name="idempotencia-renovador", daemon=True
+                )
+                self._thread.start()
+
+    def remover(self, dono: str) -> None:
+        """Deixa de renovar a reserva de `dono`."""
+        with self._lock:
+            self._reservas.pop(dono, None)
+
+    def renovar(self) -> None:
+        """Estende agora a validade de todas as reservas registradas."""
+        with self._lock:
+            por_banco: dict[Engine, list[str]] = {}
+            for dono, bind in self._reservas.items():
+                por_banco.setdefault(bind, []).append(dono)
+        expira_em = int(time.time()) + IDEMPOTENCIA_PRAZO
+        for bind, donos in por_banco.items():
+            try:
+                with Session(bind) as db:
+                    db.execute(
+                        update(tabela)
+                        .where(tabela.c.dono.in_(donos), tabela.c.corpo.is_(None))
+                        .values(expira_em=expira_em)
+                    )
+                    db.commit()
+            except Exception:
+                logger.exception("Erro ao renovar reservas de idempotência.")
+
+    def _executar(self) -> None:
+        while True:
+            time.sleep(IDEMPOTENCIA_PRAZO / 3)
+            with self._lock:
+                if not self._reservas:
+                    self._thread = None
+                    return
+            self.renovar()
+
+
+_limpeza = _Limpeza()
+renovador = _Renovador()
+_voos = SingleFlight()
+
+
+def purgar_expiradas(
+    db: Session, lote: int = IDEMPOTENCIA_PURGA_LOTE, maximo_lotes: int | None = None
+) -> int:
+    """Remove as chaves vencidas em lotes de `lote`, com um commit por lote.
+
+    Cada lote seleciona as chaves pelo índice de `expira_em` e as apaga pela
+    chave primária, sem varrer a tabela nem segurar locks por muito tempo.
+
+    Returns:
+        Quantidade de chaves removidas.
+    """
+    agora = int(time.time())
+    removidas = lotes = 0
+    while maximo_lotes is None or lotes < maximo_lotes:
+        chaves = db.scalars(
+            select(tabela.c.chave)
+            .where(tabela.c.expira_em <= agora)
+            .order_by(tabela.c.expira_em)
+            .limit(lote)
+        ).all()
+        if chaves:
+            db.execute(delete(tabela).where(tabela.c.chave.in_(chaves)))
+        db.commit()
+        removidas += len(chaves)
+        lotes += 1
+        if len(chaves) < lote:
+            break
+    return removidas
+
+
+def _executar(
+    db: Session,
+    chave: str,
+    impressao: str,
+    criar: Callable[[Callable[[object], None]], object],
+    schema,
+    status_code: int,
+) -> Resposta:
+    """Repete a resposta gravada, ou reserva a chave e cria gravando a resposta.
+
+    A resposta é gravada por `criar` (via `antes_do_commit`) na mesma
+    transação da criação: ou os dois são gravados, ou nenhum. A gravação só
+    vale se a reserva ainda é desta requisição (`dono`); se outra a tomou
+    (reserva vencida), a criação é desfeita e a requisição recebe 409.
+    """
+    agora = int(time.time())
+    gravada = db.execute(
+        select(
+            tabela.c.impressao, tabela.c.status_code, tabela.c.corpo, tabela.c.expira_em
+        ).where(tabela.c.chave == chave)
+    ).first()
+    db.rollback()
+
+    if gravada is not None and gravada.expira_em > agora:
+        if gravada.impressao != impressao:
+            raise HTTPException(
+                status_code=422,
+                detail=f"{CABECALHO} já usada com outro corpo de requisição.",
+            )
+        if gravada.corpo is None:
+            raise _em_processamento()
+        return Resposta(gravada.status_code, gravada.corpo, True)
+
+    if gravada is not None:
+        db.execute(
+            delete(tabela).where(tabela.c.chave == chave, tabela.c.expira_em <= agora)
+        )
+    dono = uuid.uuid4().hex
+    if not _reservar(db, chave, impressao, dono, agora + IDEMPOTENCIA_PRAZO):
+        db.rollback()
+        raise _em_processamento()
+    db.commit()
+
+    corpo = None
+
+    def gravar_resposta(resultado) -> None:
+        nonlocal corpo
+        db.refresh(resultado)
+        adaptador = TypeAdapter(schema)
+        validado = adaptador.validate_python(resultado, from_attributes=True)
+        corpo = adaptador.dump_json(validado)
+        gravadas = db.execute(
+            update(tabela)
+            .where(
+                tabela.c.chave == chave,
+                tabela.c.dono == dono,
+                tabela.c.corpo.is_(None),
+            )
+            .values(
+                status_code=status_code,
+                corpo=corpo,
+                expira_em=int(time.time()) + IDEMPOTENCIA_TTL,
+            )
+        ).rowcount
+        if gravadas != 1:
+            # A reserva venceu e foi tomada por outra requisição.
+            raise _em_processamento()
+
+    renovador.registrar(dono, db.get_bind())
+    try:
+        criar(gravar_resposta)
+    except BaseException:
+        # A criação falhou (e foi desfeita): libera a chave para a repetição.
+        db.rollback()
+        db.execute(delete(tabela).where(tabela.c.chave == chave, tabela.c.dono == dono))
+        db.commit()
+        raise
+    finally:
+        renovador.remover(dono)
+
+    if _limpeza.contar():
+        purgar_expiradas(db, maximo_lotes=1)
+    return Resposta(status_code, corpo, False)
+
+
+def responder(
+    db: Session,
+    rota: str,
+    chave: str,
+    dados: dict,
+    criar: Callable[[Callable[[object], None]], object],
+    schema,
+    status_code: int = 200,
+) -> Response:
+    """Executa `criar` uma vez por chave e responde com a resposta gravada.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        rota (str): Escopo da chave (ex. `POST /pedidos/`).
+        chave (str): Valor do cabeçalho Idempotency-Key.
+        dados (dict): Dados da requisição, para detectar reuso com outro corpo.
+        criar (Callable): Executa a criação, chamando a função recebida com o
+            objeto criado antes do commit (o `antes_do_commit` do CRUD).
+        schema: Schema da resposta (o `response_model` da rota).
+        status_code (int): Status da resposta de sucesso da rota.
+
+    Returns:
+        Resposta JSON da primeira execução (também nas repetições).
+
+    Raises:
+        HTTPException: 409 se a chave está em processamento em outra
+            instância; 422 se foi usada com outro corpo.
+    """
+    resumo_chave = _resumo(f"{rota}\n{chave}")
+    impressao = _resumo(json.dumps(dados, sort_keys=True, default=str))
+    executou = False
+
+    def executar() -> Resposta:
+        nonlocal executou
+        executou = True
+        return _executar(db, resumo_chave, impressao, criar, schema, status_code)
+
+    # Repetições simultâneas (mesma chave e corpo) esperam a primeira.
+    resposta = _voos.executar(f"{resumo_chave}:{impressao}", executar)
+    headers = {}
+    if resposta.repetida or not executou:
+        headers[CABECALHO_REPETIDA] = "true"
+    return Response(
+        resposta.corpo,
+        status_code=resposta.status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,223 @@
+"""Importação em massa de clientes, produtos e pedidos (CSV/NDJSON).
+
+Os arquivos são lidos em streaming e gravados em lotes de tamanho fixo com
+INSERTs em lote do SQLAlchemy Core, mantendo o uso de memória constante.
+E-mails de clientes já cadastrados (ou repetidos no arquivo) são ignorados e
+contados como duplicados. Linhas inválidas são contadas como erro, com o
+número da linha no arquivo, sem abortar a importação.
+
+A importação é uma carga de dados, não uma criação pela API: os pedidos
+importados não gravam o evento `pedido.criado` na outbox, para que os
+consumidores não reajam a pedidos históricos como se fossem novos.
+"""
+
+import csv
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_LOTE_PADRAO = 1000
+
+# Quantidade máxima de mensagens de erro guardadas no resultado.
+MAXIMO_MENSAGENS_ERRO = 20
+
+# Linha numerada do arquivo: o registro lido ou o erro de leitura da linha.
+Linha = tuple[int, dict | ValueError]
+
+# Entidade -> (modelo, schema de validação, coluna única para deduplicação)
+ENTIDADES: dict[str, tuple[type, type[BaseModel], str | None]] = {
+    "clientes": (models.Cliente, schemas.ClienteCreate, "email"),
+    "produtos": (models.Produto, schemas.ProdutoCreate, None),
+    "pedidos": (models.Pedido, schemas.PedidoLoteItem, None),
+}
+
+
+@dataclass
+class ResultadoImportacao:
+    """Contadores de uma importação."""
+
+    lidos: int = 0
+    inseridos: int = 0
+    duplicados: int = 0
+    erros: int = 0
+    mensagens_erro: list[str] = field(default_factory=list)
+
+    def registrar_erro(self, linha: int, mensagem: str) -> None:
+        """Conta um erro e guarda sua mensagem (até MAXIMO_MENSAGENS_ERRO)."""
+        self.erros += 1
+        if len(self.mensagens_erro) < MAXIMO_MENSAGENS_ERRO:
+            self.mensagens_erro.append(f"linha {linha}: {mensagem}")
+
+
+def ler_csv(caminho: Path) -> Iterator[Linha]:
+    """Lê um CSV com cabeçalho, uma linha por vez, com o número da linha."""
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        leitor = csv.DictReader(arquivo)
+        for registro in leitor:
+            # line_num conta o cabeçalho e termina na última linha do registro.
+            yield leitor.line_num, registro
+
+
+def ler_ndjson(caminho: Path) -> Iterator[Linha]:
+    """Lê um arquivo NDJSON, um objeto por linha (linhas vazias são ignoradas).
+
+    Uma linha com JSON inválido é entregue como o erro de decodificação, para
+    ser contada como erro sem interromper a leitura das demais.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        for numero, linha in enumerate(arquivo, start=1):
+            if not linha.strip():
+                continue
+            try:
+                yield numero, json.loads(linha)
+            except json.JSONDecodeError as e:
+                yield numero, e
+
+
+def ler_arquivo(caminho: Path, formato: str | None = None) -> Iterator[Linha]:
+    """Lê o arquivo no formato informado ou deduzido pela extensão."""
+    formato = formato or ("csv" if caminho.suffix.lower() == ".csv" else "ndjson")
+    if formato == "csv":
+        return ler_csv(caminho)
+    if formato == "ndjson":
+        return ler_ndjson(caminho)
+    raise ValueError(f"Formato não suportado: {formato}")
+
+
+def _comando_insert(db: Session, tabela, coluna_unica: str | None):
+    """Monta o INSERT em lote, ignorando conflitos na coluna única se houver."""
+    if coluna_unica is None:
+        return insert(tabela)
+
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "mysql":
+        # `id = id` só neutraliza a chave duplicada; ao contrário de INSERT
+        # IGNORE, não transforma outros erros (FK, truncamento) em avisos.
+        comando = mysql.insert(tabela)
+        return comando.on_duplicate_key_update(id=tabela.c.id)
+    if dialeto in ("sqlite", "postgresql"):
+        modulo = sqlite if dialeto == "sqlite" else postgresql
+        return modulo.insert(tabela).on_conflict_do_nothing(
+            index_elements=[tabela.c[coluna_unica]]
+        )
+    return insert(tabela)
+
+
+def _separar_duplicados(
+    db: Session,
+    coluna,
+    lote: list[tuple[int, dict]],
+    resultado: ResultadoImportacao,
+) -> list[tuple[int, dict]]:
+    """Conta e remove do lote os valores já cadastrados ou repetidos no lote.
+
+    Uma consulta pelo índice da coluna única encontra os já cadastrados (os
+    lotes anteriores já foram gravados). Assim os duplicados são contados da
+    mesma forma em todos os bancos, sem depender do rowcount do INSERT.
+    """
+    valores = {linha[coluna.name] for _, linha in lote}
+    vistos = set(db.scalars(select(coluna).where(coluna.in_(valores))))
+    novos = []
+    for numero, linha in lote:
+        if linha[coluna.name] in vistos:
+            resultado.duplicados += 1
+            continue
+        vistos.add(linha[coluna.name])
+        novos.append((numero, linha))
+    return novos
+
+
+def _gravar_lote(
+    db: Session,
+    comando,
+    lote: list[tuple[int, dict]],
+    resultado: ResultadoImportacao,
+) -> None:
+    """Grava um lote com executemany; se falhar, isola as linhas com problema."""
+    if not lote:
+        return
+    try:
+        inseridos = db.execute(comando, [linha for _, linha in lote]).rowcount
+        db.commit()
+        resultado.inseridos += inseridos
+        resultado.duplicados += len(lote) - inseridos
+        return
+    except DBAPIError as e:
+        db.rollback()
+        if len(lote) == 1:
+            numero, _ = lote[0]
+            resultado.registrar_erro(numero, str(e.orig))
+            return
+
+    # Repete linha a linha para não descartar o lote inteiro por um registro.
+    for item in lote:
+        _gravar_lote(db, comando, [item], resultado)
+
+
+def _validar(
+    linhas: Iterable[Linha], schema: type[BaseModel], resultado: ResultadoImportacao
+) -> Iterator[tuple[int, dict]]:
+    """Valida cada linha com o schema da entidade, contando as inválidas."""
+    for numero, linha in linhas:
+        resultado.lidos += 1
+        if isinstance(linha, ValueError):
+            resultado.registrar_erro(numero, f"JSON inválido: {linha}")
+            continue
+        try:
+            yield numero, schema.model_validate(linha).model_dump()
+        except ValidationError as e:
+            resultado.registrar_erro(numero, str(e.errors()[0]["msg"]))
+
+
+def importar(
+    db: Session,
+    entidade: str,
+    linhas: Iterable[Linha],
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+) -> ResultadoImportacao:
+    """Importa registros de uma entidade em lotes de `tamanho_lote`.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        entidade (str): "clientes", "produtos" ou "pedidos".
+        linhas (Iterable[Linha]): Registros numerados a importar, lidos sob
+            demanda (ver `ler_arquivo`).
+        tamanho_lote (int): Quantidade de registros por INSERT/commit.
+
+    Returns:
+        ResultadoImportacao: Contadores de lidos, inseridos, duplicados e erros.
+    """
+    modelo, schema, coluna_unica = ENTIDADES[entidade]
+    comando = _comando_insert(db, modelo.__table__, coluna_unica)
+    resultado = ResultadoImportacao()
+
+    validas = _validar(linhas, schema, resultado)
+    while lote := list(islice(validas, tamanho_lote)):
+        if coluna_unica is not None:
+            lote = _separar_duplicados(
+                db, modelo.__table__.c[coluna_unica], lote, resultado
+            )
+        _gravar_lote(db, comando, lote, resultado)
+        logger.info(
+            "Importação de %s: %d lidos, %d inseridos, %d duplicados, %d erros.",
+            entidade,
+            resultado.lidos,
+            resultado.inseridos,
+            resultado.duplicados,
+            resultado.erros,
+        )
+
+    return resultado
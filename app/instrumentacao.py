@@ -0,0 +1,204 @@
+"""Instrumentação dos comandos SQL (eventos do engine do SQLAlchemy).
+
+Cada comando executado em qualquer engine é cronometrado pelos eventos
+`before/after_cursor_execute` e entregue, já com o SQL normalizado (literais
+e listas de parâmetros trocados por `?`) e a rota que o originou, aos
+ouvintes registrados: as métricas do Prometheus, as estatísticas por comando
+(`/internal/sql`) e, nos testes, o detector de N+1. Comandos acima de
+SLOW_QUERY_MS vão para o logger `app.sql.lentas`.
+"""
+
+import contextvars
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Duração (ms) a partir da qual um comando entra no log de consultas lentas.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Quantidade máxima de pares (rota, comando) nas estatísticas.
+SQL_ESTATISTICAS_MAXIMO = int(os.getenv("SQL_ESTATISTICAS_MAXIMO", "1000"))
+
+# Rota atribuída aos comandos executados fora de uma requisição (relay,
+# consumidor, scripts).
+FORA_DE_REQUISICAO = "-"
+
+logger_lentas = logging.getLogger("app.sql.lentas")
+
+
+class Requisicao:
+    """Requisição em andamento, à qual os comandos SQL são atribuídos."""
+
+    __slots__ = ("rota", "comandos", "tempo_sql")
+
+    def __init__(self, rota: str):
+        """Guarda o template da rota (ex. `/pedidos/{pedido_id}`)."""
+        self.rota = rota
+        self.comandos = 0
+        self.tempo_sql = 0.0
+
+
+# O contexto é copiado para a thread das rotas síncronas e para os greenlets
+# do SQLAlchemy assíncrono, então os comandos de lá enxergam a requisição.
+requisicao_atual: contextvars.ContextVar[Requisicao | None] = contextvars.ContextVar(
+    "requisicao_atual", default=None
+)
+
+
+@contextmanager
+def em_requisicao(rota: str) -> Iterator[Requisicao]:
+    """Atribui à rota os comandos executados dentro do bloco."""
+    requisicao = Requisicao(rota)
+    token = requisicao_atual.set(requisicao)
+    try:
+        yield requisicao
+    finally:
+        requisicao_atual.reset(token)
+
+
+@dataclass(frozen=True)
+class Comando:
+    """Comando SQL executado."""
+
+    sql: str
+    duracao: float
+    requisicao: Requisicao | None
+
+    @property
+    def rota(self) -> str:
+        """Template da rota que executou o comando."""
+        return self.requisicao.rota if self.requisicao else FORA_DE_REQUISICAO
+
+
+_LITERAIS = re.compile(
+    r"'(?:[^']|'')*'"  # strings
+    r"|\b\d+(?:\.\d+)?\b"  # números
+    r"|%\(\w+\)s|%s|:\w+|\$\d+"  # parâmetros nomeados/posicionais
+)
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalizar(sql: str) -> str:
+    """Normaliza um comando: espaços, literais e listas `IN (?, ?, ...)`.
+
+    Comandos que só diferem nos valores (ex. um SELECT por ID, repetido por
+    linha) têm a mesma forma normalizada.
+    """
+    sql = _ESPACOS.sub(" ", sql).strip()
+    sql = _LITERAIS.sub("?", sql)
+    return _LISTAS.sub("(?, ...)", sql)
+
+
+_ouvintes: list[Callable[[Comando], None]] = []
+
+
+def adicionar_ouvinte(ouvinte: Callable[[Comando], None]) -> None:
+    """Passa a entregar cada comando executado ao ouvinte."""
+    _ouvintes.append(ouvinte)
+
+
+def remover_ouvinte(ouvinte: Callable[[Comando], None]) -> None:
+    """Deixa de entregar os comandos ao ouvinte."""
+    _ouvintes.remove(ouvinte)
+
+
+@contextmanager
+def ouvir(ouvinte: Callable[[Comando], None]):
+    """Registra o ouvinte só durante o bloco."""
+    adicionar_ouvinte(ouvinte)
+    try:
+        yield
+    finally:
+        remover_ouvinte(ouvinte)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_do_comando(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("instrumentacao_inicio", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois_do_comando(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("instrumentacao_inicio")
+    if not inicios:
+        return
+    duracao = time.perf_counter() - inicios.pop()
+    requisicao = requisicao_atual.get()
+    if requisicao is not None:
+        requisicao.comandos += 1
+        requisicao.tempo_sql += duracao
+    comando = Comando(normalizar(statement), duracao, requisicao)
+    if duracao * 1000 >= SLOW_QUERY_MS:
+        logger_lentas.warning(
+            "🐢 SQL lento (%.1f ms) em %s: %s", duracao * 1000, comando.rota, comando.sql
+        )
+    for ouvinte in _ouvintes:
+        ouvinte(comando)
+
+
+@event.listens_for(Engine, "handle_error")
+def _erro_no_comando(contexto) -> None:
+    # Descarta o início do comando que falhou para não desalinhar a pilha.
+    conexao = contexto.connection
+    if conexao is not None and conexao.info.get("instrumentacao_inicio"):
+        conexao.info["instrumentacao_inicio"].pop()
+
+
+class EstatisticasSQL:
+    """Contagem, tempo total e máximo por (rota, comando normalizado)."""
+
+    def __init__(self, maximo: int = SQL_ESTATISTICAS_MAXIMO):
+        """Cria as estatísticas vazias, limitadas a `maximo` pares."""
+        self.maximo = maximo
+        self._lock = threading.Lock()
+        self._dados: dict[tuple[str, str], list] = {}
+        self.descartados = 0
+
+    def registrar(self, comando: Comando) -> None:
+        """Acumula o comando no par (rota, SQL)."""
+        chave = (comando.rota, comando.sql)
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                if len(self._dados) >= self.maximo:
+                    self.descartados += 1
+                    return
+                item = self._dados[chave] = [0, 0.0, 0.0]
+            item[0] += 1
+            item[1] += comando.duracao
+            item[2] = max(item[2], comando.duracao)
+
+    def mais_custosos(self, quantidade: int = 20) -> list[dict]:
+        """Retorna os pares com maior tempo total, do maior para o menor."""
+        with self._lock:
+            itens = sorted(self._dados.items(), key=lambda i: i[1][1], reverse=True)
+        return [
+            {
+                "rota": rota,
+                "sql": sql,
+                "execucoes": execucoes,
+                "tempo_total_ms": round(total * 1000, 3),
+                "tempo_maximo_ms": round(maximo * 1000, 3),
+            }
+            for (rota, sql), (execucoes, total, maximo) in itens[:quantidade]
+        ]
+
+    def limpar(self) -> None:
+        """Remove todas as estatísticas."""
+        with self._lock:
+            self._dados.clear()
+            self.descartados = 0
+
+
+estatisticas = EstatisticasSQL()
+adicionar_ouvinte(estatisticas.registrar)
@@ -0,0 +1,130 @@
+"""Caminho de leitura rápido: SELECT do Core direto para JSON.
+
+As listagens e consultas por ID selecionam só as colunas da resposta com o
+SQLAlchemy Core e codificam as linhas com orjson, sem montar objetos do ORM
+(identity map) nem revalidar cada atributo com o Pydantic. As colunas de cada
+entidade espelham os schemas de leitura (`schemas.Pedido`, `schemas.Produto`...);
+`versao` é selecionada para a ETag, mas não entra no corpo.
+"""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.paginacao import paginar
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Entidade -> (coluna de ID, colunas da resposta).
+COLUNAS = {
+    "pedidos": (
+        models.Pedido.id,
+        [
+            models.Pedido.descricao,
+            models.Pedido.valor_total,
+            models.Pedido.id,
+            models.Pedido.cliente_id,
+        ],
+    ),
+    "produtos": (
+        models.Produto.id,
+        [
+            models.Produto.nome,
+            models.Produto.preco,
+            models.Produto.categoria,
+            models.Produto.qtd_estoque,
+            models.Produto.id,
+        ],
+    ),
+    "entregas": (
+        models.Entrega.id,
+        [
+            models.Entrega.endereco,
+            models.Entrega.status,
+            models.Entrega.data_entrega,
+            models.Entrega.id,
+            models.Entrega.pedido_id,
+        ],
+    ),
+    "pagamentos": (
+        models.Pagamento.id,
+        [
+            models.Pagamento.pedido_id,
+            models.Pagamento.valor,
+            models.Pagamento.forma_pagamento,
+            models.Pagamento.id,
+            models.Pagamento.status,
+            models.Pagamento.created_at,
+        ],
+    ),
+}
+
+
+def colunas(entidade: str) -> list:
+    """Colunas da resposta de uma entidade, mais `versao` (para a ETag)."""
+    coluna_id, colunas_resposta = COLUNAS[entidade]
+    return [*colunas_resposta, coluna_id.table.c.versao]
+
+
+def _consulta(entidade: str):
+    return COLUNAS[entidade][0], select(*colunas(entidade))
+
+
+def listar(db: Session, entidade: str, apos_id: int | None, limit: int) -> list:
+    """Lista uma página (`id > apos_id ORDER BY id`) como linhas do Core."""
+    coluna_id, consulta = _consulta(entidade)
+    return db.execute(paginar(consulta, coluna_id, apos_id, limit)).all()
+
+
+def obter(db: Session, entidade: str, id_: int):
+    """Obtém uma linha pelo ID, ou None."""
+    coluna_id, consulta = _consulta(entidade)
+    return db.execute(consulta.where(coluna_id == id_)).first()
+
+
+def _padrao(valor):
+    """Serializa os tipos que o encoder não conhece, como o Pydantic faria."""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, datetime):
+        return valor.isoformat().replace("+00:00", "Z")
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def _sem_versao(linha) -> dict:
+    dados = linha._asdict()
+    del dados["versao"]
+    return dados
+
+
+def codificar(linhas) -> bytes:
+    """Codifica uma linha ou lista de linhas em JSON, sem a coluna `versao`."""
+    dados = (
+        [_sem_versao(linha) for linha in linhas]
+        if isinstance(linhas, list)
+        else _sem_versao(linhas)
+    )
+    if orjson is not None:
+        return orjson.dumps(dados, default=_padrao, option=orjson.OPT_UTC_Z)
+    return json.dumps(dados, default=_padrao, separators=(",", ":")).encode()
+
+
+def resposta_json(linhas, response: Response) -> Response:
+    """Resposta JSON já codificada, com os cabeçalhos definidos em `response`."""
+    return Response(
+        content=codificar(linhas),
+        media_type="application/json",
+        headers={
+            nome: valor
+            for nome, valor in response.headers.items()
+            if nome != "content-length"
+        },
+    )
@@ -0,0 +1,149 @@
+"""Pipeline de logs não bloqueante (QueueHandler/QueueListener).
+
+As rotas apenas enfileiram os registros; uma thread do QueueListener os
+formata e entrega aos destinos (console, CloudWatch, arquivo). A fila é
+limitada: com ela cheia, os registros são descartados e contados, em vez de
+segurar a requisição. Loggers de alto volume podem ter os registros abaixo de
+WARNING amostrados (LOG_AMOSTRAGEM="app.acessos=0.01,app.routers.pedidos=0.1").
+"""
+
+import logging
+import os
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FILA_CAPACIDADE = int(os.getenv("LOG_FILA_CAPACIDADE", "10000"))
+LOG_AMOSTRAGEM = os.getenv("LOG_AMOSTRAGEM", "app.acessos=0.01")
+
+
+def ler_amostragem(valor: str) -> dict[str, float]:
+    """Lê "logger=taxa,logger=taxa" em um dicionário logger -> taxa (0 a 1)."""
+    taxas = {}
+    for item in valor.split(","):
+        nome, _, taxa = item.partition("=")
+        if nome.strip() and taxa.strip():
+            taxas[nome.strip()] = min(max(float(taxa), 0.0), 1.0)
+    return taxas
+
+
+class FiltroAmostragem(logging.Filter):
+    """Mantém só uma fração dos registros abaixo de WARNING de certos loggers."""
+
+    def __init__(self, taxas: dict[str, float]):
+        """Guarda as taxas por nome de logger (vale também para os filhos)."""
+        super().__init__()
+        self.taxas = taxas
+        self.descartados = 0
+
+    def _taxa(self, nome: str) -> float:
+        while nome:
+            if nome in self.taxas:
+                return self.taxas[nome]
+            nome = nome.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide se o registro segue para a fila."""
+        if record.levelno >= logging.WARNING or not self.taxas:
+            return True
+        if random.random() < self._taxa(record.name):
+            return True
+        self.descartados += 1
+        return False
+
+
+class HandlerFilaLimitada(QueueHandler):
+    """QueueHandler que descarta (e conta) registros quando a fila está cheia."""
+
+    def __init__(self, fila: queue.Queue):
+        """Inicializa o handler e os contadores."""
+        super().__init__(fila)
+        self._lock_contadores = threading.Lock()
+        self.enfileirados = 0
+        self.descartados = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve só a mensagem (%-args); a formatação fica para o listener.
+
+        Os argumentos são interpolados aqui para que o listener não acesse
+        objetos que a requisição ainda pode alterar.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enfileira sem bloquear; com a fila cheia, descarta o registro."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock_contadores:
+                self.descartados += 1
+            return
+        with self._lock_contadores:
+            self.enfileirados += 1
+
+
+class _ListenerFila(QueueListener):
+    """QueueListener cuja sentinela de parada espera espaço na fila cheia."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class PipelineLogs:
+    """Liga um logger aos destinos por meio de uma fila limitada."""
+
+    def __init__(
+        self,
+        capacidade: int = LOG_FILA_CAPACIDADE,
+        amostragem: dict[str, float] | None = None,
+    ):
+        """Cria a fila, o handler e o filtro de amostragem."""
+        self.fila: queue.Queue = queue.Queue(capacidade)
+        self.handler = HandlerFilaLimitada(self.fila)
+        self.filtro = FiltroAmostragem(
+            ler_amostragem(LOG_AMOSTRAGEM) if amostragem is None else amostragem
+        )
+        self.handler.addFilter(self.filtro)
+        self._destinos: list[logging.Handler] = []
+        self._listener: QueueListener | None = None
+
+    def configurar(
+        self, logger: logging.Logger, destinos: list[logging.Handler]
+    ) -> None:
+        """Adiciona o handler de fila ao logger e define os destinos do listener."""
+        self.parar()
+        self._destinos = list(destinos)
+        if self.handler not in logger.handlers:
+            logger.addHandler(self.handler)
+
+    def iniciar(self) -> None:
+        """Inicia a thread que entrega os registros aos destinos (idempotente)."""
+        if self._listener is None:
+            self._listener = _ListenerFila(
+                self.fila, *self._destinos, respect_handler_level=True
+            )
+            self._listener.start()
+
+    def parar(self) -> None:
+        """Entrega os registros pendentes e para a thread do listener."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        for destino in self._destinos:
+            destino.flush()
+
+    def metricas(self) -> dict:
+        """Retorna os contadores de registros enfileirados, descartados e amostrados."""
+        return {
+            "enfileirados": self.handler.enfileirados,
+            "descartados_fila_cheia": self.handler.descartados,
+            "descartados_amostragem": self.filtro.descartados,
+            "na_fila": self.fila.qsize(),
+        }
+
+
+pipeline = PipelineLogs()
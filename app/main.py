@@ -2,57 +2,118 @@
 
 import logging
 import os
-from fastapi import FastAPI
+from anyio import to_thread
+from fastapi import FastAPI, Response
 from watchtower import CloudWatchLogHandler
 
 # Internal libraries
+from app import logs, metricas
+from app.database import DB_ASYNC, DB_MAX_OVERFLOW, DB_POOL_SIZE, THREADPOOL_LIMIT
+from app.outbox import OUTBOX_RELAY, relay
+from app.sqs import sqs_configurado
+from app.routers.assincrono import router as assincrono_router
 from app.routers.pedidos import router as pedidos_router
 from app.routers.clientes import router as clientes_router
 from app.routers.relatorios import router as relatorios_router
 from app.routers.produtos import router as produtos_router
 from app.routers.pagamentos import router as pagamentos_router
 from app.routers.entregas import router as entregas_router
+from app.routers.internal import router as internal_router
 
 LOG_GROUP_NAME = os.getenv("LOG_GROUP_NAME", "/easyorder/api")
+# Arquivo de log local (opcional), útil em testes e desenvolvimento.
+LOG_ARQUIVO = os.getenv("LOG_ARQUIVO", "")
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Logger de alto volume (acessos à rota raiz), amostrado via LOG_AMOSTRAGEM.
+logger_acessos = logging.getLogger("app.acessos")
 
-# Configura CloudWatch
+# Os destinos rodam na thread do QueueListener; as rotas só enfileiram.
+console = logging.StreamHandler()
+console.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+destinos_log: list[logging.Handler] = [console]
+if LOG_ARQUIVO:
+    arquivo_log = logging.FileHandler(LOG_ARQUIVO, encoding="utf-8")
+    arquivo_log.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    destinos_log.append(arquivo_log)
+
+falha_cloudwatch = None
 if os.getenv("TEST_ENV") != "true":
     try:
-        cw_handler = CloudWatchLogHandler(log_group_name=LOG_GROUP_NAME)
-        logger.addHandler(cw_handler)
-        logger.info("✅ CloudWatch LogHandler inicializado com sucesso.")
+        destinos_log.append(CloudWatchLogHandler(log_group_name=LOG_GROUP_NAME))
     except Exception as e:
-        logger.warning(f"⚠️ Falha ao inicializar CloudWatchLogHandler: {e}")
+        falha_cloudwatch = e
+
+logging.getLogger().setLevel(logging.INFO)
+logs.pipeline.configurar(logging.getLogger(), destinos_log)
+logs.pipeline.iniciar()
+
+if os.getenv("TEST_ENV") != "true":
+    if falha_cloudwatch is None:
+        logger.info("✅ CloudWatch LogHandler inicializado com sucesso.")
+    else:
+        logger.warning(
+            "⚠️ Falha ao inicializar CloudWatchLogHandler: %s", falha_cloudwatch
+        )
 
 app = FastAPI(
     title="EasyOrder API",
     description="API para gerenciamento de pedidos e clientes.",
     version="1.0.0",
 )
+app.add_middleware(metricas.MiddlewareMetricas)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Loga um evento quando a API inicia."""
+    """Ajusta o threadpool e loga um evento quando a API inicia."""
+    logs.pipeline.iniciar()
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_LIMIT
+    if DB_POOL_SIZE + DB_MAX_OVERFLOW < THREADPOOL_LIMIT:
+        logger.warning(
+            "⚠️ Threadpool (%d) maior que o pool de conexões (%d + %d): "
+            "requisições podem esperar por conexão.",
+            THREADPOOL_LIMIT,
+            DB_POOL_SIZE,
+            DB_MAX_OVERFLOW,
+        )
+    if OUTBOX_RELAY and sqs_configurado():
+        relay.iniciar()
     logger.info("🚀 API Iniciada e pronta para receber requisições.")
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Encerra o relay da outbox e entrega os logs pendentes."""
+    relay.parar()
+    logs.pipeline.parar()
+
+
 @app.get("/")
 def read_root():
     """Rota raiz da API."""
-    logger.info("🏠 Rota raiz acessada com sucesso por um cliente.")
+    logger_acessos.info("🏠 Rota raiz acessada com sucesso por um cliente.")
     return {
         "message": "Bem-vindo ao EasyOrder! Monitoramento Ativo!"
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def exportar_metricas():
+    """Métricas da aplicação no formato de texto do Prometheus."""
+    return Response(metricas.registro.exportar(), media_type=metricas.TIPO_CONTEUDO)
+
+
 # Routers
+if DB_ASYNC:
+    # Incluído primeiro para atender as rotas de leitura com a pilha assíncrona.
+    app.include_router(assincrono_router, include_in_schema=False)
 app.include_router(pedidos_router, prefix="/pedidos", tags=["Pedidos"])
 app.include_router(clientes_router, prefix="/clientes", tags=["Clientes"])
 app.include_router(relatorios_router, prefix="/relatorios", tags=["Relatórios"])
 app.include_router(produtos_router, prefix="/produtos", tags=["Produtos"])
 app.include_router(pagamentos_router, prefix="/pagamentos", tags=["Pagamentos"])
 app.include_router(entregas_router, prefix="/entregas", tags=["Entregas"])
+app.include_router(
+    internal_router, prefix="/internal", tags=["Interno"], include_in_schema=False
+)
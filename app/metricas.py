@@ -0,0 +1,319 @@
+"""Métricas da aplicação no formato de texto do Prometheus (`GET /metrics`).
+
+Registra contadores, medidores e histogramas em memória, com rótulos, sem
+dependências externas:
+
+- requisições HTTP por rota (template, ex. `/pedidos/{pedido_id}`), método e
+  status: total, latência e requisições em andamento;
+- comandos SQL, recebidos da `instrumentacao` (eventos do engine): total,
+  duração e, por requisição, quantidade e tempo no banco;
+- latência das publicações na SQS.
+
+Cada observação custa um lock e algumas somas; a formatação do texto só
+acontece quando `/metrics` é lido.
+"""
+
+import abc
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from starlette.routing import Match
+
+from app import instrumentacao
+
+TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+
+# Limites (segundos) padrão dos histogramas de latência.
+LIMITES_LATENCIA = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+# Limites da quantidade de comandos SQL por requisição.
+LIMITES_CONSULTAS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Rótulo das requisições que não casam com nenhuma rota (evita um rótulo
+# por URL, que faria a cardinalidade crescer sem limite).
+ROTA_DESCONHECIDA = "desconhecida"
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _rotulos(nomes: tuple[str, ...], valores: tuple, extra: str = "") -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _numero(valor: float) -> str:
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+class _Metrica(abc.ABC):
+    """Base das métricas: nome, ajuda, nomes dos rótulos e lock."""
+
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple[str, ...] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+
+    def _chave(self, rotulos: dict) -> tuple:
+        return tuple(rotulos[nome] for nome in self.rotulos)
+
+    def exportar(self) -> list[str]:
+        """Retorna as linhas da métrica no formato de texto do Prometheus."""
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+        return linhas + self._amostras()
+
+    @abc.abstractmethod
+    def _amostras(self) -> list[str]:
+        """Retorna as linhas de amostra (sem HELP/TYPE) da métrica."""
+
+
+class Contador(_Metrica):
+    """Contador monotônico."""
+
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple[str, ...] = ()):
+        """Cria o contador sem séries."""
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: dict[tuple, float] = {}
+
+    def incrementar(self, valor: float = 1, **rotulos) -> None:
+        """Soma `valor` à série dos rótulos informados."""
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos) -> float:
+        """Retorna o valor atual da série."""
+        with self._lock:
+            return self._valores.get(self._chave(rotulos), 0)
+
+    def _amostras(self) -> list[str]:
+        with self._lock:
+            itens = list(self._valores.items())
+        return [
+            f"{self.nome}{_rotulos(self.rotulos, chave)} {_numero(valor)}"
+            for chave, valor in itens
+        ]
+
+
+class Medidor(Contador):
+    """Valor que sobe e desce (ex.: requisições em andamento)."""
+
+    tipo = "gauge"
+
+    def decrementar(self, valor: float = 1, **rotulos) -> None:
+        """Subtrai `valor` da série dos rótulos informados."""
+        self.incrementar(-valor, **rotulos)
+
+
+class Histograma(_Metrica):
+    """Histograma com limites fixos (buckets cumulativos na exportação)."""
+
+    tipo = "histogram"
+
+    def __init__(
+        self,
+        nome: str,
+        ajuda: str,
+        rotulos: tuple[str, ...] = (),
+        limites: tuple[float, ...] = LIMITES_LATENCIA,
+    ):
+        """Cria o histograma sem séries."""
+        super().__init__(nome, ajuda, rotulos)
+        self.limites = tuple(sorted(limites))
+        # Rótulos -> [contagem por faixa (+Inf no fim), soma, contagem].
+        self._series: dict[tuple, list] = {}
+
+    def observar(self, valor: float, **rotulos) -> None:
+        """Registra uma observação na série dos rótulos informados."""
+        chave = self._chave(rotulos)
+        faixa = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * (len(self.limites) + 1), 0.0, 0]
+            serie[0][faixa] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def contagem(self, **rotulos) -> int:
+        """Retorna quantas observações a série recebeu."""
+        with self._lock:
+            serie = self._series.get(self._chave(rotulos))
+            return serie[2] if serie else 0
+
+    def soma(self, **rotulos) -> float:
+        """Retorna a soma das observações da série."""
+        with self._lock:
+            serie = self._series.get(self._chave(rotulos))
+            return serie[1] if serie else 0.0
+
+    def _amostras(self) -> list[str]:
+        with self._lock:
+            itens = [(chave, list(s[0]), s[1], s[2]) for chave, s in self._series.items()]
+        linhas = []
+        for chave, faixas, soma, contagem in itens:
+            acumulado = 0
+            for limite, quantidade in zip((*self.limites, "+Inf"), faixas):
+                acumulado += quantidade
+                le = 'le="+Inf"' if limite == "+Inf" else f'le="{_numero(limite)}"'
+                linhas.append(
+                    f"{self.nome}_bucket{_rotulos(self.rotulos, chave, le)} {acumulado}"
+                )
+            rotulos = _rotulos(self.rotulos, chave)
+            linhas.append(f"{self.nome}_sum{rotulos} {_numero(soma)}")
+            linhas.append(f"{self.nome}_count{rotulos} {contagem}")
+        return linhas
+
+
+class Registro:
+    """Conjunto de métricas exportadas juntas."""
+
+    def __init__(self):
+        """Cria o registro vazio."""
+        self._metricas: list[_Metrica] = []
+
+    def registrar(self, metrica: _Metrica) -> _Metrica:
+        """Adiciona a métrica ao registro e a retorna."""
+        self._metricas.append(metrica)
+        return metrica
+
+    def exportar(self) -> str:
+        """Retorna todas as métricas no formato de texto do Prometheus."""
+        linhas = []
+        for metrica in self._metricas:
+            linhas.extend(metrica.exportar())
+        return "\n".join(linhas) + "\n"
+
+
+registro = Registro()
+
+requisicoes = registro.registrar(
+    Contador(
+        "http_requests_total",
+        "Requisições HTTP atendidas.",
+        ("method", "route", "status"),
+    )
+)
+latencia_requisicoes = registro.registrar(
+    Histograma(
+        "http_request_duration_seconds",
+        "Duração das requisições HTTP.",
+        ("method", "route", "status"),
+    )
+)
+requisicoes_em_andamento = registro.registrar(
+    Medidor(
+        "http_requests_in_progress",
+        "Requisições HTTP em andamento.",
+        ("method", "route"),
+    )
+)
+comandos_sql = registro.registrar(
+    Contador("db_statements_total", "Comandos SQL executados.")
+)
+duracao_comandos_sql = registro.registrar(
+    Histograma("db_statement_duration_seconds", "Duração dos comandos SQL.")
+)
+comandos_sql_por_requisicao = registro.registrar(
+    Histograma(
+        "db_statements_per_request",
+        "Comandos SQL executados por requisição.",
+        ("route",),
+        limites=LIMITES_CONSULTAS,
+    )
+)
+tempo_sql_por_requisicao = registro.registrar(
+    Histograma(
+        "db_time_per_request_seconds",
+        "Tempo gasto em comandos SQL por requisição.",
+        ("route",),
+    )
+)
+latencia_sqs = registro.registrar(
+    Histograma(
+        "sqs_publish_duration_seconds",
+        "Duração das chamadas de publicação na SQS.",
+        ("operation", "outcome"),
+    )
+)
+
+
+@contextmanager
+def cronometrar_sqs(operacao: str):
+    """Mede uma chamada de publicação na SQS (outcome = ok | erro)."""
+    inicio = time.perf_counter()
+    resultado = "erro"
+    try:
+        yield
+        resultado = "ok"
+    finally:
+        latencia_sqs.observar(
+            time.perf_counter() - inicio, operation=operacao, outcome=resultado
+        )
+
+
+def _registrar_comando(comando: instrumentacao.Comando) -> None:
+    comandos_sql.incrementar()
+    duracao_comandos_sql.observar(comando.duracao)
+
+
+instrumentacao.adicionar_ouvinte(_registrar_comando)
+
+
+def _rota(app, scope) -> str:
+    """Encontra o template da rota da requisição (ex. `/pedidos/{pedido_id}`)."""
+    for rota in app.router.routes:
+        correspondencia, _ = rota.matches(scope)
+        if correspondencia == Match.FULL:
+            return getattr(rota, "path", ROTA_DESCONHECIDA)
+    return ROTA_DESCONHECIDA
+
+
+class MiddlewareMetricas:
+    """Middleware ASGI que mede as requisições HTTP por rota e status."""
+
+    def __init__(self, app):
+        """Envolve a aplicação ASGI."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Mede a requisição e repassa para a aplicação."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        rota = _rota(scope["app"], scope)
+        status = 500
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        requisicoes_em_andamento.incrementar(method=metodo, route=rota)
+        inicio = time.perf_counter()
+        try:
+            with instrumentacao.em_requisicao(rota) as requisicao:
+                await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            requisicoes_em_andamento.decrementar(method=metodo, route=rota)
+            requisicoes.incrementar(method=metodo, route=rota, status=status)
+            latencia_requisicoes.observar(
+                duracao, method=metodo, route=rota, status=status
+            )
+            comandos_sql_por_requisicao.observar(requisicao.comandos, route=rota)
+            tempo_sql_por_requisicao.observar(requisicao.tempo_sql, route=rota)
@@ -2,7 +2,8 @@
 
 # External libraries
 from sqlalchemy import (
-    Column, Integer, Float, String, ForeignKey, DateTime, Numeric
+    Column, Integer, Float, String, ForeignKey, Date, DateTime, Index, LargeBinary,
+    Numeric, Text
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
@@ -16,7 +17,7 @@ class Cliente(Base):
 
     __tablename__ = "clientes"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     nome = Column(String(255), index=True, nullable=False)
     email = Column(String(255), unique=True, index=True, nullable=False)
 
@@ -28,15 +29,44 @@ class Pedido(Base):
 
     __tablename__ = "pedidos"
 
-    id = Column(Integer, primary_key=True, index=True)
-    descricao = Column(String(255), index=True, nullable=False)
-    cliente_id = Column(Integer, ForeignKey("clientes.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    descricao = Column(String(255), nullable=False)
+    cliente_id = Column(Integer, ForeignKey("clientes.id"), index=True, nullable=False)
     valor_total = Column(Numeric(10, 2), nullable=False, default=0.0)
+    # Base da ETag. As escritas do crud são UPDATEs do Core que incrementam
+    # `versao` no próprio SET (`_atualizar`, `reservar_estoque`,
+    # `devolver_estoque`). O `version_id_col` fica para que um flush do ORM
+    # (scripts, código futuro) também a incremente e confira, em vez de
+    # alterar a linha mantendo a ETag antiga.
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
 
     cliente = relationship("Cliente", back_populates="pedidos")
     pagamentos = relationship(
         "Pagamento", back_populates="pedido", cascade="all, delete-orphan"
     )
+    itens = relationship("PedidoItem", back_populates="pedido")
+
+    __mapper_args__ = {"version_id_col": versao}
+
+
+class PedidoItem(Base):
+    """Item de um pedido: produto, quantidade reservada e preço na compra."""
+
+    __tablename__ = "pedido_itens"
+
+    id = Column(Integer, primary_key=True)
+    pedido_id = Column(Integer, ForeignKey("pedidos.id"), index=True, nullable=False)
+    # RESTRICT: produtos que aparecem em pedidos não podem ser removidos.
+    produto_id = Column(
+        Integer,
+        ForeignKey("produtos.id", ondelete="RESTRICT"),
+        index=True,
+        nullable=False,
+    )
+    quantidade = Column(Integer, nullable=False)
+    preco_unitario = Column(Numeric(10, 2), nullable=False)
+
+    pedido = relationship("Pedido", back_populates="itens")
 
 
 class Produto(Base):
@@ -44,11 +74,16 @@ class Produto(Base):
 
     __tablename__ = "produtos"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     nome = Column(String(255), index=True, nullable=False)
     preco = Column(Numeric(10, 2), nullable=False)
     categoria = Column(String(255), index=True, nullable=False)
-    qtd_estoque = Column(Integer, nullable=False)
+    # Indexada para o relatório de estoque baixo (qtd_estoque < limite).
+    qtd_estoque = Column(Integer, index=True, nullable=False)
+    # Base da ETag; mesma regra de `Pedido.versao`.
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": versao}
 
 
 class Entrega(Base):
@@ -56,29 +91,93 @@ class Entrega(Base):
 
     __tablename__ = "entregas"
 
-    id = Column(Integer, primary_key=True, index=True)
-    endereco = Column(String(255), index=True, nullable=False)
+    id = Column(Integer, primary_key=True)
+    endereco = Column(String(255), nullable=False)
     status = Column(String(50), index=True, nullable=False)
     data_entrega = Column(
         DateTime,
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
-    pedido_id = Column(Integer, ForeignKey("pedidos.id"), nullable=False)
+    pedido_id = Column(Integer, ForeignKey("pedidos.id"), index=True, nullable=False)
+    # Base da ETag; mesma regra de `Pedido.versao`.
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": versao}
 
 
 class Pagamento(Base):
     """Representa um pagamento associado a um pedido."""
 
     __tablename__ = "pagamentos"
+    # Reconstrução do faturamento: status = 'pago', agrupado por dia.
+    __table_args__ = (
+        Index("ix_pagamentos_status_created_at", "status", "created_at"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    pedido_id = Column(Integer, ForeignKey("pedidos.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    pedido_id = Column(Integer, ForeignKey("pedidos.id"), index=True, nullable=False)
     valor = Column(Float, nullable=False)
     status = Column(
         String(50), default="pendente", nullable=False
     )  # 'pendente', 'pago', 'cancelado'
     forma_pagamento = Column(String(50), nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Base da ETag; mesma regra de `Pedido.versao`.
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
 
     pedido = relationship("Pedido", back_populates="pagamentos")
+
+    __mapper_args__ = {"version_id_col": versao}
+
+
+class FaturamentoDiario(Base):
+    """Total faturado por dia e forma de pagamento (apenas pagamentos pagos).
+
+    Mantido incrementalmente pelas funções CRUD de pagamentos.
+    """
+
+    __tablename__ = "faturamento_diario"
+
+    dia = Column(Date, primary_key=True)
+    forma_pagamento = Column(String(50), primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    quantidade = Column(Integer, nullable=False, default=0)
+
+
+class Outbox(Base):
+    """Evento a publicar na SQS, gravado na mesma transação que o originou.
+
+    Um relay lê os eventos pendentes, publica em lote e os marca como enviados.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_status_id", "status", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    tipo = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    status = Column(
+        String(20), default="pendente", nullable=False
+    )  # 'pendente', 'enviado', 'falhou'
+    tentativas = Column(Integer, default=0, nullable=False)
+    criado_em = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    enviado_em = Column(DateTime, nullable=True)
+
+
+class ChaveIdempotencia(Base):
+    """Resposta gravada para uma Idempotency-Key, reenviada nas repetições.
+
+    A chave e o corpo da requisição são guardados como resumos (blake2b de 16
+    bytes em hex); `corpo` fica nulo enquanto a primeira requisição está em
+    processamento.
+    """
+
+    __tablename__ = "chaves_idempotencia"
+
+    chave = Column(String(32), primary_key=True)  # resumo de (rota, chave)
+    impressao = Column(String(32), nullable=False)  # resumo do corpo
+    dono = Column(String(32), nullable=False)  # requisição que reservou a chave
+    status_code = Column(Integer, nullable=True)
+    corpo = Column(LargeBinary, nullable=True)
+    expira_em = Column(Integer, nullable=False, index=True)  # epoch (s)
@@ -0,0 +1,298 @@
+"""Relay da outbox transacional para a SQS.
+
+Os eventos são gravados na tabela `outbox` na mesma transação da escrita que
+os originou, então nenhum evento se perde se a SQS estiver lenta ou fora do ar.
+O relay reivindica lotes de eventos pendentes com `FOR UPDATE SKIP LOCKED`
+(vários relays podem rodar em paralelo sem publicar o mesmo evento), publica
+com send_message_batch e marca como enviados os que a fila aceitou. Um evento
+recusado OUTBOX_MAX_TENTATIVAS vezes vai para o status `falhou` (dead-letter)
+e deixa de ser reenviado; `python -m app.admin reprocessar-outbox` o devolve à
+fila. Os eventos enviados há mais de OUTBOX_RETENCAO segundos são removidos em
+lotes pelo próprio relay, ou por `python -m app.admin purgar-outbox`.
+
+Uso como processo separado:
+    python -m app.outbox
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app import models, sqs
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDENTE = "pendente"
+STATUS_ENVIADO = "enviado"
+STATUS_FALHOU = "falhou"
+
+# Com OUTBOX_RELAY=false, a API não inicia o relay (use `python -m app.outbox`).
+OUTBOX_RELAY = os.getenv("OUTBOX_RELAY", "true").lower() == "true"
+OUTBOX_LOTE = int(os.getenv("OUTBOX_LOTE", "100"))
+OUTBOX_INTERVALO = float(os.getenv("OUTBOX_INTERVALO", "1.0"))
+BACKOFF_MAXIMO = 30.0
+# Tentativas recusadas até o evento ir para o status `falhou`.
+OUTBOX_MAX_TENTATIVAS = int(os.getenv("OUTBOX_MAX_TENTATIVAS", "20"))
+# Por quanto tempo (s) os eventos enviados ficam na tabela.
+OUTBOX_RETENCAO = int(os.getenv("OUTBOX_RETENCAO", "604800"))
+# Quantos eventos enviados cada lote da limpeza remove.
+OUTBOX_PURGA_LOTE = int(os.getenv("OUTBOX_PURGA_LOTE", "500"))
+# Intervalo (s) entre os lotes de limpeza feitos pelo relay.
+OUTBOX_PURGA_INTERVALO = float(os.getenv("OUTBOX_PURGA_INTERVALO", "300"))
+
+
+def processar_lote(
+    db: Session,
+    enviar_lote: Callable[[list[dict]], list[bool | None]],
+    tamanho: int = OUTBOX_LOTE,
+) -> tuple[int, int]:
+    """Publica um lote de eventos pendentes e marca os aceitos como enviados.
+
+    As linhas ficam bloqueadas (SKIP LOCKED) até o commit, de modo que relays
+    concorrentes pegam lotes diferentes. `enviar_lote` informa, por evento,
+    se foi aceito (True), recusado pela fila (False) ou não enviado (None).
+    Só os recusados têm a tentativa contada; na OUTBOX_MAX_TENTATIVAS-ésima,
+    vão para o status `falhou`. Os não enviados, e o lote inteiro se
+    `enviar_lote` levantar uma exceção, continuam pendentes sem gastar
+    tentativa: uma queda da fila não esgota as tentativas dos eventos.
+
+    Returns:
+        tuple[int, int]: Quantidade de eventos enviados e de falhas no lote.
+    """
+    eventos = (
+        db.query(models.Outbox)
+        .filter(models.Outbox.status == STATUS_PENDENTE)
+        .order_by(models.Outbox.id)
+        .limit(tamanho)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not eventos:
+        db.commit()
+        return 0, 0
+
+    mensagens = [{"tipo": e.tipo, **json.loads(e.payload)} for e in eventos]
+    try:
+        resultados = enviar_lote(mensagens)
+    except Exception:
+        logger.exception("Erro ao publicar lote da outbox; eventos seguem pendentes.")
+        resultados = [None] * len(eventos)
+
+    enviados = [e.id for e, ok in zip(eventos, resultados) if ok]
+    # None: o lote não chegou à fila (erro de transporte). Esses eventos
+    # seguem pendentes sem gastar tentativa; só as recusas (False) contam.
+    nao_enviados = sum(1 for ok in resultados if ok is None)
+    recusados = [e for e, ok in zip(eventos, resultados) if ok is False]
+    falhas = [e.id for e in recusados if e.tentativas + 1 < OUTBOX_MAX_TENTATIVAS]
+    descartados = [e.id for e in recusados if e.tentativas + 1 >= OUTBOX_MAX_TENTATIVAS]
+    if enviados:
+        db.execute(
+            update(models.Outbox)
+            .where(models.Outbox.id.in_(enviados))
+            .values(status=STATUS_ENVIADO, enviado_em=datetime.now(timezone.utc))
+        )
+    if falhas:
+        db.execute(
+            update(models.Outbox)
+            .where(models.Outbox.id.in_(falhas))
+            .values(tentativas=models.Outbox.tentativas + 1)
+        )
+    if descartados:
+        db.execute(
+            update(models.Outbox)
+            .where(models.Outbox.id.in_(descartados))
+            .values(tentativas=models.Outbox.tentativas + 1, status=STATUS_FALHOU)
+        )
+        logger.error(
+            "Eventos da outbox recusados %d vezes, marcados como falhou: %s",
+            OUTBOX_MAX_TENTATIVAS,
+            descartados,
+        )
+    db.commit()
+    return len(enviados), len(recusados) + nao_enviados
+
+
+def contar(db: Session, status: str = STATUS_PENDENTE) -> int:
+    """Retorna a quantidade de eventos com o status dado (padrão: pendentes)."""
+    return (
+        db.query(func.count(models.Outbox.id))
+        .filter(models.Outbox.status == status)
+        .scalar()
+    )
+
+
+def contar_pendentes(db: Session) -> int:
+    """Retorna a quantidade de eventos ainda não publicados."""
+    return contar(db, STATUS_PENDENTE)
+
+
+def purgar_enviados(
+    db: Session,
+    retencao: int = OUTBOX_RETENCAO,
+    lote: int = OUTBOX_PURGA_LOTE,
+    maximo_lotes: int | None = None,
+) -> int:
+    """Remove os eventos enviados há mais de `retencao` segundos, em lotes.
+
+    Cada lote seleciona os ids pelo índice (status, id) e os apaga pela chave
+    primária, com um commit por lote, sem varrer a tabela nem segurar locks
+    por muito tempo.
+
+    Returns:
+        Quantidade de eventos removidos.
+    """
+    limite = datetime.now(timezone.utc) - timedelta(seconds=retencao)
+    removidos = lotes = 0
+    while maximo_lotes is None or lotes < maximo_lotes:
+        ids = db.scalars(
+            select(models.Outbox.id)
+            .where(
+                models.Outbox.status == STATUS_ENVIADO,
+                models.Outbox.enviado_em < limite,
+            )
+            .order_by(models.Outbox.id)
+            .limit(lote)
+        ).all()
+        if ids:
+            db.execute(delete(models.Outbox).where(models.Outbox.id.in_(ids)))
+        db.commit()
+        removidos += len(ids)
+        lotes += 1
+        if len(ids) < lote:
+            break
+    return removidos
+
+
+def reprocessar_falhados(db: Session) -> int:
+    """Devolve à fila os eventos com status `falhou`, zerando as tentativas.
+
+    Returns:
+        Quantidade de eventos devolvidos.
+    """
+    devolvidos = db.execute(
+        update(models.Outbox)
+        .where(models.Outbox.status == STATUS_FALHOU)
+        .values(status=STATUS_PENDENTE, tentativas=0)
+    ).rowcount
+    db.commit()
+    return devolvidos
+
+
+class RelayOutbox:
+    """Thread que processa a outbox continuamente, com backoff em falhas."""
+
+    def __init__(
+        self,
+        fabrica_sessao: Callable[[], Session],
+        enviar_lote: Callable[[list[dict]], list[bool | None]],
+        tamanho_lote: int = OUTBOX_LOTE,
+        intervalo: float = OUTBOX_INTERVALO,
+    ):
+        """Configura o relay; a thread só começa em `iniciar()`."""
+        self._fabrica_sessao = fabrica_sessao
+        self._enviar_lote = enviar_lote
+        self._tamanho_lote = tamanho_lote
+        self._intervalo = intervalo
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.enviados = 0
+        self.falhas = 0
+        self.lotes = 0
+        self.purgados = 0
+        self._proxima_purga = 0.0
+
+    def executar_uma_vez(self) -> tuple[int, int]:
+        """Processa um lote e atualiza os contadores."""
+        with self._fabrica_sessao() as db:
+            enviados, falhas = processar_lote(db, self._enviar_lote, self._tamanho_lote)
+        with self._lock:
+            self.enviados += enviados
+            self.falhas += falhas
+            if enviados or falhas:
+                self.lotes += 1
+        return enviados, falhas
+
+    def purgar_se_preciso(self) -> int:
+        """Remove um lote de eventos enviados antigos a cada OUTBOX_PURGA_INTERVALO."""
+        agora = time.monotonic()
+        if agora < self._proxima_purga:
+            return 0
+        self._proxima_purga = agora + OUTBOX_PURGA_INTERVALO
+        with self._fabrica_sessao() as db:
+            removidos = purgar_enviados(db, maximo_lotes=1)
+        with self._lock:
+            self.purgados += removidos
+        return removidos
+
+    def iniciar(self) -> None:
+        """Inicia a thread do relay (idempotente)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(
+            target=self._executar, name="relay-outbox", daemon=True
+        )
+        self._thread.start()
+
+    def parar(self, timeout: float = 10.0) -> None:
+        """Sinaliza a parada e espera o lote em andamento terminar."""
+        self._parar.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def metricas(self) -> dict:
+        """Retorna os contadores do relay."""
+        with self._lock:
+            return {
+                "enviados": self.enviados,
+                "falhas": self.falhas,
+                "lotes": self.lotes,
+                "purgados": self.purgados,
+            }
+
+    def _executar(self) -> None:
+        """Laço do relay: lotes cheios seguem direto; vazio ou falha aguardam."""
+        espera = self._intervalo
+        while not self._parar.is_set():
+            try:
+                enviados, falhas = self.executar_uma_vez()
+            except Exception:
+                logger.exception("Erro ao processar a outbox.")
+                enviados, falhas = 0, 1
+
+            if falhas:
+                espera = min(espera * 2, BACKOFF_MAXIMO)
+            else:
+                espera = self._intervalo
+            if falhas or enviados < self._tamanho_lote:
+                # Fila vazia (ou com problemas): aproveita para limpar.
+                try:
+                    self.purgar_se_preciso()
+                except Exception:
+                    logger.exception("Erro ao limpar a outbox.")
+                self._parar.wait(espera)
+
+
+relay = RelayOutbox(SessionLocal, lambda mensagens: sqs.enviar_mensagens_lote(mensagens))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    relay.iniciar()
+    logger.info("Relay da outbox em execução.")
+    try:
+        while True:
+            time.sleep(60)
+            logger.info("Relay da outbox: %s", relay.metricas())
+    except KeyboardInterrupt:
+        relay.parar()
@@ -0,0 +1,53 @@
+"""Paginação por cursor (keyset) para as rotas de listagem."""
+
+import base64
+import binascii
+import os
+
+from fastapi import HTTPException, Response
+
+# Limite máximo de registros por página, aplicado no servidor.
+LIMITE_MAXIMO = int(os.getenv("PAGINACAO_LIMITE_MAXIMO", "100"))
+
+CABECALHO_PROXIMO_CURSOR = "X-Next-Cursor"
+
+
+def limitar(limit: int) -> int:
+    """Restringe o tamanho da página ao intervalo [1, LIMITE_MAXIMO]."""
+    return max(1, min(limit, LIMITE_MAXIMO))
+
+
+def codificar_cursor(ultimo_id: int) -> str:
+    """Gera um cursor opaco a partir do último ID retornado."""
+    return base64.urlsafe_b64encode(str(ultimo_id).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str | None) -> int | None:
+    """Decodifica um cursor opaco de volta para o último ID visto.
+
+    Raises:
+        HTTPException: 400 se o cursor for inválido.
+    """
+    if not cursor:
+        return None
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(cursor + preenchimento).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def paginar(query, coluna_id, apos_id: int | None, limit: int):
+    """Aplica `id > apos_id ORDER BY id LIMIT n` a uma query."""
+    if apos_id is not None:
+        query = query.filter(coluna_id > apos_id)
+    return query.order_by(coluna_id).limit(limitar(limit))
+
+
+def definir_proximo_cursor(
+    response: Response, itens: list, limit: int, campo_id: str = "id"
+) -> None:
+    """Expõe o cursor da próxima página no cabeçalho, se houver mais registros."""
+    if itens and len(itens) >= limitar(limit):
+        ultimo_id = getattr(itens[-1], campo_id)
+        response.headers[CABECALHO_PROXIMO_CURSOR] = codificar_cursor(ultimo_id)
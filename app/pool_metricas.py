@@ -0,0 +1,97 @@
+"""Métricas do pool de conexões do SQLAlchemy.
+
+Conta checkouts/checkins por eventos do pool e mede quanto tempo as
+requisições esperam por uma conexão livre com uma subclasse de QueuePool.
+"""
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class MetricasPool:
+    """Acumula contadores de uso do pool de forma thread-safe."""
+
+    def __init__(self):
+        """Inicializa os contadores zerados."""
+        self._lock = threading.Lock()
+        self.conexoes_criadas = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.esperas = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+
+    def registrar_espera(self, segundos: float, timeout: bool = False) -> None:
+        """Registra o tempo gasto para obter uma conexão do pool."""
+        with self._lock:
+            self.esperas += 1
+            self.espera_total += segundos
+            self.espera_maxima = max(self.espera_maxima, segundos)
+            if timeout:
+                self.timeouts += 1
+
+    def _conexao_criada(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.conexoes_criadas += 1
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def observar(self, engine) -> None:
+        """Registra os listeners de eventos no pool do engine."""
+        event.listen(engine, "connect", self._conexao_criada)
+        event.listen(engine, "checkout", self._checkout)
+        event.listen(engine, "checkin", self._checkin)
+
+    def resumo(self, pool) -> dict:
+        """Retorna o estado atual do pool e os contadores acumulados."""
+        with self._lock:
+            media = self.espera_total / self.esperas if self.esperas else 0.0
+            resumo = {
+                "conexoes_criadas": self.conexoes_criadas,
+                "checkouts_total": self.checkouts,
+                "checkins_total": self.checkins,
+                "timeouts": self.timeouts,
+                "espera_media_ms": round(media * 1000, 3),
+                "espera_maxima_ms": round(self.espera_maxima * 1000, 3),
+            }
+        resumo["classe"] = type(pool).__name__
+        if isinstance(pool, QueuePool):
+            resumo.update(
+                {
+                    "tamanho": pool.size(),
+                    "em_uso": pool.checkedout(),
+                    "ociosas": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                    "max_overflow": pool._max_overflow,
+                    "timeout_s": pool.timeout(),
+                }
+            )
+        return resumo
+
+
+metricas = MetricasPool()
+
+
+class QueuePoolMedido(QueuePool):
+    """QueuePool que mede o tempo de espera por uma conexão."""
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except PoolTimeoutError:
+            metricas.registrar_espera(time.perf_counter() - inicio, timeout=True)
+            raise
+        metricas.registrar_espera(time.perf_counter() - inicio)
+        return conexao
@@ -0,0 +1,206 @@
+"""Rotas de leitura assíncronas (AsyncSession), ativadas com DB_ASYNC=true.
+
+Registram os mesmos caminhos e respostas das rotas síncronas de listagem e
+consulta por ID. Quando incluídas antes dos demais routers, atendem essas
+requisições no event loop, permitindo comparar as duas pilhas nas mesmas rotas.
+Os IDs usam o conversor `:int` para que caminhos como `/pedidos/export`
+continuem chegando às rotas síncronas. As ETags seguem as mesmas regras.
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud_async, models, schemas, database, etag, paginacao
+
+router = APIRouter()
+
+
+@router.get("/clientes/", response_model=list[schemas.ClienteListagem], tags=["Clientes"])
+async def listar_clientes(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 10,
+    include: str | None = None,
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Lista os clientes cadastrados (versão assíncrona)."""
+    apos_id = paginacao.decodificar_cursor(cursor)
+    incluir = {item.strip() for item in (include or "").split(",")}
+    clientes = await crud_async.listar_clientes(
+        db, apos_id=apos_id, limit=limit, incluir_pedidos="pedidos" in incluir
+    )
+    paginacao.definir_proximo_cursor(response, clientes, limit)
+    return clientes
+
+
+@router.get(
+    "/clientes/{cliente_id:int}", response_model=schemas.Cliente, tags=["Clientes"]
+)
+async def obter_cliente(
+    cliente_id: int, db: AsyncSession = Depends(database.get_async_db)
+):
+    """Obtém um cliente pelo ID (versão assíncrona)."""
+    cliente = await crud_async.obter_cliente(db, cliente_id)
+    if not cliente:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+    return cliente
+
+
+@router.get("/pedidos/", response_model=list[schemas.Pedido], tags=["Pedidos"])
+async def listar_pedidos(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 10,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Lista os pedidos cadastrados (versão assíncrona)."""
+    apos_id = paginacao.decodificar_cursor(cursor)
+    pedidos = await crud_async.listar_pedidos(db, apos_id=apos_id, limit=limit)
+    paginacao.definir_proximo_cursor(response, pedidos, limit)
+    nao_modificado = etag.responder_lista(response, if_none_match, "pedidos", pedidos)
+    return nao_modificado or pedidos
+
+
+@router.get("/pedidos/{pedido_id:int}", response_model=schemas.Pedido, tags=["Pedidos"])
+async def obter_pedido(
+    pedido_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Obtém um pedido pelo ID (versão assíncrona)."""
+    if if_none_match:
+        versao = await crud_async.obter_versao(db, models.Pedido, pedido_id)
+        if nao_modificado := etag.verificar_entidade(
+            if_none_match, "pedido", pedido_id, versao
+        ):
+            return nao_modificado
+    pedido = await crud_async.obter_pedido(db, pedido_id)
+    if not pedido:
+        raise HTTPException(status_code=404, detail="Pedido não encontrado")
+    response.headers["ETag"] = etag.da_entidade("pedido", pedido.id, pedido.versao)
+    return pedido
+
+
+@router.get("/produtos/", response_model=list[schemas.Produto], tags=["Produtos"])
+async def listar_produtos(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 10,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Lista os produtos cadastrados (versão assíncrona)."""
+    apos_id = paginacao.decodificar_cursor(cursor)
+    produtos = await crud_async.listar_produtos(db, apos_id=apos_id, limit=limit)
+    paginacao.definir_proximo_cursor(response, produtos, limit)
+    nao_modificado = etag.responder_lista(response, if_none_match, "produtos", produtos)
+    return nao_modificado or produtos
+
+
+@router.get(
+    "/produtos/{produto_id:int}", response_model=schemas.Produto, tags=["Produtos"]
+)
+async def obter_produto(
+    produto_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Obtém um produto pelo ID (versão assíncrona)."""
+    if if_none_match:
+        versao = await crud_async.obter_versao(db, models.Produto, produto_id)
+        if nao_modificado := etag.verificar_entidade(
+            if_none_match, "produto", produto_id, versao
+        ):
+            return nao_modificado
+    produto = await crud_async.obter_produto(db, produto_id)
+    if produto is None:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    response.headers["ETag"] = etag.da_entidade("produto", produto.id, produto.versao)
+    return produto
+
+
+@router.get("/entregas/", response_model=list[schemas.Entrega], tags=["Entregas"])
+async def listar_entregas(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 10,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Lista as entregas cadastradas (versão assíncrona)."""
+    apos_id = paginacao.decodificar_cursor(cursor)
+    entregas = await crud_async.listar_entregas(db, apos_id=apos_id, limit=limit)
+    paginacao.definir_proximo_cursor(response, entregas, limit)
+    nao_modificado = etag.responder_lista(response, if_none_match, "entregas", entregas)
+    return nao_modificado or entregas
+
+
+@router.get(
+    "/entregas/{entrega_id:int}", response_model=schemas.Entrega, tags=["Entregas"]
+)
+async def obter_entrega(
+    entrega_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Obtém uma entrega pelo ID (versão assíncrona)."""
+    if if_none_match:
+        versao = await crud_async.obter_versao(db, models.Entrega, entrega_id)
+        if nao_modificado := etag.verificar_entidade(
+            if_none_match, "entrega", entrega_id, versao
+        ):
+            return nao_modificado
+    entrega = await crud_async.obter_entrega(db, entrega_id)
+    if entrega is None:
+        raise HTTPException(status_code=404, detail="Entrega não encontrada")
+    response.headers["ETag"] = etag.da_entidade("entrega", entrega.id, entrega.versao)
+    return entrega
+
+
+@router.get("/pagamentos/", response_model=list[schemas.Pagamento], tags=["Pagamentos"])
+async def listar_pagamentos(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 10,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Lista os pagamentos cadastrados (versão assíncrona)."""
+    apos_id = paginacao.decodificar_cursor(cursor)
+    pagamentos = await crud_async.listar_pagamentos(db, apos_id=apos_id, limit=limit)
+    paginacao.definir_proximo_cursor(response, pagamentos, limit)
+    nao_modificado = etag.responder_lista(
+        response, if_none_match, "pagamentos", pagamentos
+    )
+    return nao_modificado or pagamentos
+
+
+@router.get(
+    "/pagamentos/{pagamento_id:int}",
+    response_model=schemas.Pagamento,
+    tags=["Pagamentos"],
+)
+async def obter_pagamento(
+    pagamento_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    """Obtém um pagamento pelo ID (versão assíncrona)."""
+    if if_none_match:
+        versao = await crud_async.obter_versao(db, models.Pagamento, pagamento_id)
+        if nao_modificado := etag.verificar_entidade(
+            if_none_match, "pagamento", pagamento_id, versao
+        ):
+            return nao_modificado
+    pagamento = await crud_async.obter_pagamento(db, pagamento_id)
+    if not pagamento:
+        raise HTTPException(status_code=404, detail="Pagamento não encontrado")
+    response.headers["ETag"] = etag.da_entidade(
+        "pagamento", pagamento.id, pagamento.versao
+    )
+    return pagamento
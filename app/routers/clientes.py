@@ -1,8 +1,8 @@
 """Rotas relacionadas aos clientes."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from app import crud, schemas, database
+from app import crud, schemas, database, paginacao
 
 router = APIRouter(tags=["Clientes"])
 
@@ -22,24 +22,35 @@ def criar_cliente(cliente: schemas.ClienteCreate, db: Session = Depends(database
     return crud.criar_cliente(db, cliente)
 
 
-@router.get("/", response_model=list[schemas.Cliente])
+@router.get("/", response_model=list[schemas.ClienteListagem])
 def listar_clientes(
-    skip: int = 0, limit:
-    int = 10,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 10,
+    include: str | None = None,
     db: Session = Depends(database.get_db)
 ):
     """
     Lista os clientes cadastrados.
 
     Args:
-        skip (int): Quantidade de registros a pular.
-        limit (int): Quantidade máxima de registros a retornar.
+        response (Response): Resposta HTTP, recebe o cabeçalho X-Next-Cursor.
+        cursor (str | None): Cursor opaco da página anterior.
+        limit (int): Quantidade máxima de registros (limitada no servidor).
+        include (str | None): Relações a incluir, ex.: `pedidos`. Sem ele, o
+            campo `pedidos` é omitido da resposta.
         db (Session): Sessão do banco de dados.
 
     Returns:
         Lista de clientes.
     """
-    return crud.listar_clientes(db, skip=skip, limit=limit)
+    apos_id = paginacao.decodificar_cursor(cursor)
+    incluir = {item.strip() for item in (include or "").split(",")}
+    clientes = crud.listar_clientes(
+        db, apos_id=apos_id, limit=limit, incluir_pedidos="pedidos" in incluir
+    )
+    paginacao.definir_proximo_cursor(response, clientes, limit)
+    return clientes
 
 
 @router.get("/{cliente_id}", response_model=schemas.Cliente)
@@ -1,8 +1,10 @@
 """Rotas relacionadas às entregas."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from app import crud, schemas, database
+from app import crud, models, schemas, database, etag, paginacao, streaming
+from app import leitura_rapida
 
 router = APIRouter(tags=["Entregas"])
 
@@ -15,20 +17,68 @@ def criar_entrega(entrega: schemas.EntregaCreate, db: Session = Depends(database
 
 @router.get("/", response_model=list[schemas.Entrega])
 def listar_entregas(
-    skip: int = 0,
+    response: Response,
+    cursor: str | None = None,
     limit: int = 10,
+    if_none_match: str | None = Header(None),
     db: Session = Depends(database.get_db),
 ):
-    """Lista todas as entregas cadastradas."""
-    return crud.listar_entregas(db, skip=skip, limit=limit)
+    """Lista as entregas cadastradas, paginadas por cursor (com ETag)."""
+    apos_id = paginacao.decodificar_cursor(cursor)
+    entregas = leitura_rapida.listar(db, "entregas", apos_id, limit)
+    paginacao.definir_proximo_cursor(response, entregas, limit)
+    nao_modificado = etag.responder_lista(response, if_none_match, "entregas", entregas)
+    return nao_modificado or leitura_rapida.resposta_json(entregas, response)
+
+
+@router.get("/export")
+def exportar_entregas(
+    formato: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: Session = Depends(database.get_db),
+):
+    """Exporta todas as entregas em streaming (NDJSON ou CSV).
+
+    Args:
+        formato (str): `ndjson` (padrão) ou `csv`, via `?format=`.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        Resposta em streaming com um registro por linha.
+    """
+    return streaming.resposta_exportacao(
+        db,
+        [
+            models.Entrega.id,
+            models.Entrega.pedido_id,
+            models.Entrega.endereco,
+            models.Entrega.status,
+            models.Entrega.data_entrega,
+        ],
+        formato,
+        nome_arquivo="entregas",
+    )
 
 
 @router.get("/{entrega_id}", response_model=schemas.Entrega)
-def obter_entrega(entrega_id: int, db: Session = Depends(database.get_db)):
-    """Obtém uma entrega pelo ID."""
+def obter_entrega(
+    entrega_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(database.get_db),
+):
+    """Obtém uma entrega pelo ID (304 se a ETag enviada ainda vale)."""
+    if if_none_match:
+        versao = crud.obter_versao(db, models.Entrega, entrega_id)
+        if nao_modificado := etag.verificar_entidade(
+            if_none_match, "entrega", entrega_id, versao
+        ):
+            return nao_modificado
     db_entrega = crud.obter_entrega(db, entrega_id)
     if db_entrega is None:
         raise HTTPException(status_code=404, detail="Entrega não encontrada")
+    response.headers["ETag"] = etag.da_entidade(
+        "entrega", db_entrega.id, db_entrega.versao
+    )
     return db_entrega
 
 
@@ -39,19 +89,17 @@ def atualizar_entrega(
     entrega: schemas.EntregaCreate,
     db: Session = Depends(database.get_db)
 ):
-    """Atualiza uma entrega pelo ID."""
-    db_entrega = crud.obter_entrega(db, entrega_id)
+    """Atualiza uma entrega pelo ID (um único UPDATE; 404 se nenhuma linha)."""
+    db_entrega = crud.atualizar_entrega(db, entrega_id, entrega)
     if db_entrega is None:
         raise HTTPException(status_code=404, detail="Entrega não encontrada")
-    return crud.atualizar_entrega(db, entrega_id, entrega)
+    return db_entrega
 
 
 # Deletar entrega pelo ID
 @router.delete("/{entrega_id}")
 def deletar_entrega(entrega_id: int, db: Session = Depends(database.get_db)):
-    """Deleta uma entrega pelo ID."""
-    db_entrega = crud.obter_entrega(db, entrega_id)
-    if db_entrega is None:
+    """Deleta uma entrega pelo ID (um único DELETE; 404 se nenhuma linha)."""
+    if not crud.deletar_entrega(db, entrega_id):
         raise HTTPException(status_code=404, detail="Entrega não encontrada")
-    crud.deletar_entrega(db, entrega_id)
     return {"message": "Entrega deletada com sucesso"}
@@ -0,0 +1,92 @@
+"""Rotas internas de diagnóstico (pool, threadpool, outbox, logs, cache e SQL).
+
+Expõem SQL normalizado, contadores e estado interno, então exigem o cabeçalho
+`X-Internal-Token` com o valor de INTERNAL_TOKEN. Sem INTERNAL_TOKEN
+configurado as rotas ficam desativadas (404).
+"""
+
+import hmac
+import os
+
+from anyio import to_thread
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.orm import Session
+
+from app import cache, database, instrumentacao, logs, outbox, singleflight
+
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN", "")
+
+
+def exigir_token(x_internal_token: str | None = Header(None)) -> None:
+    """Libera a rota só para quem envia o INTERNAL_TOKEN configurado.
+
+    Raises:
+        HTTPException: 404 se as rotas internas estão desativadas (sem
+            INTERNAL_TOKEN); 403 se o token está ausente ou não confere.
+    """
+    if not INTERNAL_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(
+        x_internal_token.encode(), INTERNAL_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Token interno inválido.")
+
+
+router = APIRouter(
+    tags=["Interno"], dependencies=[Depends(exigir_token)], include_in_schema=False
+)
+
+
+@router.get("/pool")
+async def estado_pool():
+    """Retorna o uso do pool de conexões do banco e do threadpool.
+
+    Returns:
+        Conexões em uso, overflow, tempos de espera por conexão e tokens
+        ocupados do threadpool onde rodam as rotas síncronas.
+    """
+    limitador = to_thread.current_default_thread_limiter()
+    return {
+        "pool": database.metricas_pool.resumo(database.engine.pool),
+        "threadpool": {
+            "limite": limitador.total_tokens,
+            "em_uso": limitador.borrowed_tokens,
+        },
+    }
+
+
+@router.get("/outbox")
+def estado_outbox(db: Session = Depends(database.get_db)):
+    """Retorna os eventos pendentes e falhados na outbox e os contadores do relay."""
+    return {
+        "pendentes": outbox.contar_pendentes(db),
+        "falhados": outbox.contar(db, outbox.STATUS_FALHOU),
+        **outbox.relay.metricas(),
+    }
+
+
+@router.get("/logs")
+async def estado_logs():
+    """Retorna os contadores da fila de logs (enfileirados, descartados, na fila)."""
+    return logs.pipeline.metricas()
+
+
+@router.get("/cache")
+async def estado_cache():
+    """Retorna as métricas do cache de entidades e da coalescência de buscas."""
+    return {
+        **cache.backend.metricas(),
+        "relatorios": cache.relatorios.metricas(),
+        "singleflight": singleflight.grupo.metricas(),
+        "singleflight_async": singleflight.grupo_async.metricas(),
+    }
+
+
+@router.get("/sql")
+async def estado_sql(limite: int = 20):
+    """Retorna os comandos SQL (normalizados) com maior tempo total, por rota."""
+    return {
+        "slow_query_ms": instrumentacao.SLOW_QUERY_MS,
+        "descartados": instrumentacao.estatisticas.descartados,
+        "comandos": instrumentacao.estatisticas.mais_custosos(limite),
+    }
@@ -1,8 +1,10 @@
 """Rotas relacionadas aos pagamentos."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from app import crud, schemas, database
+from app import crud, models, schemas, database, etag, paginacao, streaming
+from app import idempotencia, leitura_rapida
 
 router = APIRouter(tags=["Pagamentos"])
 
@@ -10,58 +12,132 @@ router = APIRouter(tags=["Pagamentos"])
 @router.post("/", response_model=schemas.Pagamento, status_code=status.HTTP_201_CREATED)
 def criar_pagamento(
     pagamento: schemas.PagamentoCreate,
+    idempotency_key: str | None = Header(None, max_length=idempotencia.CHAVE_MAXIMA),
     db: Session = Depends(database.get_db),
 ):
     """Cria um novo pagamento associado a um pedido.
 
+    Com o cabeçalho Idempotency-Key, repetições recebem a resposta da
+    primeira requisição sem criar outro pagamento.
+
     Args:
         pagamento (PagamentoCreate): Dados do pagamento.
+        idempotency_key (str | None): Chave de idempotência da requisição.
         db (Session): Sessão do banco de dados.
 
     Returns:
         Pagamento criado.
+
+    Raises:
+        HTTPException: 409 se a chave está em processamento; 422 se a chave
+            foi usada com outro corpo.
     """
-    return crud.criar_pagamento(db, pagamento)
+    if idempotency_key is None:
+        return crud.criar_pagamento(db, pagamento)
+    return idempotencia.responder(
+        db,
+        "POST /pagamentos/",
+        idempotency_key,
+        pagamento.model_dump(mode="json"),
+        lambda antes_do_commit: crud.criar_pagamento(db, pagamento, antes_do_commit),
+        schemas.Pagamento,
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.get("/", response_model=list[schemas.Pagamento])
 def listar_pagamentos(
-    skip: int = 0,
+    response: Response,
+    cursor: str | None = None,
     limit: int = 10,
+    if_none_match: str | None = Header(None),
     db: Session = Depends(database.get_db),
 ):
-    """Lista todos os pagamentos cadastrados com paginação.
+    """Lista os pagamentos cadastrados com paginação por cursor.
 
     Args:
-        skip (int): Quantidade de registros a pular.
-        limit (int): Quantidade máxima de registros a retornar.
+        response (Response): Resposta HTTP, recebe o cabeçalho X-Next-Cursor.
+        cursor (str | None): Cursor opaco da página anterior.
+        limit (int): Quantidade máxima de registros (limitada no servidor).
+        if_none_match (str | None): ETag da página que o cliente já tem.
         db (Session): Sessão do banco de dados.
 
     Returns:
-        Lista de pagamentos.
+        Lista de pagamentos, ou 304 se a página não mudou.
+
+    """
+    apos_id = paginacao.decodificar_cursor(cursor)
+    pagamentos = leitura_rapida.listar(db, "pagamentos", apos_id, limit)
+    paginacao.definir_proximo_cursor(response, pagamentos, limit)
+    nao_modificado = etag.responder_lista(
+        response, if_none_match, "pagamentos", pagamentos
+    )
+    return nao_modificado or leitura_rapida.resposta_json(pagamentos, response)
+
+
+@router.get("/export")
+def exportar_pagamentos(
+    formato: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: Session = Depends(database.get_db),
+):
+    """Exporta todos os pagamentos em streaming (NDJSON ou CSV).
 
+    Args:
+        formato (str): `ndjson` (padrão) ou `csv`, via `?format=`.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        Resposta em streaming com um registro por linha.
     """
-    return crud.listar_pagamentos(db, skip=skip, limit=limit)
+    return streaming.resposta_exportacao(
+        db,
+        [
+            models.Pagamento.id,
+            models.Pagamento.pedido_id,
+            models.Pagamento.valor,
+            models.Pagamento.forma_pagamento,
+            models.Pagamento.status,
+            models.Pagamento.created_at,
+        ],
+        formato,
+        nome_arquivo="pagamentos",
+    )
 
 
 @router.get("/{pagamento_id}", response_model=schemas.Pagamento)
-def obter_pagamento(pagamento_id: int, db: Session = Depends(database.get_db)):
+def obter_pagamento(
+    pagamento_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(database.get_db),
+):
     """Obtém um pagamento pelo ID.
 
     Args:
         pagamento_id (int): ID do pagamento.
+        response (Response): Resposta HTTP, recebe o cabeçalho ETag.
+        if_none_match (str | None): ETag que o cliente já tem.
         db (Session): Sessão do banco de dados.
 
     Returns:
-        Pagamento correspondente ao ID.
+        Pagamento correspondente ao ID, ou 304 se não mudou.
 
     Raises:
         HTTPException: 404 se o pagamento não for encontrado.
 
     """
+    if if_none_match:
+        versao = crud.obter_versao(db, models.Pagamento, pagamento_id)
+        if nao_modificado := etag.verificar_entidade(
+            if_none_match, "pagamento", pagamento_id, versao
+        ):
+            return nao_modificado
     pagamento = crud.obter_pagamento(db, pagamento_id)
     if not pagamento:
         raise HTTPException(status_code=404, detail="Pagamento não encontrado")
+    response.headers["ETag"] = etag.da_entidade(
+        "pagamento", pagamento.id, pagamento.versao
+    )
     return pagamento
 
 
@@ -1,12 +1,13 @@
 """Rotas relacionadas aos pedidos."""
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 # Own libraries
-from app import crud, schemas, database
-from app.sqs import enviar_mensagem
+from app import crud, models, schemas, database, etag, paginacao, streaming
+from app import idempotencia, leitura_rapida
 
 router = APIRouter(tags=["Pedidos"])
 logger = logging.getLogger(__name__)
@@ -16,66 +17,160 @@ logger = logging.getLogger(__name__)
 def criar_pedido(
     cliente_id: int,
     pedido: schemas.PedidoCreate,
+    idempotency_key: str | None = Header(None, max_length=idempotencia.CHAVE_MAXIMA),
     db: Session = Depends(database.get_db),
 ):
-    """Cria um novo pedido associado a um cliente e envia para a fila SQS.
+    """Cria um novo pedido associado a um cliente.
+
+    O evento para a SQS é gravado na outbox na mesma transação e publicado
+    pelo relay, fora do caminho da requisição. Os itens, se houver, definem
+    o `valor_total` e têm o estoque reservado na mesma transação. Com o
+    cabeçalho Idempotency-Key, repetições recebem a resposta da primeira
+    requisição sem criar outro pedido.
 
     Args:
         cliente_id (int): ID do cliente.
         pedido (PedidoCreate): Dados do pedido.
+        idempotency_key (str | None): Chave de idempotência da requisição.
         db (Session): Sessão do banco de dados.
 
     Returns:
         Pedido criado.
+
+    Raises:
+        HTTPException: 404 se algum item referencia um produto inexistente;
+            409 se algum produto não tem estoque para o pedido ou se a chave
+            está em processamento; 422 se a chave foi usada com outro corpo.
     """
-    novo_pedido = crud.criar_pedido(db, pedido, cliente_id)
 
-    mensagem = {
-        "pedido_id": novo_pedido.id,
-        "cliente_id": cliente_id,
-        "valor_total": str(novo_pedido.valor_total),
-    }
-    if enviar_mensagem(mensagem):
-        logger.info(f"📩 Pedido {novo_pedido.id} enviado para SQS com sucesso.")
-    else:
-        logger.warning(f"⚠️ Pedido {novo_pedido.id} criado mas não enviado ao SQS.")
+    def criar(antes_do_commit=None):
+        try:
+            novo_pedido = crud.criar_pedido(db, pedido, cliente_id, antes_do_commit)
+        except crud.ProdutoNaoEncontrado as exc:
+            raise HTTPException(status_code=404, detail=str(exc)) from exc
+        except crud.EstoqueInsuficiente as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        logger.info("📩 Pedido %s criado; evento gravado na outbox.", novo_pedido.id)
+        return novo_pedido
+
+    if idempotency_key is None:
+        return criar()
+    dados = {"cliente_id": cliente_id, **pedido.model_dump(mode="json")}
+    return idempotencia.responder(
+        db, "POST /pedidos/", idempotency_key, dados, criar, schemas.Pedido
+    )
+
+
+@router.post("/lote", response_model=schemas.PedidoLoteResultado)
+def criar_pedidos_lote(
+    lote: schemas.PedidoLoteCreate,
+    db: Session = Depends(database.get_db),
+):
+    """Cria vários pedidos e seus eventos da outbox em uma única transação.
 
-    return novo_pedido
+    Args:
+        lote (PedidoLoteCreate): Pedidos a criar, cada um com seu cliente.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        Pedidos criados e falhas (com o índice do pedido no lote).
+    """
+    criados, falhas = crud.criar_pedidos_lote(db, lote.pedidos)
+    logger.info("📩 %d pedidos criados em lote; eventos gravados na outbox.", len(criados))
+
+    return schemas.PedidoLoteResultado(criados=criados, falhas=falhas)
 
 
 @router.get("/", response_model=list[schemas.Pedido])
 def listar_pedidos(
-    skip: int = 0, limit: int = 10, db: Session = Depends(database.get_db)
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 10,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(database.get_db),
 ):
     """
     Lista os pedidos cadastrados.
 
+    Só as colunas da resposta são lidas (Core) e codificadas direto em JSON,
+    sem objetos do ORM nem revalidação pelo Pydantic (`leitura_rapida`).
+
+    Args:
+        response (Response): Resposta HTTP, recebe o cabeçalho X-Next-Cursor.
+        cursor (str | None): Cursor opaco da página anterior.
+        limit (int): Quantidade máxima de registros (limitada no servidor).
+        if_none_match (str | None): ETag da página que o cliente já tem.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        Lista de pedidos, ou 304 se a página não mudou.
+    """
+    apos_id = paginacao.decodificar_cursor(cursor)
+    pedidos = leitura_rapida.listar(db, "pedidos", apos_id, limit)
+    paginacao.definir_proximo_cursor(response, pedidos, limit)
+    nao_modificado = etag.responder_lista(response, if_none_match, "pedidos", pedidos)
+    return nao_modificado or leitura_rapida.resposta_json(pedidos, response)
+
+
+@router.get("/export")
+def exportar_pedidos(
+    formato: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: Session = Depends(database.get_db),
+):
+    """Exporta todos os pedidos em streaming (NDJSON ou CSV).
+
     Args:
-        skip (int): Quantidade de registros a pular.
-        limit (int): Quantidade máxima de registros a retornar.
+        formato (str): `ndjson` (padrão) ou `csv`, via `?format=`.
         db (Session): Sessão do banco de dados.
 
     Returns:
-        Lista de pedidos.
+        Resposta em streaming com um registro por linha.
     """
-    return crud.listar_pedidos(db, skip=skip, limit=limit)
+    return streaming.resposta_exportacao(
+        db,
+        [
+            models.Pedido.id,
+            models.Pedido.descricao,
+            models.Pedido.cliente_id,
+            models.Pedido.valor_total,
+        ],
+        formato,
+        nome_arquivo="pedidos",
+    )
 
 
 @router.get("/{pedido_id}", response_model=schemas.Pedido)
-def obter_pedido(pedido_id: int, db: Session = Depends(database.get_db)):
+def obter_pedido(
+    pedido_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(database.get_db),
+):
     """
     Obtém um pedido pelo ID.
 
+    Com If-None-Match, só a versão do pedido é consultada; se a ETag ainda
+    vale, a resposta é 304 sem corpo.
+
     Args:
         pedido_id (int): ID do pedido.
+        response (Response): Resposta HTTP, recebe o cabeçalho ETag.
+        if_none_match (str | None): ETag que o cliente já tem.
         db (Session): Sessão do banco de dados.
 
     Returns:
-        Pedido correspondente ao ID.
+        Pedido correspondente ao ID, ou 304 se não mudou.
     """
+    if if_none_match:
+        versao = crud.obter_versao(db, models.Pedido, pedido_id)
+        if nao_modificado := etag.verificar_entidade(
+            if_none_match, "pedido", pedido_id, versao
+        ):
+            return nao_modificado
     pedido = crud.obter_pedido(db, pedido_id)
     if not pedido:
         raise HTTPException(status_code=404, detail="Pedido não encontrado")
+    response.headers["ETag"] = etag.da_entidade("pedido", pedido.id, pedido.versao)
     return pedido
 
 
@@ -1,8 +1,8 @@
 """Rotas relacionadas aos produtos."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from app import crud, schemas, database
+from app import crud, models, schemas, database, etag, paginacao, leitura_rapida
 
 router = APIRouter(tags=["Produtos"])
 
@@ -26,40 +26,69 @@ def criar_produto(
 
 @router.get("/", response_model=list[schemas.Produto])
 def listar_produtos(
-    skip: int = 0, limit: int = 10, db: Session = Depends(database.get_db)
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 10,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(database.get_db),
 ):
     """
     Lista os produtos cadastrados.
 
+    Só as colunas da resposta são lidas (Core) e codificadas direto em JSON,
+    sem objetos do ORM nem revalidação pelo Pydantic (`leitura_rapida`).
+
     Args:
-        skip (int): Quantidade de registros a pular.
-        limit (int): Quantidade máxima de registros a retornar.
+        response (Response): Resposta HTTP, recebe o cabeçalho X-Next-Cursor.
+        cursor (str | None): Cursor opaco da página anterior.
+        limit (int): Quantidade máxima de registros (limitada no servidor).
+        if_none_match (str | None): ETag da página que o cliente já tem.
         db (Session): Sessão do banco de dados.
 
     Returns:
-        Lista de produtos.
+        Lista de produtos, ou 304 se a página não mudou.
     """
-    return crud.listar_produtos(db, skip=skip, limit=limit)
+    apos_id = paginacao.decodificar_cursor(cursor)
+    produtos = leitura_rapida.listar(db, "produtos", apos_id, limit)
+    paginacao.definir_proximo_cursor(response, produtos, limit)
+    nao_modificado = etag.responder_lista(response, if_none_match, "produtos", produtos)
+    return nao_modificado or leitura_rapida.resposta_json(produtos, response)
 
 
 @router.get("/{produto_id}", response_model=schemas.Produto)
-def obter_produto(produto_id: int, db: Session = Depends(database.get_db)):
+def obter_produto(
+    produto_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(database.get_db),
+):
     """
     Obtém um produto pelo ID.
 
     Args:
         produto_id (int): ID do produto.
+        response (Response): Resposta HTTP, recebe o cabeçalho ETag.
+        if_none_match (str | None): ETag que o cliente já tem.
         db (Session): Sessão do banco de dados.
 
     Returns:
-        Produto correspondente ao ID.
+        Produto correspondente ao ID, ou 304 se não mudou.
 
     Raises:
         HTTPException: 404 se o produto não for encontrado.
     """
+    if if_none_match:
+        versao = crud.obter_versao(db, models.Produto, produto_id)
+        if nao_modificado := etag.verificar_entidade(
+            if_none_match, "produto", produto_id, versao
+        ):
+            return nao_modificado
     db_produto = crud.obter_produto(db, produto_id)
     if db_produto is None:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
+    response.headers["ETag"] = etag.da_entidade(
+        "produto", db_produto.id, db_produto.versao
+    )
     return db_produto
 
 
@@ -102,9 +131,13 @@ def deletar_produto(produto_id: int, db: Session = Depends(database.get_db)):
         Uma mensagem de sucesso.
 
     Raises:
-        HTTPException: 404 se o produto não for encontrado.
+        HTTPException: 404 se o produto não for encontrado; 409 se ele está
+            em itens de pedidos.
     """
-    sucesso = crud.deletar_produto(db, produto_id)
+    try:
+        sucesso = crud.deletar_produto(db, produto_id)
+    except crud.ProdutoEmUso as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     if not sucesso:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
     return {"message": "Produto deletado com sucesso."}
@@ -1,47 +1,71 @@
-"""Rotas de relatórios extras do sistema EasyOrder."""
+"""Rotas de relatórios extras do sistema EasyOrder.
 
-from fastapi import APIRouter, Depends
+Os resultados ficam em cache por até RELATORIOS_MAX_STALENESS segundos (ou até
+uma escrita que os afete); os cabeçalhos Cache-Control e Age informam ao
+cliente a idade da resposta.
+"""
+
+from typing import Literal
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from datetime import datetime
-from app import models, schemas, database
+from app import cache, crud, schemas, database, paginacao, streaming
 
 router = APIRouter(tags=["Relatórios"])
 
 
+def _cabecalhos_cache(response: Response, idade: float) -> None:
+    """Informa a idade do resultado e por quanto tempo ele ainda vale."""
+    restante = max(int(cache.relatorios.max_staleness - idade), 0)
+    response.headers["Cache-Control"] = f"private, max-age={restante}"
+    response.headers["Age"] = str(int(idade))
+
+
 @router.get("/pedidos-por-cliente", response_model=list[schemas.RelatorioPedidosCliente])
-def relatorio_pedidos_por_cliente(db: Session = Depends(database.get_db)):
-    """Retorna a quantidade total de pedidos por cliente."""
-    clientes = db.query(models.Cliente).all()
-    relatorio = []
-    for cliente in clientes:
-        relatorio.append(
-            {
-                "cliente_id": cliente.id,
-                "nome_cliente": cliente.nome,
-                "total_pedidos": len(cliente.pedidos),
-            }
-        )
+def relatorio_pedidos_por_cliente(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = paginacao.LIMITE_MAXIMO,
+    formato: Literal["json", "ndjson"] = "json",
+    db: Session = Depends(database.get_db),
+):
+    """Retorna a quantidade total de pedidos por cliente.
+
+    Em JSON, o relatório é paginado por cursor (cabeçalho X-Next-Cursor).
+    Com `formato=ndjson`, o relatório completo é transmitido em streaming.
+    """
+    if formato == "ndjson":
+        return streaming.resposta_ndjson(db, crud.iterar_relatorio_pedidos_por_cliente)
+
+    apos_id = paginacao.decodificar_cursor(cursor)
+    relatorio, idade = cache.relatorios.obter(
+        crud.RELATORIO_PEDIDOS_POR_CLIENTE,
+        (apos_id, paginacao.limitar(limit)),
+        lambda: crud.relatorio_pedidos_por_cliente(db, apos_id=apos_id, limit=limit),
+    )
+    _cabecalhos_cache(response, idade)
+    paginacao.definir_proximo_cursor(response, relatorio, limit, campo_id="cliente_id")
     return relatorio
 
 
 @router.get("/faturamento")
 def relatorio_faturamento(
-    inicio: str, fim: str, db: Session = Depends(database.get_db)
+    inicio: str, fim: str, response: Response, db: Session = Depends(database.get_db)
 ):
-    """Retorna o total faturado em um período (considera apenas pagamentos pagos)."""
-    inicio_dt = datetime.strptime(inicio, "%Y-%m-%d")
-    fim_dt = datetime.strptime(fim, "%Y-%m-%d")
-
-    total = (
-        db.query(models.Pagamento)
-        .filter(models.Pagamento.status == "pago")
-        .filter(models.Pagamento.created_at >= inicio_dt)
-        .filter(models.Pagamento.created_at <= fim_dt)
-        .with_entities(models.Pagamento.valor)
-        .all()
-    )
+    """Retorna o total faturado em um período (considera apenas pagamentos pagos).
 
-    total_faturado = sum(v[0] for v in total)
+    O total vem do rollup `faturamento_diario`, com os dias `inicio` e `fim`
+    inclusos.
+    """
+    inicio_dt = datetime.strptime(inicio, "%Y-%m-%d").date()
+    fim_dt = datetime.strptime(fim, "%Y-%m-%d").date()
+
+    total_faturado, idade = cache.relatorios.obter(
+        crud.RELATORIO_FATURAMENTO,
+        (inicio_dt, fim_dt),
+        lambda: crud.total_faturado(db, inicio_dt, fim_dt),
+    )
+    _cabecalhos_cache(response, idade)
 
     return {
         "total_faturado": total_faturado,
@@ -51,15 +75,13 @@ def relatorio_faturamento(
 
 @router.get("/produtos-estoque-baixo")
 def relatorio_produtos_estoque_baixo(
-    limite: int = 5, db: Session = Depends(database.get_db)
+    response: Response, limite: int = 5, db: Session = Depends(database.get_db)
 ):
     """Lista produtos com estoque abaixo do limite informado (default = 5)."""
-    produtos = (
-        db.query(models.Produto)
-        .filter(models.Produto.qtd_estoque < limite)
-        .all()
+    produtos, idade = cache.relatorios.obter(
+        crud.RELATORIO_ESTOQUE_BAIXO,
+        (limite,),
+        lambda: crud.produtos_estoque_baixo(db, limite),
     )
-
-    return [
-        {"id": p.id, "nome": p.nome, "qtd_estoque": p.qtd_estoque} for p in produtos
-    ]
+    _cabecalhos_cache(response, idade)
+    return produtos
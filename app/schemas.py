@@ -1,8 +1,11 @@
 """Esquemas Pydantic para validação de dados da API."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_serializer
 from datetime import datetime
 
+# Quantidade máxima de pedidos aceitos por requisição em POST /pedidos/lote.
+PEDIDOS_LOTE_MAXIMO = 500
+
 
 class PedidoBase(BaseModel):
     """Schema base para pedidos."""
@@ -11,10 +14,21 @@ class PedidoBase(BaseModel):
     valor_total: float = 0.0
 
 
+class PedidoItemCreate(BaseModel):
+    """Item de um pedido: produto e quantidade a reservar do estoque."""
+
+    produto_id: int
+    quantidade: int = Field(gt=0)
+
+
 class PedidoCreate(PedidoBase):
-    """Schema de criação de pedidos."""
+    """Schema de criação de pedidos.
 
-    pass
+    Com `itens`, o estoque de cada produto é reservado na criação e o
+    `valor_total` passa a ser a soma dos itens pelo preço atual.
+    """
+
+    itens: list[PedidoItemCreate] = []
 
 
 class PedidoUpdate(BaseModel):
@@ -28,6 +42,8 @@ class Pedido(PedidoBase):
 
     id: int
     cliente_id: int
+    # Versão da linha, usada só para a ETag (não vai no corpo da resposta).
+    versao: int = Field(1, exclude=True)
 
     class Config:
         """Configurações do Pydantic."""
@@ -35,6 +51,33 @@ class Pedido(PedidoBase):
         from_attributes = True
 
 
+class PedidoLoteItem(PedidoBase):
+    """Schema de um pedido dentro de uma criação em lote."""
+
+    cliente_id: int
+
+
+class PedidoLoteCreate(BaseModel):
+    """Schema de criação de pedidos em lote."""
+
+    pedidos: list[PedidoLoteItem] = Field(min_length=1, max_length=PEDIDOS_LOTE_MAXIMO)
+
+
+class PedidoLoteFalha(BaseModel):
+    """Pedido do lote que não pôde ser criado."""
+
+    indice: int
+    cliente_id: int
+    erro: str
+
+
+class PedidoLoteResultado(BaseModel):
+    """Resultado de uma criação de pedidos em lote."""
+
+    criados: list[Pedido]
+    falhas: list[PedidoLoteFalha]
+
+
 class ClienteBase(BaseModel):
     """Schema base para clientes."""
 
@@ -60,6 +103,29 @@ class Cliente(ClienteBase):
         from_attributes = True
 
 
+class ClienteListagem(ClienteBase):
+    """Schema de clientes na listagem.
+
+    `pedidos` só aparece quando foi pedido (`include=pedidos`); sem ele o
+    campo é omitido, em vez de vir como uma lista vazia enganosa.
+    """
+
+    id: int
+    pedidos: list[Pedido] | None = None
+
+    class Config:
+        """Configurações do Pydantic."""
+
+        from_attributes = True
+
+    @model_serializer(mode="wrap")
+    def _omitir_pedidos_nao_carregados(self, serializar):
+        dados = serializar(self)
+        if self.pedidos is None:
+            dados.pop("pedidos", None)
+        return dados
+
+
 class RelatorioPedidosCliente(BaseModel):
     """Schema para relatório de pedidos por cliente."""
 
@@ -102,6 +168,7 @@ class Produto(ProdutoBase):
     """Schema de leitura de produtos."""
 
     id: int
+    versao: int = Field(1, exclude=True)
 
     class Config:
         """Configurações do Pydantic."""
@@ -137,6 +204,7 @@ class Entrega(EntregaBase):
 
     id: int
     pedido_id: int
+    versao: int = Field(1, exclude=True)
 
     class Config:
         """Configurações do Pydantic."""
@@ -170,6 +238,7 @@ class Pagamento(PagamentoBase):
     id: int
     status: str
     created_at: datetime
+    versao: int = Field(1, exclude=True)
 
     class Config:
         """Configurações do Pydantic para o schema Pagamento."""
@@ -0,0 +1,122 @@
+"""Coalescência de chamadas concorrentes pela mesma chave (single-flight).
+
+Enquanto uma busca por uma chave está em andamento, as demais chamadas com a
+mesma chave esperam e recebem o mesmo resultado (ou a mesma exceção), em vez
+de repetir a consulta no banco. `SingleFlight` atende as rotas síncronas (uma
+thread por requisição); `SingleFlightAsync`, as corrotinas de um event loop.
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class _Chamada:
+    """Busca em andamento e seu resultado."""
+
+    __slots__ = ("evento", "resultado", "erro")
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.erro: BaseException | None = None
+
+
+class SingleFlight:
+    """Single-flight para chamadas síncronas, seguro entre threads."""
+
+    def __init__(self):
+        """Inicializa o registro de chamadas em andamento e os contadores."""
+        self._lock = threading.Lock()
+        self._em_andamento: dict[str, _Chamada] = {}
+        self.executadas = 0
+        self.coalescidas = 0
+
+    def executar(self, chave: str, funcao: Callable[[], T]) -> T:
+        """Executa `funcao` uma vez por chave em andamento e compartilha o retorno."""
+        with self._lock:
+            chamada = self._em_andamento.get(chave)
+            lider = chamada is None
+            if lider:
+                chamada = self._em_andamento[chave] = _Chamada()
+                self.executadas += 1
+            else:
+                self.coalescidas += 1
+
+        if not lider:
+            chamada.evento.wait()
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado
+
+        try:
+            chamada.resultado = funcao()
+            return chamada.resultado
+        except BaseException as e:
+            chamada.erro = e
+            raise
+        finally:
+            with self._lock:
+                del self._em_andamento[chave]
+            chamada.evento.set()
+
+    def metricas(self) -> dict:
+        """Retorna quantas buscas foram executadas e quantas foram coalescidas."""
+        with self._lock:
+            return {
+                "executadas": self.executadas,
+                "coalescidas": self.coalescidas,
+                "em_andamento": len(self._em_andamento),
+            }
+
+
+class SingleFlightAsync:
+    """Single-flight para corrotinas de um mesmo event loop.
+
+    A busca roda em uma task própria, que todas as corrotinas da chave (a
+    primeira inclusive) aguardam com `asyncio.shield`: cancelar qualquer uma
+    delas (ex. cliente desconectou) não cancela a busca das demais.
+    """
+
+    def __init__(self):
+        """Inicializa o registro de tasks em andamento e os contadores."""
+        self._em_andamento: dict[str, asyncio.Task] = {}
+        self.executadas = 0
+        self.coalescidas = 0
+
+    async def executar(
+        self, chave: str, funcao: Callable[[], Coroutine[Any, Any, T]]
+    ) -> T:
+        """Aguarda `funcao()` uma vez por chave em andamento e compartilha o retorno."""
+        tarefa = self._em_andamento.get(chave)
+        if tarefa is not None:
+            self.coalescidas += 1
+        else:
+            tarefa = asyncio.create_task(funcao())
+            self._em_andamento[chave] = tarefa
+            self.executadas += 1
+            tarefa.add_done_callback(lambda t: self._liberar(chave, t))
+        return await asyncio.shield(tarefa)
+
+    def _liberar(self, chave: str, tarefa: asyncio.Task) -> None:
+        """Remove a task concluída do registro e marca a exceção como lida."""
+        if self._em_andamento.get(chave) is tarefa:
+            del self._em_andamento[chave]
+        # Evita o aviso de exceção não lida quando ninguém mais aguarda.
+        if not tarefa.cancelled():
+            tarefa.exception()
+
+    def metricas(self) -> dict:
+        """Retorna quantas buscas foram executadas e quantas foram coalescidas."""
+        return {
+            "executadas": self.executadas,
+            "coalescidas": self.coalescidas,
+            "em_andamento": len(self._em_andamento),
+        }
+
+
+grupo = SingleFlight()
+grupo_async = SingleFlightAsync()
@@ -1,21 +1,160 @@
 """Serviço para integração com Amazon SQS."""
 
+import base64
+import json
 import os
+import zlib
 import boto3
 import logging
 
+from app import metricas
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 AWS_REGION = os.getenv("AWS_DEFAULT_REGION", "sa-east-1")
 SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL", "")
 
+
+def _resolver_codec(codec: str) -> str:
+    """Valida o codec configurado; sem msgpack instalado, avisa e usa JSON."""
+    if codec not in ("json", "msgpack"):
+        raise ValueError(f"SQS_CODEC não suportado: {codec}")
+    if codec == "msgpack" and msgpack is None:
+        logger.warning("SQS_CODEC=msgpack, mas msgpack não está instalado; usando JSON.")
+        return "json"
+    return codec
+
+
+# Codec dos corpos das mensagens: "json" (orjson, se instalado) ou "msgpack".
+# Resolvido uma vez, na importação, para não avisar a cada mensagem.
+SQS_CODEC = _resolver_codec(os.getenv("SQS_CODEC", "json"))
+# Corpos codificados maiores que isso (em bytes) são comprimidos com zlib;
+# 0 desliga a compressão.
+SQS_COMPRIMIR_ACIMA = int(os.getenv("SQS_COMPRIMIR_ACIMA", "2048"))
+VERSAO_ENVELOPE = 1
+
 sqs_client = None
 if SQS_QUEUE_URL:
     try:
         sqs_client = boto3.client("sqs", region_name=AWS_REGION)
         logger.info("✅ Cliente SQS inicializado com sucesso.")
     except Exception as e:
-        logger.warning(f"⚠️ Falha ao inicializar cliente SQS: {e}")
+        logger.warning("⚠️ Falha ao inicializar cliente SQS: %s", e)
+
+
+def sqs_configurado() -> bool:
+    """Indica se há cliente e URL de fila SQS configurados."""
+    return bool(sqs_client and SQS_QUEUE_URL)
+
+
+class MensagemInvalida(ValueError):
+    """Corpo de mensagem que não pode ser decodificado; não adianta repetir."""
+
+
+def _dumps_json(valor) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(valor, default=str)
+    return json.dumps(valor, separators=(",", ":"), default=str).encode()
+
+
+def codificar_mensagem(
+    mensagem: dict,
+    codec: str | None = None,
+    comprimir_acima: int | None = None,
+) -> str:
+    """Codifica uma mensagem em um envelope versionado para o corpo da SQS.
+
+    O envelope é `{"v": VERSAO_ENVELOPE, "tipo": ..., "dados": {...}}`. Em JSON
+    sem compressão, o corpo é o próprio JSON compacto; em msgpack ou comprimido,
+    é `"<codec>[+zlib]:<base64>"`, já que a SQS só aceita texto.
+
+    Args:
+        mensagem (dict): Evento com a chave "tipo" e os demais campos.
+        codec (str | None): "json" ou "msgpack" (padrão: SQS_CODEC).
+        comprimir_acima (int | None): Tamanho em bytes a partir do qual o
+            corpo é comprimido (padrão: SQS_COMPRIMIR_ACIMA; 0 desliga).
+
+    Returns:
+        str: Corpo da mensagem.
+
+    Raises:
+        ValueError: Se o codec não é suportado ou msgpack não está instalado.
+    """
+    codec = codec or SQS_CODEC
+    if comprimir_acima is None:
+        comprimir_acima = SQS_COMPRIMIR_ACIMA
+    dados = {chave: valor for chave, valor in mensagem.items() if chave != "tipo"}
+    envelope = {"v": VERSAO_ENVELOPE, "tipo": mensagem.get("tipo"), "dados": dados}
+
+    if codec == "msgpack":
+        if msgpack is None:
+            raise ValueError("Codec msgpack pedido, mas msgpack não está instalado.")
+        bruto = msgpack.packb(envelope, default=str)
+    elif codec == "json":
+        bruto = _dumps_json(envelope)
+    else:
+        raise ValueError(f"Codec não suportado: {codec}")
+
+    if comprimir_acima and len(bruto) > comprimir_acima:
+        comprimido = zlib.compress(bruto)
+        if len(comprimido) * 4 // 3 < len(bruto):
+            return f"{codec}+zlib:" + base64.b64encode(comprimido).decode()
+    if codec == "json":
+        return bruto.decode()
+    return f"{codec}:" + base64.b64encode(bruto).decode()
+
+
+def decodificar_mensagem(corpo: str) -> dict:
+    """Decodifica um corpo gerado por `codificar_mensagem`.
+
+    Returns:
+        dict: O evento plano (`tipo` + dados), como foi enviado.
+
+    Raises:
+        MensagemInvalida: Se o corpo não puder ser decodificado ou tiver uma
+            versão de envelope desconhecida.
+    """
+    try:
+        if corpo.startswith("{"):
+            envelope = orjson.loads(corpo) if orjson is not None else json.loads(corpo)
+        else:
+            formato, _, conteudo = corpo.partition(":")
+            codec, _, compressao = formato.partition("+")
+            bruto = base64.b64decode(conteudo, validate=True)
+            if compressao == "zlib":
+                bruto = zlib.decompress(bruto)
+            elif compressao:
+                raise MensagemInvalida(f"compressão desconhecida: {compressao}")
+            if codec == "json":
+                envelope = json.loads(bruto)
+            elif codec == "msgpack" and msgpack is not None:
+                envelope = msgpack.unpackb(bruto)
+            else:
+                raise MensagemInvalida(f"codec indisponível: {codec}")
+    except MensagemInvalida:
+        raise
+    except Exception as e:
+        raise MensagemInvalida(f"corpo ilegível: {e}") from e
+
+    if not isinstance(envelope, dict):
+        raise MensagemInvalida("o corpo da mensagem não é um objeto")
+    versao = envelope.get("v")
+    if versao is None:
+        # Corpo JSON plano, anterior ao envelope.
+        return envelope
+    if versao != VERSAO_ENVELOPE:
+        raise MensagemInvalida(f"versão de envelope desconhecida: {versao}")
+    return {"tipo": envelope.get("tipo"), **envelope.get("dados", {})}
 
 
 def enviar_mensagem(mensagem: dict) -> bool:
@@ -24,16 +163,70 @@ def enviar_mensagem(mensagem: dict) -> bool:
         logger.warning("SQS não configurado, mensagem não enviada.")
         return False
     try:
-        sqs_client.send_message(QueueUrl=SQS_QUEUE_URL, MessageBody=str(mensagem))
+        corpo = codificar_mensagem(mensagem)
+        with metricas.cronometrar_sqs("send_message"):
+            sqs_client.send_message(QueueUrl=SQS_QUEUE_URL, MessageBody=corpo)
         logger.info("Mensagem enviada para SQS com sucesso.")
         return True
     except Exception as e:
-        logger.error(f"Erro ao enviar mensagem para SQS: {e}")
+        logger.error("Erro ao enviar mensagem para SQS: %s", e)
         return False
 
 
+# Limite da API do SQS para send_message_batch.
+TAMANHO_LOTE_SQS = 10
+
+
+def enviar_mensagens_lote(mensagens: list[dict]) -> list[bool | None]:
+    """Envia mensagens para a fila SQS em lotes de até 10 (send_message_batch).
+
+    Uma falha da chamada inteira (fila fora do ar, throttling, credenciais,
+    rede) não diz nada sobre as mensagens; só as listadas em `Failed` foram
+    de fato recusadas pela fila.
+
+    Returns:
+        list[bool | None]: Para cada mensagem, na mesma ordem: True se foi
+        aceita, False se a SQS a recusou (`Failed`) e None se não chegou a
+        ser enviada (erro de transporte ou SQS não configurada).
+    """
+    enviados: list[bool | None] = [None] * len(mensagens)
+    if not mensagens:
+        return enviados
+    if not sqs_client or not SQS_QUEUE_URL:
+        logger.warning("SQS não configurado, %d mensagens não enviadas.", len(mensagens))
+        return enviados
+
+    for inicio in range(0, len(mensagens), TAMANHO_LOTE_SQS):
+        lote = mensagens[inicio:inicio + TAMANHO_LOTE_SQS]
+        entradas = [
+            {"Id": str(inicio + i), "MessageBody": codificar_mensagem(mensagem)}
+            for i, mensagem in enumerate(lote)
+        ]
+        try:
+            with metricas.cronometrar_sqs("send_message_batch"):
+                response = sqs_client.send_message_batch(
+                    QueueUrl=SQS_QUEUE_URL, Entries=entradas
+                )
+        except Exception as e:
+            logger.error("Erro ao enviar lote de mensagens para SQS: %s", e)
+            continue
+        for sucesso in response.get("Successful", []):
+            enviados[int(sucesso["Id"])] = True
+        for falha in response.get("Failed", []):
+            enviados[int(falha["Id"])] = False
+            logger.error(
+                "Mensagem %s rejeitada pela SQS: %s", falha["Id"], falha.get("Message")
+            )
+
+    return enviados
+
+
 def ler_mensagens(max_messages: int = 5) -> list:
-    """Lê mensagens da fila SQS (sem deletar)."""
+    """Lê mensagens da fila SQS (sem deletar).
+
+    Para consumir a fila de fato (long polling, confirmação em lote e
+    dead-letter), use `app.consumidor.ConsumidorSQS`.
+    """
     if not sqs_client or not SQS_QUEUE_URL:
         return []
 
@@ -43,5 +236,5 @@ def ler_mensagens(max_messages: int = 5) -> list:
         )
         return response.get("Messages", [])
     except Exception as e:
-        logger.error(f"⚠️ Erro ao ler mensagens da SQS: {e}")
+        logger.error("⚠️ Erro ao ler mensagens da SQS: %s", e)
         return []
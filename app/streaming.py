@@ -0,0 +1,109 @@
+"""Respostas em streaming (NDJSON/CSV) com memória constante."""
+
+import csv
+import io
+import json
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# Tamanho aproximado de cada bloco enviado ao cliente.
+TAMANHO_BLOCO = 64 * 1024
+
+# Linhas buscadas do banco por vez nas exportações.
+LINHAS_POR_LOTE = 1000
+
+TIPOS_MIDIA = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _valor_json(valor):
+    """Adapta tipos do banco que o módulo json não serializa."""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return str(valor)
+
+
+def codificar_ndjson(linha: dict) -> bytes:
+    """Codifica um registro como uma linha JSON compacta."""
+    return json.dumps(linha, separators=(",", ":"), default=_valor_json).encode() + b"\n"
+
+
+def codificar_csv(linhas: Iterable[tuple]) -> bytes:
+    """Codifica várias linhas CSV de uma só vez."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(linhas)
+    return buffer.getvalue().encode()
+
+
+def agrupar_em_blocos(linhas: Iterable[bytes]) -> Iterator[bytes]:
+    """Agrupa linhas já codificadas em blocos de ~TAMANHO_BLOCO bytes."""
+    buffer = bytearray()
+    for linha in linhas:
+        buffer += linha
+        if len(buffer) >= TAMANHO_BLOCO:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def resposta_ndjson(
+    db: Session, gerar_linhas: Callable[[Session], Iterable[dict]]
+) -> StreamingResponse:
+    """Cria uma resposta NDJSON a partir de um gerador de registros.
+
+    O gerador recebe uma sessão própria, aberta no mesmo banco da sessão da
+    requisição, que permanece ativa enquanto o corpo é transmitido.
+    """
+    bind = db.get_bind()
+
+    def corpo() -> Iterator[bytes]:
+        with Session(bind=bind) as sessao:
+            linhas = (codificar_ndjson(linha) for linha in gerar_linhas(sessao))
+            yield from agrupar_em_blocos(linhas)
+
+    return StreamingResponse(corpo(), media_type="application/x-ndjson")
+
+
+def resposta_exportacao(
+    db: Session, colunas: list, formato: str, nome_arquivo: str
+) -> StreamingResponse:
+    """Exporta todas as linhas das colunas informadas, ordenadas pela primeira.
+
+    As linhas são lidas com `yield_per` (cursor do lado do servidor quando o
+    driver suporta) e codificadas direto para bytes, lote a lote, sem passar
+    pelo ORM nem pelos schemas Pydantic.
+    """
+    bind = db.get_bind()
+    nomes = [coluna.name for coluna in colunas]
+    consulta = (
+        select(*colunas)
+        .order_by(colunas[0])
+        .execution_options(yield_per=LINHAS_POR_LOTE)
+    )
+
+    def corpo() -> Iterator[bytes]:
+        if formato == "csv":
+            yield codificar_csv([nomes])
+        with Session(bind=bind) as sessao:
+            for lote in sessao.execute(consulta).partitions():
+                if formato == "csv":
+                    yield codificar_csv(lote)
+                else:
+                    yield b"".join(
+                        codificar_ndjson(dict(zip(nomes, linha))) for linha in lote
+                    )
+
+    return StreamingResponse(
+        corpo(),
+        media_type=TIPOS_MIDIA[formato],
+        headers={
+            "Content-Disposition": f'attachment; filename="{nome_arquivo}.{formato}"'
+        },
+    )
@@ -0,0 +1,130 @@
+"""Benchmark: baixa de estoque concorrente em um único produto.
+
+Várias threads, cada uma com sua sessão, disputam o mesmo produto
+comprando uma unidade por vez até o estoque acabar:
+
+- put: lê o produto, confere `qtd_estoque` e grava o novo valor com
+  `crud.atualizar_produto` (ler-modificar-gravar, como um PUT completo);
+- condicional: `crud.reservar_estoque`, um UPDATE com
+  `qtd_estoque >= :n` no WHERE.
+
+Para cada forma imprime reservas/s, reservas aceitas, o estoque final e as
+atualizações perdidas (aceitas que não baixaram o estoque) ou a venda além
+do estoque. Os erros de lock do banco são contados à parte.
+
+Uso:
+    python -m benchmarks.estoque_concorrente [--threads 16] [--estoque 2000]
+
+Por padrão usa um SQLite em arquivo temporário; BENCH_DATABASE_URL aponta
+para outro banco (as tabelas são criadas nele).
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.database import Base
+
+
+def reservar_put(db: Session, produto_id: int) -> bool:
+    """Ler-modificar-gravar com PUT completo (sujeito a atualizações perdidas)."""
+    produto = crud.obter_produto(db, produto_id)
+    db.rollback()
+    if produto.qtd_estoque < 1:
+        return False
+    dados = schemas.ProdutoBase.model_validate(produto, from_attributes=True)
+    crud.atualizar_produto(
+        db, produto_id, dados.model_copy(update={"qtd_estoque": produto.qtd_estoque - 1})
+    )
+    return True
+
+
+def reservar_condicional(db: Session, produto_id: int) -> bool:
+    """UPDATE condicional de `crud.reservar_estoque`."""
+    try:
+        crud.reservar_estoque(db, {produto_id: 1})
+    except crud.EstoqueInsuficiente:
+        return False
+    db.commit()
+    return True
+
+
+def disputar(engine, produto_id: int, reservar, threads: int) -> dict:
+    """Dispara `threads` threads comprando até o estoque acabar."""
+    aceitas, erros = [0] * threads, [0] * threads
+    largada = threading.Barrier(threads)
+
+    def comprar(indice: int) -> None:
+        with Session(engine, expire_on_commit=True) as db:
+            largada.wait()
+            while True:
+                try:
+                    if not reservar(db, produto_id):
+                        return
+                    aceitas[indice] += 1
+                except OperationalError:
+                    db.rollback()
+                    erros[indice] += 1
+
+    trabalhadores = [threading.Thread(target=comprar, args=(i,)) for i in range(threads)]
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    duracao = time.perf_counter() - inicio
+    return {"aceitas": sum(aceitas), "erros": sum(erros), "duracao": duracao}
+
+
+def main() -> None:
+    """Cria o produto, mede as duas formas e imprime a comparação."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--estoque", type=int, default=2000)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url is None:
+        arquivo = os.path.join(tempfile.mkdtemp(), "estoque.db")
+        url = f"sqlite:///{arquivo}"
+    opcoes = {"connect_args": {"timeout": 30}} if url.startswith("sqlite") else {}
+    engine = create_engine(url, pool_size=args.threads, **opcoes)
+    Base.metadata.create_all(bind=engine)
+
+    print(
+        f"{'forma':<12} {'reservas/s':>11} {'aceitas':>8} {'final':>6} "
+        f"{'perdidas':>9} {'além':>5} {'erros':>6}"
+    )
+    for forma, reservar in (("put", reservar_put), ("condicional", reservar_condicional)):
+        with Session(engine) as db:
+            produto = models.Produto(
+                nome=f"Disputado ({forma})",
+                preco=1,
+                categoria="bench",
+                qtd_estoque=args.estoque,
+            )
+            db.add(produto)
+            db.commit()
+            produto_id = produto.id
+
+        resultado = disputar(engine, produto_id, reservar, args.threads)
+
+        with Session(engine) as db:
+            final = db.get(models.Produto, produto_id).qtd_estoque
+        esperado = args.estoque - resultado["aceitas"]
+        print(
+            f"{forma:<12} {resultado['aceitas'] / resultado['duracao']:>11,.0f} "
+            f"{resultado['aceitas']:>8} {final:>6} {max(final - esperado, 0):>9} "
+            f"{max(-final, 0):>5} {resultado['erros']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark: listagem via ORM + response_model vs. Core + JSON direto.
+
+Mede linhas/s das duas formas de montar o corpo de `GET /pedidos/` e
+`GET /produtos/` (sem o HTTP), com páginas de LIMITE_MAXIMO linhas:
+
+- orm: `crud.listar_*` (objetos do ORM) validados e serializados pelo
+  Pydantic, como o FastAPI faz com o `response_model`;
+- core: `leitura_rapida.listar` + `leitura_rapida.codificar`.
+
+Uso:
+    python -m benchmarks.leitura_rapida [--linhas 20000] [--repeticoes 5]
+
+Por padrão usa um SQLite em memória; BENCH_DATABASE_URL aponta para outro
+banco (as tabelas são criadas e populadas nele).
+"""
+
+import argparse
+import os
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app import crud, leitura_rapida, models, schemas
+from app.database import Base
+from app.paginacao import LIMITE_MAXIMO
+
+CASOS = [
+    ("pedidos", crud.listar_pedidos, schemas.Pedido),
+    ("produtos", crud.listar_produtos, schemas.Produto),
+]
+
+
+def popular(db: Session, linhas: int) -> None:
+    """Cria um cliente, `linhas` pedidos e `linhas` produtos."""
+    cliente = models.Cliente(nome="Benchmark", email="benchmark@exemplo.com")
+    db.add(cliente)
+    db.flush()
+    db.execute(
+        insert(models.Pedido),
+        [
+            {
+                "descricao": f"Pedido {i}",
+                "valor_total": i % 1000 + 0.5,
+                "cliente_id": cliente.id,
+            }
+            for i in range(linhas)
+        ],
+    )
+    db.execute(
+        insert(models.Produto),
+        [
+            {
+                "nome": f"Produto {i}",
+                "preco": i % 500 + 0.99,
+                "categoria": "bench",
+                "qtd_estoque": i % 50,
+            }
+            for i in range(linhas)
+        ],
+    )
+    db.commit()
+
+
+def _paginas(db: Session, listar) -> int:
+    """Percorre todas as páginas por cursor; retorna o total de linhas."""
+    total, apos_id = 0, None
+    while True:
+        itens = listar(db, apos_id)
+        if not itens:
+            return total
+        total += len(itens)
+        apos_id = itens[-1].id
+
+
+def medir_orm(db: Session, listar_orm, schema) -> int:
+    """Caminho atual: objetos do ORM → response_model → JSON."""
+    adaptador = TypeAdapter(list[schema])
+
+    def listar(db: Session, apos_id):
+        itens = listar_orm(db, apos_id=apos_id, limit=LIMITE_MAXIMO)
+        validados = adaptador.validate_python(itens, from_attributes=True)
+        adaptador.dump_json(validados)
+        db.expunge_all()
+        return itens
+
+    return _paginas(db, listar)
+
+
+def medir_core(db: Session, entidade: str) -> int:
+    """Caminho rápido: colunas via Core → orjson."""
+
+    def listar(db: Session, apos_id):
+        linhas = leitura_rapida.listar(db, entidade, apos_id, LIMITE_MAXIMO)
+        leitura_rapida.codificar(linhas)
+        return linhas
+
+    return _paginas(db, listar)
+
+
+def cronometrar(funcao, repeticoes: int) -> float:
+    """Retorna as linhas/s da melhor de `repeticoes` execuções."""
+    melhor = 0.0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        linhas = funcao()
+        melhor = max(melhor, linhas / (time.perf_counter() - inicio))
+    return melhor
+
+
+def main() -> None:
+    """Popula o banco, mede os dois caminhos e imprime a comparação."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=20000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL", "sqlite://")
+    opcoes = {"poolclass": StaticPool} if url == "sqlite://" else {}
+    engine = create_engine(url, **opcoes)
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        popular(db, args.linhas)
+        print(f"{'entidade':<10} {'orm (linhas/s)':>16} {'core (linhas/s)':>16} ganho")
+        for entidade, listar_orm, schema in CASOS:
+            orm = cronometrar(lambda: medir_orm(db, listar_orm, schema), args.repeticoes)
+            core = cronometrar(lambda: medir_core(db, entidade), args.repeticoes)
+            print(f"{entidade:<10} {orm:>16,.0f} {core:>16,.0f} {core / orm:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,14 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal, engine, Base
-from app import models
+from app import crud, models
 
 
 Base.metadata.create_all(bind=engine)
 
 db: Session = SessionLocal()
 
+db.query(models.FaturamentoDiario).delete()
 db.query(models.Pagamento).delete()
 db.query(models.Entrega).delete()
 db.query(models.Produto).delete()
@@ -80,6 +81,8 @@ entregas = [
 db.add_all(entregas)
 db.commit()
 
+crud.reconstruir_faturamento_diario(db)
+
 db.close()
 
 print("✅ Banco de dados populado com sucesso!")
@@ -1,13 +1,17 @@
 """Configurações e fixtures para os testes com pytest."""
 
+from collections import Counter, defaultdict
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app import cache, instrumentacao
 from app.database import Base, get_db
 from app.main import app
+from app.routers import internal
 
 
 # URL do banco de dados de teste (SQLite em memória)
@@ -20,6 +24,18 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Quantas vezes uma mesma requisição pode executar o mesmo comando SQL
+# (normalizado) antes de o teste falhar; acima disso é, em geral, um N+1.
+MAX_REPETICOES_SQL = 3
+
+
+def pytest_configure(config):
+    """Registra os marcadores usados pelas fixtures."""
+    config.addinivalue_line(
+        "markers",
+        "max_repeticoes_sql(n): repetições permitidas de um comando SQL por requisição",
+    )
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -27,6 +43,9 @@ def db_session():
     Fixture que cria um banco de dados limpo para cada função de teste.
     """
     Base.metadata.create_all(bind=engine)
+    # Os IDs se repetem entre testes; o cache não pode vazar de um para outro.
+    cache.backend.limpar()
+    cache.relatorios.limpar()
     db = TestingSessionLocal()
     try:
         yield db
@@ -50,8 +69,63 @@ def test_client(db_session):
             db_session.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    # As rotas /internal são testadas sem token; a proteção tem testes próprios.
+    app.dependency_overrides[internal.exigir_token] = lambda: None
 
     with TestClient(app) as client:
         yield client
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def contador_consultas():
+    """
+    Fixture que conta os comandos SQL executados no banco de teste.
+
+    Use `contador_consultas.clear()` antes da requisição medida e
+    `len(contador_consultas)` depois.
+    """
+    comandos = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        comandos.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield comandos
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+@pytest.fixture(autouse=True)
+def detector_n_mais_1(request):
+    """
+    Falha o teste se uma requisição repetir o mesmo comando SQL mais de N vezes.
+
+    N é MAX_REPETICOES_SQL, ou o valor de `@pytest.mark.max_repeticoes_sql(n)`
+    para fixar o orçamento de consultas de um endpoint. Só os comandos
+    executados dentro de requisições contam (não os do preparo do teste).
+    """
+    marcador = request.node.get_closest_marker("max_repeticoes_sql")
+    limite = marcador.args[0] if marcador else MAX_REPETICOES_SQL
+    por_requisicao = defaultdict(Counter)
+
+    def registrar(comando):
+        if comando.requisicao is not None:
+            por_requisicao[comando.requisicao][comando.sql] += 1
+
+    with instrumentacao.ouvir(registrar):
+        yield
+
+    excessos = [
+        f"{requisicao.rota}: {vezes}x {sql}"
+        for requisicao, comandos in por_requisicao.items()
+        for sql, vezes in comandos.items()
+        if vezes > limite
+    ]
+    if excessos:
+        pytest.fail(
+            f"Comando SQL repetido mais de {limite}x na mesma requisição "
+            "(N+1?):\n" + "\n".join(excessos)
+        )
@@ -0,0 +1,83 @@
+"""Testes para a pilha assíncrona (AsyncSession) das rotas de leitura."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app import cache, database, models
+from app.routers.assincrono import router as assincrono_router
+
+pytest.importorskip("aiosqlite")
+
+
+def test_url_assincrona():
+    """As URLs síncronas são mapeadas para os drivers assíncronos."""
+    assert database.url_assincrona("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert (
+        database.url_assincrona("mysql+pymysql://u:s@db:3306/e")
+        == "mysql+aiomysql://u:s@db:3306/e"
+    )
+
+
+@pytest.fixture
+def cliente_async(tmp_path):
+    """Cliente de teste com as rotas assíncronas sobre um SQLite em arquivo."""
+    caminho = tmp_path / "async.db"
+    cache.backend.limpar()
+    engine = create_engine(f"sqlite:///{caminho}")
+    database.Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        cliente = models.Cliente(nome="Assíncrono", email="async@exemplo.com")
+        db.add(cliente)
+        db.flush()
+        db.add_all(
+            models.Pedido(descricao=f"Pedido {i}", cliente_id=cliente.id)
+            for i in range(3)
+        )
+        db.commit()
+    engine.dispose()
+
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{caminho}", poolclass=NullPool
+    )
+    fabrica = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with fabrica() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(assincrono_router)
+    app.dependency_overrides[database.get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+def test_rotas_assincronas(cliente_async: TestClient):
+    """Listagem paginada e consulta por ID funcionam com AsyncSession."""
+    response = cliente_async.get("/pedidos/", params={"limit": 2})
+    assert response.status_code == 200
+    assert [p["descricao"] for p in response.json()] == ["Pedido 0", "Pedido 1"]
+    assert "X-Next-Cursor" in response.headers
+
+    response = cliente_async.get("/clientes/1")
+    assert response.status_code == 200
+    assert len(response.json()["pedidos"]) == 3
+
+    # Na listagem, `pedidos` só aparece com include=pedidos.
+    assert "pedidos" not in cliente_async.get("/clientes/").json()[0]
+    response = cliente_async.get("/clientes/", params={"include": "pedidos"})
+    assert len(response.json()[0]["pedidos"]) == 3
+
+    response = cliente_async.get("/pedidos/1")
+    assert cliente_async.get(
+        "/pedidos/1", headers={"If-None-Match": response.headers["ETag"]}
+    ).status_code == 304
+
+    assert cliente_async.get("/pedidos/999").status_code == 404
+    # IDs não numéricos não casam com as rotas assíncronas.
+    assert cliente_async.get("/pedidos/export").status_code == 404
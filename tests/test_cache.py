@@ -0,0 +1,73 @@
+"""Testes para o cache read-through de entidades."""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app import cache
+from app.cache import CacheLRU
+
+
+def test_cache_lru_ttl_e_evictions():
+    """O LRU descarta o menos usado e expira entradas pelo TTL."""
+    lru = CacheLRU(capacidade=2, ttl=0.05)
+    lru.definir("a", 1)
+    lru.definir("b", 2)
+    assert lru.obter("a") == 1  # "a" passa a ser o mais recente
+    lru.definir("c", 3)
+
+    assert lru.obter("b") is None
+    assert lru.obter("c") == 3
+    time.sleep(0.06)
+    assert lru.obter("a") is None
+
+    metricas = lru.metricas()
+    assert (metricas["hits"], metricas["misses"]) == (2, 2)
+    assert (metricas["evictions"], metricas["expirados"]) == (1, 1)
+
+
+def test_cache_nao_grava_valor_lido_antes_de_invalidacao():
+    """Uma leitura concorrente com uma escrita não repõe o valor antigo."""
+    lru = CacheLRU()
+    marca = lru.marca()
+    lru.invalidar("produto:1")
+    lru.definir("produto:1", "antigo", marca)
+    assert lru.obter("produto:1") is None
+
+
+def test_obter_produto_usa_cache_e_escrita_invalida(
+    test_client: TestClient, contador_consultas
+):
+    """O segundo GET não consulta o banco; o PUT invalida a entrada."""
+    produto = {
+        "nome": "Mouse", "preco": 99.9, "categoria": "Periféricos", "qtd_estoque": 3
+    }
+    produto_id = test_client.post("/produtos/", json=produto).json()["id"]
+
+    test_client.get(f"/produtos/{produto_id}")
+    contador_consultas.clear()
+    assert test_client.get(f"/produtos/{produto_id}").json()["nome"] == "Mouse"
+    assert contador_consultas == []
+
+    test_client.put(f"/produtos/{produto_id}", json={**produto, "nome": "Mouse sem fio"})
+    assert test_client.get(f"/produtos/{produto_id}").json()["nome"] == "Mouse sem fio"
+
+    test_client.delete(f"/produtos/{produto_id}")
+    assert test_client.get(f"/produtos/{produto_id}").status_code == 404
+    assert test_client.get("/internal/cache").json()["hits"] >= 1
+
+
+def test_novo_pedido_invalida_cliente_em_cache(test_client: TestClient):
+    """Os pedidos do cliente em cache são atualizados ao criar um pedido."""
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "Cache", "email": "cache@exemplo.com"}
+    ).json()
+    assert test_client.get(f"/clientes/{cliente['id']}").json()["pedidos"] == []
+
+    test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={"descricao": "Novo", "valor_total": 1},
+    )
+    pedidos = test_client.get(f"/clientes/{cliente['id']}").json()["pedidos"]
+    assert [p["descricao"] for p in pedidos] == ["Novo"]
+    assert cache.backend.metricas()["backend"] == "memoria"
@@ -37,4 +37,41 @@ def test_criar_e_obter_cliente(test_client: TestClient):
     # 3. Verifica se o cliente pode ser obtido pelo seu ID
     response_get = test_client.get(f"/clientes/{cliente_id}")
     assert response_get.status_code == 200
-    assert response_get.json()["email"] == cliente_data["email"]
\ No newline at end of file
+    assert response_get.json()["email"] == cliente_data["email"]
+
+
+def test_listar_clientes_consultas_fixas(
+    test_client: TestClient, db_session, contador_consultas
+):
+    """
+    Garante que uma página de 100 clientes com pedidos é carregada com um
+    número fixo de consultas, com e sem `include=pedidos`.
+    """
+    from app import models
+
+    clientes = [
+        models.Cliente(nome=f"Cliente {i}", email=f"cliente{i}@exemplo.com")
+        for i in range(100)
+    ]
+    db_session.add_all(clientes)
+    db_session.flush()
+    db_session.add_all(
+        models.Pedido(descricao=f"Pedido {c.id}", cliente_id=c.id) for c in clientes
+    )
+    db_session.commit()
+    db_session.expire_all()
+
+    contador_consultas.clear()
+    response = test_client.get("/clientes/", params={"limit": 100, "include": "pedidos"})
+    assert response.status_code == 200
+    assert len(response.json()) == 100
+    assert all(len(c["pedidos"]) == 1 for c in response.json())
+    assert len(contador_consultas) == 2
+
+    db_session.expire_all()
+    contador_consultas.clear()
+    response = test_client.get("/clientes/", params={"limit": 100})
+    assert response.status_code == 200
+    # Sem include, os pedidos não são lidos e o campo é omitido (não vazio).
+    assert all("pedidos" not in c for c in response.json())
+    assert len(contador_consultas) == 1
@@ -0,0 +1,112 @@
+"""Testes para o consumidor SQS, usando a fila em memória."""
+
+import threading
+import time
+
+from app import sqs
+from app.consumidor import ConsumidorSQS
+from app.fila_memoria import FilaMemoria
+
+FILA = "memoria://pedidos"
+DLQ = "memoria://pedidos-dlq"
+
+
+def aguardar(condicao, timeout: float = 5.0) -> bool:
+    """Espera até a condição ser verdadeira ou o timeout expirar."""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicao():
+            return True
+        time.sleep(0.01)
+    return condicao()
+
+
+def publicar(fila: FilaMemoria, quantidade: int, monkeypatch) -> None:
+    """Publica eventos pedido.criado pelo mesmo caminho do relay da outbox."""
+    monkeypatch.setattr(sqs, "sqs_client", fila)
+    monkeypatch.setattr(sqs, "SQS_QUEUE_URL", FILA)
+    eventos = [{"tipo": "pedido.criado", "pedido_id": i} for i in range(quantidade)]
+    assert all(sqs.enviar_mensagens_lote(eventos))
+
+
+def test_consumidor_processa_e_confirma_em_lote(monkeypatch):
+    """Vários workers consomem a fila inteira e removem o que processaram."""
+    fila = FilaMemoria()
+    publicar(fila, 45, monkeypatch)
+    recebidos, lock = [], threading.Lock()
+
+    def processar(evento):
+        with lock:
+            recebidos.append(evento["pedido_id"])
+
+    consumidor = ConsumidorSQS(fila, FILA, processar, concorrencia=3, espera=0.05)
+    consumidor.iniciar()
+    try:
+        assert aguardar(lambda: fila.quantidade(FILA) == 0)
+    finally:
+        consumidor.parar()
+
+    assert sorted(recebidos) == list(range(45))
+    assert consumidor.metricas()["processadas"] == 45
+
+
+def test_consumidor_envia_falhas_para_dead_letter(monkeypatch):
+    """Uma mensagem que sempre falha vai à DLQ após max_recebimentos."""
+    fila = FilaMemoria()
+    publicar(fila, 3, monkeypatch)
+    fila.send_message(QueueUrl=FILA, MessageBody="isto não é JSON")
+    tentativas = []
+
+    def processar(evento):
+        if evento["pedido_id"] == 1:
+            tentativas.append(1)
+            raise RuntimeError("handler falhou")
+
+    consumidor = ConsumidorSQS(
+        fila,
+        FILA,
+        processar,
+        concorrencia=2,
+        espera=0.05,
+        max_recebimentos=3,
+        url_dlq=DLQ,
+        atraso_retentativa=0,
+    )
+    consumidor.iniciar()
+    try:
+        assert aguardar(lambda: fila.quantidade(FILA) == 0)
+    finally:
+        consumidor.parar()
+
+    assert len(tentativas) == 3
+    corpos = fila.corpos(DLQ)
+    assert len(corpos) == 2
+    legivel = corpos[0 if corpos[1] == "isto não é JSON" else 1]
+    assert sqs.decodificar_mensagem(legivel) == {
+        "tipo": "pedido.criado",
+        "pedido_id": 1,
+    }
+    assert consumidor.metricas()["dead_letter"] == 2
+
+
+def test_consumidor_estende_visibilidade_de_handler_lento(monkeypatch):
+    """Um handler mais lento que o timeout não causa reentrega."""
+    fila = FilaMemoria()
+    publicar(fila, 1, monkeypatch)
+    chamadas = []
+
+    def processar(evento):
+        chamadas.append(evento)
+        time.sleep(0.5)
+
+    consumidor = ConsumidorSQS(
+        fila, FILA, processar, concorrencia=2, espera=0.05, visibilidade=0.15
+    )
+    consumidor.iniciar()
+    try:
+        assert aguardar(lambda: fila.quantidade(FILA) == 0)
+    finally:
+        consumidor.parar()
+
+    assert len(chamadas) == 1
+    assert consumidor.metricas()["extensoes"] > 0
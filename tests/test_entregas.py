@@ -0,0 +1,44 @@
+"""Testes para o router de entregas."""
+
+from fastapi.testclient import TestClient
+
+
+def _criar_entrega(test_client: TestClient) -> dict:
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "Entrega", "email": "entrega@exemplo.com"}
+    ).json()
+    pedido = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}", json={"descricao": "Enviar"}
+    ).json()
+    return test_client.post(
+        "/entregas/criar",
+        json={
+            "pedido_id": pedido["id"],
+            "endereco": "Rua B, 2",
+            "status": "separando",
+            "data_entrega": "2026-10-21T09:00:00",
+        },
+    ).json()
+
+
+def test_atualizar_e_deletar_entrega_sem_leitura_previa(
+    test_client: TestClient, contador_consultas
+):
+    """PUT e DELETE não consultam a entrega antes: um comando cada."""
+    entrega = _criar_entrega(test_client)
+    url = f"/entregas/{entrega['id']}"
+    dados = {**entrega, "status": "em rota"}
+    del dados["id"]
+
+    contador_consultas.clear()
+    response = test_client.put(url, json=dados)
+    assert response.status_code == 200
+    assert response.json()["status"] == "em rota"
+    assert len(contador_consultas) == 1
+
+    contador_consultas.clear()
+    assert test_client.delete(url).status_code == 200
+    assert len(contador_consultas) == 1
+
+    assert test_client.put(url, json=dados).status_code == 404
+    assert test_client.delete(url).status_code == 404
@@ -0,0 +1,135 @@
+"""Testes da reserva de estoque na criação de pedidos com itens."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+
+def _criar_cliente(test_client: TestClient) -> dict:
+    return test_client.post(
+        "/clientes/", json={"nome": "Estoque", "email": "estoque@exemplo.com"}
+    ).json()
+
+
+def _criar_produto(test_client: TestClient, preco: float, qtd_estoque: int) -> dict:
+    return test_client.post(
+        "/produtos/",
+        json={
+            "nome": "Caneca",
+            "preco": preco,
+            "categoria": "Cozinha",
+            "qtd_estoque": qtd_estoque,
+        },
+    ).json()
+
+
+def test_pedido_com_itens_reserva_estoque_e_calcula_total(test_client: TestClient):
+    """Os itens baixam o estoque e definem o valor_total pelos preços atuais."""
+    cliente = _criar_cliente(test_client)
+    caneca = _criar_produto(test_client, 10.5, 5)
+    prato = _criar_produto(test_client, 20, 3)
+
+    response = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={
+            "descricao": "Com itens",
+            "itens": [
+                {"produto_id": caneca["id"], "quantidade": 2},
+                {"produto_id": prato["id"], "quantidade": 3},
+                {"produto_id": caneca["id"], "quantidade": 1},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    assert float(response.json()["valor_total"]) == 10.5 * 3 + 20 * 3
+    assert test_client.get(f"/produtos/{caneca['id']}").json()["qtd_estoque"] == 2
+    assert test_client.get(f"/produtos/{prato['id']}").json()["qtd_estoque"] == 0
+
+    assert test_client.delete(f"/pedidos/{response.json()['id']}").status_code == 200
+    assert test_client.get(f"/produtos/{caneca['id']}").json()["qtd_estoque"] == 5
+    assert test_client.get(f"/produtos/{prato['id']}").json()["qtd_estoque"] == 3
+
+
+def test_estoque_insuficiente_nao_grava_nada(test_client: TestClient):
+    """Um item sem estoque recusa o pedido inteiro com 409."""
+    cliente = _criar_cliente(test_client)
+    caneca = _criar_produto(test_client, 10, 5)
+    prato = _criar_produto(test_client, 20, 1)
+
+    response = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={
+            "descricao": "Sem estoque",
+            "itens": [
+                {"produto_id": caneca["id"], "quantidade": 2},
+                {"produto_id": prato["id"], "quantidade": 2},
+            ],
+        },
+    )
+
+    assert response.status_code == 409
+    assert str(prato["id"]) in response.json()["detail"]
+    assert test_client.get(f"/produtos/{caneca['id']}").json()["qtd_estoque"] == 5
+    assert test_client.get("/pedidos/").json() == []
+
+
+def test_produto_inexistente_retorna_404(test_client: TestClient):
+    """Itens com produto inexistente são recusados antes de qualquer escrita."""
+    cliente = _criar_cliente(test_client)
+
+    response = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={"descricao": "X", "itens": [{"produto_id": 999, "quantidade": 1}]},
+    )
+
+    assert response.status_code == 404
+    assert test_client.get("/pedidos/").json() == []
+
+
+def test_reserva_e_um_unico_update(test_client: TestClient, contador_consultas):
+    """Todos os produtos são baixados por um só UPDATE condicional."""
+    cliente = _criar_cliente(test_client)
+    produtos = [_criar_produto(test_client, 1, 10) for _ in range(3)]
+    itens = [{"produto_id": p["id"], "quantidade": 1} for p in produtos]
+
+    contador_consultas.clear()
+    test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={"descricao": "Lote", "itens": itens},
+    )
+
+    updates = [
+        c for c in contador_consultas if c.lstrip().upper().startswith("UPDATE PRODUTOS")
+    ]
+    assert len(updates) == 1
+
+
+@pytest.fixture
+def chaves_estrangeiras(db_session):
+    """Liga a checagem de chaves estrangeiras do SQLite (como MySQL/PostgreSQL)."""
+    db_session.execute(text("PRAGMA foreign_keys=ON"))
+    yield
+    db_session.execute(text("PRAGMA foreign_keys=OFF"))
+
+
+def test_produto_em_pedido_nao_pode_ser_removido(
+    test_client: TestClient, db_session, chaves_estrangeiras
+):
+    """Produto referenciado por itens de pedido: 409; sem pedidos, sai."""
+    assert db_session.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    cliente = _criar_cliente(test_client)
+    caneca = _criar_produto(test_client, 10, 5)
+    itens = [{"produto_id": caneca["id"], "quantidade": 1}]
+    pedido = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={"descricao": "Histórico", "itens": itens},
+    ).json()
+
+    response = test_client.delete(f"/produtos/{caneca['id']}")
+
+    assert response.status_code == 409
+    assert test_client.get(f"/produtos/{caneca['id']}").status_code == 200
+
+    assert test_client.delete(f"/pedidos/{pedido['id']}").status_code == 200
+    assert test_client.delete(f"/produtos/{caneca['id']}").status_code == 200
@@ -0,0 +1,71 @@
+"""Testes para ETags e respostas condicionais (If-None-Match)."""
+
+from fastapi.testclient import TestClient
+
+
+def _criar_pedido(test_client: TestClient) -> dict:
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "ETag", "email": "etag@exemplo.com"}
+    ).json()
+    return test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={"descricao": "Rastreável", "valor_total": 10},
+    ).json()
+
+
+def test_etag_de_pedido_muda_com_a_versao(test_client: TestClient):
+    """A ETag vale até o pedido ser alterado; depois a resposta volta a ser 200."""
+    pedido = _criar_pedido(test_client)
+    url = f"/pedidos/{pedido['id']}"
+
+    response = test_client.get(url)
+    etag = response.headers["ETag"]
+    assert etag == f'"pedido-{pedido["id"]}-v1"'
+    assert "versao" not in response.json()
+
+    response = test_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    test_client.put(url, json={"descricao": "Alterado"})
+    response = test_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["descricao"] == "Alterado"
+    assert response.headers["ETag"] == f'"pedido-{pedido["id"]}-v2"'
+
+
+def test_etag_de_entrega_aceita_lista_e_etag_fraca(test_client: TestClient):
+    """If-None-Match com várias ETags (inclusive W/) também gera 304."""
+    pedido = _criar_pedido(test_client)
+    entrega = test_client.post(
+        "/entregas/criar",
+        json={
+            "pedido_id": pedido["id"],
+            "endereco": "Rua A, 1",
+            "status": "em rota",
+            "data_entrega": "2026-10-20T10:00:00",
+        },
+    ).json()
+    url = f"/entregas/{entrega['id']}"
+    etag = test_client.get(url).headers["ETag"]
+
+    cabecalho = f'"outra", W/{etag}'
+    assert test_client.get(url, headers={"If-None-Match": cabecalho}).status_code == 304
+    response = test_client.get("/entregas/999", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+
+
+def test_etag_de_pagina_da_listagem(test_client: TestClient):
+    """A página tem ETag própria, que muda quando um item dela muda."""
+    pedido = _criar_pedido(test_client)
+
+    response = test_client.get("/pedidos/")
+    etag = response.headers["ETag"]
+    response = test_client.get("/pedidos/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    test_client.put(f"/pedidos/{pedido['id']}", json={"descricao": "Outro"})
+    response = test_client.get("/pedidos/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
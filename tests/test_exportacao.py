@@ -0,0 +1,60 @@
+"""Testes para os endpoints de exportação em streaming."""
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app import models
+
+
+def _popular_pedidos(db_session, quantidade: int):
+    """Cria um cliente com `quantidade` pedidos."""
+    cliente = models.Cliente(nome="Exportado", email="export@exemplo.com")
+    db_session.add(cliente)
+    db_session.flush()
+    db_session.add_all(
+        models.Pedido(descricao=f"Pedido {i}", cliente_id=cliente.id, valor_total=i)
+        for i in range(quantidade)
+    )
+    db_session.commit()
+
+
+def test_exportar_pedidos_ndjson(test_client: TestClient, db_session):
+    """Exporta todos os pedidos, além do limite de paginação, como NDJSON."""
+    _popular_pedidos(db_session, 2500)
+
+    response = test_client.get("/pedidos/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    linhas = [json.loads(linha) for linha in response.text.splitlines()]
+    assert len(linhas) == 2500
+    assert linhas[0] == {
+        "id": 1,
+        "descricao": "Pedido 0",
+        "cliente_id": 1,
+        "valor_total": 0.0,
+    }
+    assert [linha["id"] for linha in linhas] == sorted(linha["id"] for linha in linhas)
+
+
+def test_exportar_pedidos_csv(test_client: TestClient, db_session):
+    """Exporta pedidos como CSV com cabeçalho."""
+    _popular_pedidos(db_session, 3)
+
+    response = test_client.get("/pedidos/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert "pedidos.csv" in response.headers["content-disposition"]
+
+    linhas = list(csv.DictReader(io.StringIO(response.text)))
+    descricoes = [linha["descricao"] for linha in linhas]
+    assert descricoes == ["Pedido 0", "Pedido 1", "Pedido 2"]
+
+
+def test_exportar_formato_invalido(test_client: TestClient):
+    """Formatos desconhecidos são rejeitados na validação."""
+    response = test_client.get("/entregas/export", params={"format": "xml"})
+    assert response.status_code == 422
+    assert test_client.get("/pagamentos/export").status_code == 200
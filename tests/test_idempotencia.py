@@ -0,0 +1,212 @@
+"""Testes do Idempotency-Key nas rotas de criação."""
+
+import json
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app import crud, idempotencia, models, schemas
+
+
+def _criar_cliente(test_client: TestClient) -> dict:
+    return test_client.post(
+        "/clientes/", json={"nome": "Idempotente", "email": "idem@exemplo.com"}
+    ).json()
+
+
+def test_repeticao_do_pedido_reenvia_a_primeira_resposta(
+    test_client: TestClient, db_session, contador_consultas
+):
+    """A repetição não cria outro pedido nem outro evento; custa uma leitura."""
+    cliente = _criar_cliente(test_client)
+    url = f"/pedidos/?cliente_id={cliente['id']}"
+    cabecalhos = {"Idempotency-Key": "pedido-1"}
+
+    primeira = test_client.post(url, json={"descricao": "Único"}, headers=cabecalhos)
+    contador_consultas.clear()
+    repetida = test_client.post(url, json={"descricao": "Único"}, headers=cabecalhos)
+
+    assert primeira.status_code == repetida.status_code == 200
+    assert repetida.content == primeira.content
+    assert repetida.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in primeira.headers
+    assert len(contador_consultas) == 1
+    assert db_session.query(models.Pedido).count() == 1
+    assert db_session.query(models.Outbox).count() == 1
+
+
+def test_repeticao_do_pagamento_mantem_status_201(test_client: TestClient, db_session):
+    """O status da primeira resposta (201) também é reenviado."""
+    cliente = _criar_cliente(test_client)
+    pedido = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}", json={"descricao": "P"}
+    ).json()
+    corpo = {"pedido_id": pedido["id"], "valor": 10.0, "forma_pagamento": "pix"}
+    cabecalhos = {"Idempotency-Key": "pagamento-1"}
+
+    respostas = [
+        test_client.post("/pagamentos/", json=corpo, headers=cabecalhos)
+        for _ in range(3)
+    ]
+
+    assert {r.status_code for r in respostas} == {201}
+    assert len({r.json()["id"] for r in respostas}) == 1
+    assert db_session.query(models.Pagamento).count() == 1
+
+
+def test_chave_reusada_com_outro_corpo_retorna_422(test_client: TestClient):
+    """A mesma chave com outro corpo é recusada em vez de reenviar a resposta."""
+    cliente = _criar_cliente(test_client)
+    url = f"/pedidos/?cliente_id={cliente['id']}"
+    cabecalhos = {"Idempotency-Key": "pedido-2"}
+
+    test_client.post(url, json={"descricao": "A"}, headers=cabecalhos)
+    response = test_client.post(url, json={"descricao": "B"}, headers=cabecalhos)
+
+    assert response.status_code == 422
+
+
+def test_falha_libera_a_chave(test_client: TestClient, db_session):
+    """Uma criação que falha não grava resposta; a repetição executa de novo."""
+    cliente = _criar_cliente(test_client)
+    url = f"/pedidos/?cliente_id={cliente['id']}"
+    corpo = {"descricao": "X", "itens": [{"produto_id": 999, "quantidade": 1}]}
+    cabecalhos = {"Idempotency-Key": "pedido-3"}
+
+    assert test_client.post(url, json=corpo, headers=cabecalhos).status_code == 404
+    assert test_client.post(url, json=corpo, headers=cabecalhos).status_code == 404
+    assert db_session.query(models.ChaveIdempotencia).count() == 0
+
+
+def test_repeticoes_simultaneas_esperam_a_primeira(monkeypatch):
+    """No mesmo processo, repetições simultâneas não executam a criação de novo."""
+    execucoes = []
+    liberar = threading.Event()
+
+    def executar_lento(db, chave, impressao, criar, schema, status_code):
+        execucoes.append(chave)
+        liberar.wait(5)
+        return idempotencia.Resposta(status_code, b'{"id": 1}', False)
+
+    monkeypatch.setattr(idempotencia, "_executar", executar_lento)
+    respostas = []
+
+    def enviar():
+        respostas.append(
+            idempotencia.responder(None, "POST /pedidos/", "k", {}, None, None)
+        )
+
+    threads = [threading.Thread(target=enviar) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    liberar.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(execucoes) == 1
+    assert {r.body for r in respostas} == {b'{"id": 1}'}
+    repetidas = [r for r in respostas if "Idempotent-Replayed" in r.headers]
+    assert len(repetidas) == 4
+
+
+def test_purga_remove_chaves_vencidas_em_lotes(db_session):
+    """Só as chaves vencidas saem, um lote de cada vez."""
+    agora = int(time.time())
+    db_session.add_all(
+        [
+            models.ChaveIdempotencia(
+                chave=f"{n:032x}",
+                impressao="0" * 32,
+                dono="0" * 32,
+                expira_em=agora - 10,
+            )
+            for n in range(5)
+        ]
+        + [
+            models.ChaveIdempotencia(
+                chave="f" * 32, impressao="0" * 32, dono="0" * 32, expira_em=agora + 60
+            )
+        ]
+    )
+    db_session.commit()
+
+    assert idempotencia.purgar_expiradas(db_session, lote=2, maximo_lotes=1) == 2
+    assert idempotencia.purgar_expiradas(db_session, lote=2) == 3
+    restantes = db_session.query(models.ChaveIdempotencia.chave).all()
+    assert restantes == [("f" * 32,)]
+
+
+def _reserva(chave: str, dados: dict, dono: str, expira_em: int):
+    return models.ChaveIdempotencia(
+        chave=idempotencia._resumo(f"POST /pedidos/\n{chave}"),
+        impressao=idempotencia._resumo(json.dumps(dados, sort_keys=True, default=str)),
+        dono=dono,
+        expira_em=expira_em,
+    )
+
+
+def test_chave_em_processamento_em_outra_instancia_retorna_409(
+    test_client: TestClient, db_session
+):
+    """Enquanto outra instância processa a chave, a repetição recebe 409."""
+    cliente = _criar_cliente(test_client)
+    dados = {
+        "cliente_id": cliente["id"],
+        "descricao": "Outra",
+        "valor_total": 0.0,
+        "itens": [],
+    }
+    db_session.add(_reserva("pedido-4", dados, "b" * 32, int(time.time()) + 60))
+    db_session.commit()
+
+    response = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={"descricao": "Outra"},
+        headers={"Idempotency-Key": "pedido-4"},
+    )
+
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert db_session.query(models.Pedido).count() == 0
+
+
+def test_reserva_tomada_desfaz_a_criacao(test_client: TestClient, db_session):
+    """Se a reserva foi tomada por outra requisição, o pedido não é gravado."""
+    cliente = _criar_cliente(test_client)
+    pedido = schemas.PedidoCreate(descricao="Tomada")
+
+    def criar(antes_do_commit):
+        # Outra instância toma a reserva (vencida) durante a criação.
+        db_session.execute(update(models.ChaveIdempotencia).values(dono="c" * 32))
+        db_session.commit()
+        return crud.criar_pedido(db_session, pedido, cliente["id"], antes_do_commit)
+
+    with pytest.raises(HTTPException) as erro:
+        idempotencia.responder(
+            db_session, "POST /pedidos/", "pedido-5", {}, criar, schemas.Pedido
+        )
+
+    assert erro.value.status_code == 409
+    assert db_session.query(models.Pedido).count() == 0
+    assert db_session.query(models.Outbox).count() == 0
+
+
+def test_renovador_estende_reservas_em_processamento(db_session):
+    """Reservas de requisições em andamento não vencem."""
+    agora = int(time.time())
+    db_session.add(_reserva("pedido-6", {}, "d" * 32, agora + 1))
+    db_session.commit()
+
+    idempotencia.renovador.registrar("d" * 32, db_session.get_bind())
+    try:
+        idempotencia.renovador.renovar()
+    finally:
+        idempotencia.renovador.remover("d" * 32)
+
+    reserva = db_session.query(models.ChaveIdempotencia).one()
+    assert reserva.expira_em >= agora + idempotencia.IDEMPOTENCIA_PRAZO
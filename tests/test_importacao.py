@@ -0,0 +1,63 @@
+"""Testes para a importação em massa."""
+
+from app import importacao, models
+
+
+def test_importar_clientes_csv_ignora_duplicados(db_session, tmp_path):
+    """E-mails repetidos (no arquivo ou no banco) são contados como duplicados."""
+    db_session.add(models.Cliente(nome="Existente", email="ja@exemplo.com"))
+    db_session.commit()
+
+    arquivo = tmp_path / "clientes.csv"
+    linhas = ["nome,email"] + [f"Cliente {i},c{i}@exemplo.com" for i in range(7)]
+    linhas += ["Repetido,c0@exemplo.com", "Outro,ja@exemplo.com"]
+    linhas += ["Cliente 7,c7@exemplo.com"]
+    arquivo.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+
+    resultado = importacao.importar(
+        db_session, "clientes", importacao.ler_arquivo(arquivo), tamanho_lote=3
+    )
+
+    assert resultado.lidos == 10
+    assert resultado.inseridos == 8
+    assert resultado.duplicados == 2
+    assert resultado.erros == 0
+    assert db_session.query(models.Cliente).count() == 9
+
+
+def test_importar_csv_reporta_a_linha_do_arquivo(db_session, tmp_path):
+    """O número no erro é a linha do arquivo, contando o cabeçalho."""
+    arquivo = tmp_path / "produtos.csv"
+    arquivo.write_text(
+        "nome,preco,categoria,qtd_estoque\nMouse,10,A,3\nTeclado,caro,A,4\n",
+        encoding="utf-8",
+    )
+
+    resultado = importacao.importar(
+        db_session, "produtos", importacao.ler_arquivo(arquivo)
+    )
+
+    assert (resultado.inseridos, resultado.erros) == (1, 1)
+    assert resultado.mensagens_erro[0].startswith("linha 3:")
+
+
+def test_importar_produtos_ndjson_conta_erros(db_session, tmp_path):
+    """Linhas inválidas são reportadas sem abortar a importação."""
+    arquivo = tmp_path / "produtos.ndjson"
+    arquivo.write_text(
+        '{"nome": "Mouse", "preco": 10, "categoria": "A", "qtd_estoque": 3}\n'
+        "\n"
+        '{"nome": "Sem preço", "categoria": "A", "qtd_estoque": 1}\n'
+        '{"nome": "Truncado", "preco": 5\n'
+        '{"nome": "Teclado", "preco": 20, "categoria": "A", "qtd_estoque": 4}\n',
+        encoding="utf-8",
+    )
+
+    resultado = importacao.importar(
+        db_session, "produtos", importacao.ler_arquivo(arquivo)
+    )
+
+    assert (resultado.lidos, resultado.inseridos, resultado.erros) == (4, 2, 2)
+    assert resultado.mensagens_erro[0].startswith("linha 3:")
+    assert resultado.mensagens_erro[1].startswith("linha 4: JSON inválido")
+    assert db_session.query(models.Produto).count() == 2
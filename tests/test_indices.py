@@ -0,0 +1,92 @@
+"""Testes dos planos de execução (EXPLAIN) das consultas quentes."""
+
+from datetime import date
+
+from sqlalchemy import event
+
+from app import crud, outbox
+
+
+def planos(db_session, executar) -> list[str]:
+    """Executa `executar()` e retorna o EXPLAIN QUERY PLAN de cada comando."""
+    capturados = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            capturados.append((statement, parameters))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capturar)
+    try:
+        executar()
+    finally:
+        event.remove(engine, "before_cursor_execute", capturar)
+
+    with engine.connect() as conexao:
+        return [
+            " | ".join(
+                linha[-1]
+                for linha in conexao.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {sql}", parametros
+                )
+            )
+            for sql, parametros in capturados
+        ]
+
+
+def test_relatorio_pedidos_por_cliente_usa_indice_do_join(db_session):
+    """O JOIN com pedidos busca pelo índice de cliente_id, sem varrer a tabela."""
+    (plano,) = planos(
+        db_session, lambda: crud.relatorio_pedidos_por_cliente(db_session, apos_id=10)
+    )
+    assert "ix_pedidos_cliente_id" in plano
+    assert "SCAN pedidos" not in plano
+    assert "SEARCH clientes USING INTEGER PRIMARY KEY" in plano
+
+
+def test_estoque_baixo_usa_indice_de_qtd_estoque(db_session):
+    """O filtro qtd_estoque < limite usa o índice da coluna."""
+    (plano,) = planos(db_session, lambda: crud.produtos_estoque_baixo(db_session, 5))
+    assert "ix_produtos_qtd_estoque" in plano
+    assert "SCAN produtos" not in plano
+
+
+def test_faturamento_usa_chave_do_rollup(db_session):
+    """O total do período busca pela chave (dia, forma) do rollup."""
+    (plano,) = planos(
+        db_session,
+        lambda: crud.total_faturado(db_session, date(2026, 1, 1), date(2026, 1, 31)),
+    )
+    assert "SEARCH faturamento_diario USING" in plano
+
+
+def test_reconstrucao_do_faturamento_usa_indice_composto(db_session):
+    """A agregação dos pagamentos pagos usa o índice (status, created_at)."""
+    comandos = planos(db_session, lambda: crud.reconstruir_faturamento_diario(db_session))
+    agregacao = [p for p in comandos if "pagamentos" in p]
+    assert agregacao
+    assert "ix_pagamentos_status_created_at" in agregacao[0]
+    assert "SCAN pagamentos" not in agregacao[0]
+
+
+def test_filhos_do_pedido_usam_indice_de_pedido_id(test_client, db_session):
+    """Remover um pedido busca pagamentos pelo índice de pedido_id."""
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "Índice", "email": "indice@exemplo.com"}
+    ).json()
+    pedido = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}", json={"descricao": "P"}
+    ).json()
+
+    comandos = planos(
+        db_session, lambda: crud.deletar_pedido(db_session, pedido["id"])
+    )
+    filhos = [p for p in comandos if "pagamentos" in p]
+    assert filhos
+    assert all("ix_pagamentos_pedido_id" in p for p in filhos)
+
+
+def test_outbox_pendente_usa_indice_de_status(db_session):
+    """A busca dos eventos pendentes usa o índice (status, id)."""
+    (plano,) = planos(db_session, lambda: outbox.contar_pendentes(db_session))
+    assert "ix_outbox_status_id" in plano
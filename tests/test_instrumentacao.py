@@ -0,0 +1,76 @@
+"""Testes da instrumentação dos comandos SQL."""
+
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app import instrumentacao
+
+
+def test_normalizar_troca_literais_e_listas():
+    """Comandos que só diferem nos valores têm a mesma forma normalizada."""
+    a = instrumentacao.normalizar(
+        "SELECT * FROM pedidos\n  WHERE id IN (1, 2, 3) AND descricao = 'x''y'"
+    )
+    b = instrumentacao.normalizar(
+        "SELECT * FROM pedidos WHERE id IN (7, 8) AND descricao = 'z'"
+    )
+    assert a == b == "SELECT * FROM pedidos WHERE id IN (?, ...) AND descricao = ?"
+    assert instrumentacao.normalizar("SELECT anon_1.id FROM t1 LIMIT ?") == (
+        "SELECT anon_1.id FROM t1 LIMIT ?"
+    )
+
+
+def test_comandos_atribuidos_ao_template_da_rota(test_client: TestClient):
+    """Cada comando chega aos ouvintes com a rota que o executou."""
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "Rota", "email": "rota@exemplo.com"}
+    ).json()
+    comandos = []
+
+    with instrumentacao.ouvir(comandos.append):
+        test_client.get(f"/clientes/{cliente['id']}")
+
+    assert comandos
+    assert {c.rota for c in comandos} == {"/clientes/{cliente_id}"}
+    assert all("?" in c.sql for c in comandos if c.sql.startswith("SELECT"))
+
+
+def test_comando_lento_vai_para_o_log(db_session, monkeypatch, caplog):
+    """Comandos acima de SLOW_QUERY_MS são registrados no log de lentas."""
+    monkeypatch.setattr(instrumentacao, "SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="app.sql.lentas"):
+        db_session.execute(text("SELECT 42"))
+
+    lentas = [r.getMessage() for r in caplog.records if r.name == "app.sql.lentas"]
+    assert any("SELECT ?" in mensagem for mensagem in lentas)
+
+
+def test_estatisticas_por_rota(test_client: TestClient):
+    """/internal/sql agrega execuções e tempo por (rota, comando)."""
+    instrumentacao.estatisticas.limpar()
+    for _ in range(3):
+        test_client.get("/produtos/")
+
+    comandos = test_client.get("/internal/sql").json()["comandos"]
+    listagem = [c for c in comandos if c["rota"] == "/produtos/"]
+    assert len(listagem) == 1
+    assert listagem[0]["execucoes"] == 3
+
+
+@pytest.mark.max_repeticoes_sql(1)
+def test_orcamento_de_consultas_da_listagem_de_clientes(test_client: TestClient):
+    """Clientes com pedidos: nenhum comando se repete por cliente (sem N+1)."""
+    for n in range(3):
+        cliente = test_client.post(
+            "/clientes/", json={"nome": f"C{n}", "email": f"c{n}@exemplo.com"}
+        ).json()
+        test_client.post(
+            f"/pedidos/?cliente_id={cliente['id']}", json={"descricao": "P"}
+        )
+
+    response = test_client.get("/clientes/?include=pedidos")
+    assert all(len(c["pedidos"]) == 1 for c in response.json())
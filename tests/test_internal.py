@@ -0,0 +1,60 @@
+"""Testes para as rotas internas e as métricas do pool de conexões."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import database
+from app.main import app
+from app.pool_metricas import MetricasPool, QueuePoolMedido, metricas
+from app.routers import internal
+
+
+def test_estado_pool(test_client: TestClient):
+    """O endpoint expõe o estado do pool e do threadpool."""
+    response = test_client.get("/internal/pool")
+    assert response.status_code == 200
+    dados = response.json()
+    assert dados["threadpool"]["limite"] == database.THREADPOOL_LIMIT
+    assert dados["pool"]["classe"] == "QueuePoolMedido"
+    assert dados["pool"]["tamanho"] == database.DB_POOL_SIZE
+    assert {"em_uso", "overflow", "espera_media_ms", "timeouts"} <= set(dados["pool"])
+
+
+def test_rotas_internas_exigem_token(test_client: TestClient, monkeypatch):
+    """Sem token configurado: 404; token errado ou ausente: 403; certo: 200."""
+    del app.dependency_overrides[internal.exigir_token]
+
+    assert test_client.get("/internal/pool").status_code == 404
+
+    monkeypatch.setattr(internal, "INTERNAL_TOKEN", "segredo")
+    assert test_client.get("/internal/pool").status_code == 403
+    errado = {"X-Internal-Token": "outro"}
+    assert test_client.get("/internal/sql", headers=errado).status_code == 403
+    certo = {"X-Internal-Token": "segredo"}
+    assert test_client.get("/internal/sql", headers=certo).status_code == 200
+
+    caminhos = test_client.get("/openapi.json").json()["paths"]
+    assert not [c for c in caminhos if c.startswith("/internal")]
+
+
+def test_metricas_pool_medido(tmp_path):
+    """Checkouts, conexões em uso e esperas são contabilizados."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePoolMedido, pool_size=2
+    )
+    contador = MetricasPool()
+    contador.observar(engine)
+    esperas_antes = metricas.esperas
+
+    with engine.connect() as c1, engine.connect() as c2:
+        c1.execute(text("SELECT 1"))
+        c2.execute(text("SELECT 1"))
+        assert contador.resumo(engine.pool)["em_uso"] == 2
+
+    resumo = contador.resumo(engine.pool)
+    assert resumo["em_uso"] == 0
+    assert resumo["checkouts_total"] == 2
+    assert resumo["checkins_total"] == 2
+    assert resumo["conexoes_criadas"] == 2
+    assert metricas.esperas == esperas_antes + 2
+    engine.dispose()
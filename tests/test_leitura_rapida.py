@@ -0,0 +1,80 @@
+"""Testes do caminho de leitura rápido (Core + JSON direto)."""
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app import leitura_rapida, models, schemas
+
+
+def _popular(test_client: TestClient) -> None:
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "Rápida", "email": "rapida@exemplo.com"}
+    ).json()
+    for valor in (10, 12.5, 0.1):
+        pedido = test_client.post(
+            f"/pedidos/?cliente_id={cliente['id']}",
+            json={"descricao": f"Pedido {valor}", "valor_total": valor},
+        ).json()
+        test_client.post(
+            "/pagamentos/",
+            json={"pedido_id": pedido["id"], "valor": valor, "forma_pagamento": "pix"},
+        )
+    test_client.post(
+        "/produtos/",
+        json={
+            "nome": "Caneta",
+            "preco": 2.75,
+            "categoria": "papelaria",
+            "qtd_estoque": 3,
+        },
+    )
+
+
+def test_listagem_igual_a_do_pydantic(test_client: TestClient, db_session):
+    """O JSON do caminho rápido é o mesmo que o response_model produziria."""
+    _popular(test_client)
+
+    for rota, modelo, schema in [
+        ("/pedidos/", models.Pedido, schemas.Pedido),
+        ("/produtos/", models.Produto, schemas.Produto),
+        ("/pagamentos/", models.Pagamento, schemas.Pagamento),
+    ]:
+        registros = db_session.query(modelo).order_by(modelo.id).all()
+        adaptador = TypeAdapter(list[schema])
+        esperado = adaptador.dump_python(
+            adaptador.validate_python(registros, from_attributes=True), mode="json"
+        )
+        response = test_client.get(rota)
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == esperado
+
+
+def test_listagem_mantem_cursor_e_etag(test_client: TestClient):
+    """Os cabeçalhos X-Next-Cursor e ETag seguem na resposta já codificada."""
+    _popular(test_client)
+
+    response = test_client.get("/pedidos/?limit=2")
+    assert len(response.json()) == 2
+    cursor = response.headers["X-Next-Cursor"]
+    etag = response.headers["ETag"]
+
+    cabecalhos = {"If-None-Match": etag}
+    response = test_client.get("/pedidos/?limit=2", headers=cabecalhos)
+    assert response.status_code == 304
+    assert response.headers["X-Next-Cursor"] == cursor
+
+    response = test_client.get(f"/pedidos/?limit=2&cursor={cursor}")
+    assert [p["descricao"] for p in response.json()] == ["Pedido 0.1"]
+
+
+def test_obter_nao_carrega_objetos_do_orm(test_client: TestClient, db_session):
+    """A consulta por ID devolve o schema sem povoar o identity map."""
+    _popular(test_client)
+    db_session.expunge_all()
+
+    linha = leitura_rapida.obter(db_session, "pedidos", 1)
+    assert not db_session.identity_map
+    pedido = schemas.Pedido.model_validate(linha)
+    assert pedido.descricao == "Pedido 10"
+    assert pedido.versao == 1
+    assert leitura_rapida.obter(db_session, "pedidos", 999) is None
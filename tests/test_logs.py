@@ -0,0 +1,62 @@
+"""Testes para o pipeline de logs com fila."""
+
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.logs import PipelineLogs
+
+
+def _logger_com_arquivo(nome, caminho, pipeline):
+    """Cria um logger isolado cujo destino é um arquivo local."""
+    logger = logging.getLogger(nome)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    destino = logging.FileHandler(caminho, encoding="utf-8")
+    destino.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    pipeline.configurar(logger, [destino])
+    return logger
+
+
+def test_pipeline_entrega_no_arquivo_e_conta_descartes(tmp_path):
+    """Com a fila cheia, os registros são descartados sem bloquear."""
+    caminho = tmp_path / "app.log"
+    pipeline = PipelineLogs(capacidade=3, amostragem={})
+    logger = _logger_com_arquivo("teste.logs.fila", caminho, pipeline)
+
+    # Sem listener, a fila enche e os excedentes são contados.
+    for i in range(5):
+        logger.info("linha %d", i)
+    assert pipeline.metricas()["descartados_fila_cheia"] == 2
+
+    pipeline.iniciar()
+    pipeline.parar()
+    assert caminho.read_text(encoding="utf-8").splitlines() == [
+        "INFO linha 0",
+        "INFO linha 1",
+        "INFO linha 2",
+    ]
+    assert pipeline.metricas()["enfileirados"] == 3
+
+
+def test_pipeline_amostra_info_mas_mantem_warning(tmp_path):
+    """A amostragem só vale para registros abaixo de WARNING."""
+    caminho = tmp_path / "app.log"
+    pipeline = PipelineLogs(amostragem={"teste.logs.amostrado": 0.0})
+    logger = _logger_com_arquivo("teste.logs.amostrado.rota", caminho, pipeline)
+
+    pipeline.iniciar()
+    for _ in range(10):
+        logger.info("acesso")
+    logger.warning("algo estranho")
+    pipeline.parar()
+
+    assert caminho.read_text(encoding="utf-8").splitlines() == ["WARNING algo estranho"]
+    assert pipeline.metricas()["descartados_amostragem"] == 10
+
+
+def test_estado_logs(test_client: TestClient):
+    """A rota interna expõe os contadores da fila de logs."""
+    response = test_client.get("/internal/logs")
+    assert response.status_code == 200
+    assert {"enfileirados", "descartados_fila_cheia", "na_fila"} <= response.json().keys()
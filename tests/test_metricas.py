@@ -0,0 +1,71 @@
+"""Testes das métricas no formato do Prometheus (/metrics)."""
+
+from fastapi.testclient import TestClient
+
+from app import metricas, sqs
+from app.fila_memoria import FilaMemoria
+
+
+def test_requisicoes_por_template_de_rota(test_client: TestClient):
+    """As requisições são contadas pelo template da rota, não pela URL."""
+    rotulos = {"method": "GET", "route": "/pedidos/{pedido_id}", "status": 404}
+    antes = metricas.requisicoes.valor(**rotulos)
+
+    test_client.get("/pedidos/123")
+    test_client.get("/pedidos/456")
+
+    assert metricas.requisicoes.valor(**rotulos) == antes + 2
+    assert metricas.latencia_requisicoes.contagem(**rotulos) >= 2
+    em_andamento = metricas.requisicoes_em_andamento.valor(
+        method="GET", route="/pedidos/{pedido_id}"
+    )
+    assert em_andamento == 0
+
+
+def test_comandos_sql_por_requisicao(test_client: TestClient):
+    """Cada requisição registra quantos comandos SQL executou."""
+    antes = metricas.comandos_sql_por_requisicao.contagem(route="/produtos/")
+    soma_antes = metricas.comandos_sql_por_requisicao.soma(route="/produtos/")
+
+    test_client.get("/produtos/")
+
+    assert metricas.comandos_sql_por_requisicao.contagem(route="/produtos/") == antes + 1
+    assert metricas.comandos_sql_por_requisicao.soma(route="/produtos/") == soma_antes + 1
+
+
+def test_latencia_da_publicacao_na_sqs(monkeypatch):
+    """As chamadas de publicação na SQS são cronometradas."""
+    monkeypatch.setattr(sqs, "sqs_client", FilaMemoria())
+    monkeypatch.setattr(sqs, "SQS_QUEUE_URL", "https://sqs.local/fila")
+    rotulos = {"operation": "send_message_batch", "outcome": "ok"}
+    antes = metricas.latencia_sqs.contagem(**rotulos)
+
+    sqs.enviar_mensagens_lote([{"tipo": "teste", "n": n} for n in range(15)])
+
+    assert metricas.latencia_sqs.contagem(**rotulos) == antes + 2
+
+
+def test_endpoint_metrics_no_formato_prometheus(test_client: TestClient):
+    """/metrics expõe contadores e histogramas no formato de texto."""
+    test_client.get("/")
+    response = test_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    corpo = response.text
+    assert "# TYPE http_requests_total counter" in corpo
+    assert 'http_requests_total{method="GET",route="/",status="200"}' in corpo
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/",' in corpo
+    assert "# TYPE db_statements_per_request histogram" in corpo
+    assert "db_statements_total " in corpo
+
+
+def test_rota_desconhecida_nao_cria_serie_por_url(test_client: TestClient):
+    """Requisições sem rota caem em um único rótulo, não em um por URL."""
+    rotulos = {"method": "GET", "route": metricas.ROTA_DESCONHECIDA, "status": 404}
+    antes = metricas.requisicoes.valor(**rotulos)
+
+    test_client.get("/nao-existe/1")
+    test_client.get("/nao-existe/2")
+
+    assert metricas.requisicoes.valor(**rotulos) == antes + 2
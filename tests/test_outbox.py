@@ -0,0 +1,117 @@
+"""Testes para a outbox transacional e o relay."""
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app import models, outbox
+
+
+def test_criar_pedido_grava_evento_na_outbox(test_client: TestClient, db_session):
+    """O pedido e seu evento são gravados juntos; o relay publica depois."""
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "Outbox", "email": "outbox@exemplo.com"}
+    ).json()
+    pedido = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}",
+        json={"descricao": "Com evento", "valor_total": 12.5},
+    ).json()
+
+    evento = db_session.query(models.Outbox).one()
+    assert evento.tipo == "pedido.criado"
+    assert evento.status == "pendente"
+
+    # A fila recusa o evento: ele continua pendente e a tentativa é contada.
+    assert outbox.processar_lote(db_session, lambda m: [False] * len(m)) == (0, 1)
+    db_session.refresh(evento)
+    assert (evento.status, evento.tentativas) == ("pendente", 1)
+
+    recebidas = []
+
+    def enviar(mensagens):
+        recebidas.extend(mensagens)
+        return [True] * len(mensagens)
+
+    assert outbox.processar_lote(db_session, enviar) == (1, 0)
+    assert recebidas == [
+        {
+            "tipo": "pedido.criado",
+            "pedido_id": pedido["id"],
+            "cliente_id": cliente["id"],
+            "valor_total": "12.5",
+        }
+    ]
+    assert outbox.processar_lote(db_session, enviar) == (0, 0)
+
+    response = test_client.get("/internal/outbox")
+    assert response.json()["pendentes"] == 0
+
+
+def test_evento_recusado_vezes_demais_vai_para_falhou(
+    test_client: TestClient, db_session, monkeypatch
+):
+    """Na última tentativa o evento sai da fila; reprocessar o devolve."""
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_TENTATIVAS", 2)
+    db_session.add(models.Outbox(tipo="pedido.criado", payload="{}"))
+    db_session.commit()
+    recusar = lambda m: [False] * len(m)  # noqa: E731
+
+    assert outbox.processar_lote(db_session, recusar) == (0, 1)
+    assert outbox.processar_lote(db_session, recusar) == (0, 1)
+    assert outbox.processar_lote(db_session, recusar) == (0, 0)
+    evento = db_session.query(models.Outbox).one()
+    assert (evento.status, evento.tentativas) == ("falhou", 2)
+    assert test_client.get("/internal/outbox").json()["falhados"] == 1
+
+    assert outbox.reprocessar_falhados(db_session) == 1
+    evento = db_session.query(models.Outbox).one()
+    assert (evento.status, evento.tentativas) == ("pendente", 0)
+
+
+def test_fila_fora_do_ar_nao_gasta_tentativas(db_session, monkeypatch):
+    """Erro de transporte mantém os eventos pendentes, por mais que se repita."""
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_TENTATIVAS", 3)
+    db_session.add_all(
+        [models.Outbox(tipo="pedido.criado", payload="{}") for _ in range(2)]
+    )
+    db_session.commit()
+
+    def fora_do_ar(mensagens):
+        raise ConnectionError("SQS indisponível")
+
+    def sem_envio(mensagens):
+        return [None] * len(mensagens)
+
+    for _ in range(25):
+        assert outbox.processar_lote(db_session, fora_do_ar) == (0, 2)
+        assert outbox.processar_lote(db_session, sem_envio) == (0, 2)
+
+    eventos = db_session.query(models.Outbox.status, models.Outbox.tentativas).all()
+    assert eventos == [("pendente", 0), ("pendente", 0)]
+
+
+def test_purga_remove_enviados_antigos_em_lotes(db_session):
+    """Só os enviados além da retenção saem; pendentes e recentes ficam."""
+    agora = datetime.now(timezone.utc)
+    antigo = agora - timedelta(days=10)
+    db_session.add_all(
+        [
+            models.Outbox(
+                tipo="pedido.criado", payload="{}", status="enviado", enviado_em=antigo
+            )
+            for _ in range(5)
+        ]
+        + [
+            models.Outbox(
+                tipo="pedido.criado", payload="{}", status="enviado", enviado_em=agora
+            ),
+            models.Outbox(tipo="pedido.criado", payload="{}"),
+        ]
+    )
+    db_session.commit()
+
+    retencao = 7 * 86400
+    assert outbox.purgar_enviados(db_session, retencao, lote=2, maximo_lotes=1) == 2
+    assert outbox.purgar_enviados(db_session, retencao, lote=2) == 3
+    restantes = db_session.query(models.Outbox.status).order_by(models.Outbox.id).all()
+    assert restantes == [("enviado",), ("pendente",)]
@@ -0,0 +1,129 @@
+"""Testes para o router de pagamentos e o rollup de faturamento."""
+
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app import crud, models
+
+
+def _criar_pedido(test_client: TestClient) -> int:
+    """Cria um cliente e um pedido, retornando o ID do pedido."""
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "Pagador", "email": "pagador@exemplo.com"}
+    ).json()
+    pedido = test_client.post(
+        f"/pedidos/?cliente_id={cliente['id']}", json={"descricao": "Pedido pago"}
+    ).json()
+    return pedido["id"]
+
+
+def _faturamento_hoje(test_client: TestClient) -> float:
+    """Consulta o relatório de faturamento para o dia atual (UTC)."""
+    hoje = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    response = test_client.get(
+        "/relatorios/faturamento", params={"inicio": hoje, "fim": hoje}
+    )
+    assert response.status_code == 200
+    return response.json()["total_faturado"]
+
+
+def test_faturamento_acompanha_transicoes_de_status(
+    test_client: TestClient, db_session
+):
+    """Entrar e sair de 'pago' atualiza o rollup; a reconstrução bate com ele."""
+    pedido_id = _criar_pedido(test_client)
+    ids = []
+    for valor, forma in ((100.0, "pix"), (50.0, "pix"), (30.0, "boleto")):
+        response = test_client.post(
+            "/pagamentos/",
+            json={"pedido_id": pedido_id, "valor": valor, "forma_pagamento": forma},
+        )
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+
+    assert _faturamento_hoje(test_client) == 0.0
+
+    for pagamento_id in ids:
+        test_client.put(f"/pagamentos/{pagamento_id}", json={"status": "pago"})
+    assert _faturamento_hoje(test_client) == 180.0
+
+    # Repetir o mesmo status não conta duas vezes.
+    test_client.put(f"/pagamentos/{ids[0]}", json={"status": "pago"})
+    test_client.put(f"/pagamentos/{ids[1]}", json={"status": "cancelado"})
+    assert _faturamento_hoje(test_client) == 130.0
+
+    assert test_client.delete(f"/pagamentos/{ids[2]}").status_code == 204
+    assert _faturamento_hoje(test_client) == 100.0
+
+    incremental = {
+        (r.dia, r.forma_pagamento): (r.total, r.quantidade)
+        for r in db_session.query(models.FaturamentoDiario)
+        if r.quantidade
+    }
+    crud.reconstruir_faturamento_diario(db_session)
+    reconstruido = {
+        (r.dia, r.forma_pagamento): (r.total, r.quantidade)
+        for r in db_session.query(models.FaturamentoDiario)
+    }
+    assert reconstruido == incremental
+
+
+def test_remover_pedido_tira_pagamentos_pagos_do_faturamento(
+    test_client: TestClient, db_session
+):
+    """Os pagamentos pagos de um pedido removido saem do rollup e do cache."""
+    pedido_id = _criar_pedido(test_client)
+    ids = []
+    for valor, status in ((10.0, "pago"), (5.0, "pago"), (7.0, "pendente")):
+        pagamento = test_client.post(
+            "/pagamentos/",
+            json={"pedido_id": pedido_id, "valor": valor, "forma_pagamento": "pix"},
+        ).json()
+        test_client.put(f"/pagamentos/{pagamento['id']}", json={"status": status})
+        ids.append(pagamento["id"])
+    assert _faturamento_hoje(test_client) == 15.0
+    assert test_client.get(f"/pagamentos/{ids[0]}").status_code == 200
+
+    assert test_client.delete(f"/pedidos/{pedido_id}").status_code == 200
+
+    assert _faturamento_hoje(test_client) == 0.0
+    assert all(test_client.get(f"/pagamentos/{i}").status_code == 404 for i in ids)
+    incremental = {
+        (r.dia, r.forma_pagamento): (r.total, r.quantidade)
+        for r in db_session.query(models.FaturamentoDiario)
+        if r.quantidade
+    }
+    crud.reconstruir_faturamento_diario(db_session)
+    reconstruido = {
+        (r.dia, r.forma_pagamento): (r.total, r.quantidade)
+        for r in db_session.query(models.FaturamentoDiario)
+    }
+    assert reconstruido == incremental == {}
+
+
+def test_atualizacao_de_status_em_um_unico_update(
+    test_client: TestClient, contador_consultas
+):
+    """Cada troca de status é um UPDATE condicional, sem SELECT antes ou depois."""
+    pedido_id = _criar_pedido(test_client)
+    pagamento = test_client.post(
+        "/pagamentos/",
+        json={"pedido_id": pedido_id, "valor": 20.0, "forma_pagamento": "pix"},
+    ).json()
+    url = f"/pagamentos/{pagamento['id']}"
+
+    contador_consultas.clear()
+    response = test_client.put(url, json={"status": "cancelado"})
+    assert response.json()["status"] == "cancelado"
+    assert [c.split()[0] for c in contador_consultas] == ["UPDATE"]
+
+    contador_consultas.clear()
+    assert test_client.put(url, json={"status": "pago"}).json()["status"] == "pago"
+    # UPDATE do pagamento e upsert no rollup de faturamento.
+    assert [c.split()[0] for c in contador_consultas] == ["UPDATE", "INSERT"]
+    assert _faturamento_hoje(test_client) == 20.0
+
+    response = test_client.put("/pagamentos/999", json={"status": "pago"})
+    assert response.status_code == 404
+    assert test_client.delete("/pagamentos/999").status_code == 404
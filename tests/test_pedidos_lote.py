@@ -0,0 +1,69 @@
+"""Testes para a criação de pedidos em lote."""
+
+from fastapi.testclient import TestClient
+
+from app import models, outbox, sqs
+
+
+class FilaFalsa:
+    """Cliente SQS falso que registra as chamadas a send_message_batch."""
+
+    def __init__(self):
+        """Inicializa a lista de lotes recebidos."""
+        self.lotes = []
+
+    def send_message_batch(self, QueueUrl, Entries):  # noqa: N803
+        """Aceita todas as entradas do lote."""
+        self.lotes.append(Entries)
+        return {"Successful": [{"Id": e["Id"]} for e in Entries], "Failed": []}
+
+
+def test_criar_pedidos_lote(
+    test_client: TestClient, db_session, contador_consultas, monkeypatch
+):
+    """Cria 25 pedidos válidos e 1 inválido; o relay publica em lotes de 10."""
+    fila = FilaFalsa()
+    monkeypatch.setattr(sqs, "sqs_client", fila)
+    monkeypatch.setattr(sqs, "SQS_QUEUE_URL", "https://sqs.local/fila")
+
+    cliente = test_client.post(
+        "/clientes/", json={"nome": "Marketplace", "email": "mkt@exemplo.com"}
+    ).json()
+    pedidos = [
+        {"cliente_id": cliente["id"], "descricao": f"Pedido {i}", "valor_total": i}
+        for i in range(25)
+    ]
+    pedidos.insert(3, {"cliente_id": 9999, "descricao": "Cliente inexistente"})
+
+    contador_consultas.clear()
+    response = test_client.post("/pedidos/lote", json={"pedidos": pedidos})
+    assert response.status_code == 200
+    resultado = response.json()
+
+    assert len(resultado["criados"]) == 25
+    assert all(p["id"] for p in resultado["criados"])
+    # Os criados voltam na ordem do lote recebido.
+    assert [p["descricao"] for p in resultado["criados"]] == [
+        p["descricao"] for p in pedidos if p["cliente_id"] != 9999
+    ]
+    assert resultado["falhas"] == [
+        {"indice": 3, "cliente_id": 9999, "erro": "Cliente não encontrado"}
+    ]
+    # Validação de clientes + INSERTs em lote, sem um comando por pedido.
+    assert len(contador_consultas) < 10
+
+    # Nenhuma chamada à SQS no caminho da requisição; os eventos estão na outbox.
+    assert fila.lotes == []
+    assert outbox.contar_pendentes(db_session) == 25
+    assert outbox.processar_lote(db_session, sqs.enviar_mensagens_lote) == (25, 0)
+    assert [len(lote) for lote in fila.lotes] == [10, 10, 5]
+    assert outbox.contar_pendentes(db_session) == 0
+    assert db_session.query(models.Outbox).filter_by(status="enviado").count() == 25
+
+    assert len(test_client.get("/pedidos/", params={"limit": 100}).json()) == 25
+
+
+def test_criar_pedidos_lote_vazio(test_client: TestClient):
+    """Um lote vazio é rejeitado na validação."""
+    response = test_client.post("/pedidos/lote", json={"pedidos": []})
+    assert response.status_code == 422
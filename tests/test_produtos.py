@@ -65,3 +65,68 @@ def test_ciclo_de_vida_do_produto(test_client: TestClient):
     assert (
         response_get_after_delete.status_code == status.HTTP_404_NOT_FOUND
     ), "Produto não foi removido corretamente"
+
+
+def test_paginacao_por_cursor(test_client: TestClient):
+    """Percorre a listagem de produtos usando o cursor do cabeçalho X-Next-Cursor."""
+    for i in range(5):
+        produto = {
+            "nome": f"Produto {i}",
+            "preco": 10.0 + i,
+            "categoria": "Testes",
+            "qtd_estoque": i,
+        }
+        assert test_client.post("/produtos/", json=produto).status_code == 201
+
+    nomes = []
+    cursor = None
+    paginas = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = test_client.get("/produtos/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        nomes.extend(p["nome"] for p in response.json())
+        paginas += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert nomes == [f"Produto {i}" for i in range(5)]
+    assert paginas == 3
+
+
+def test_paginacao_limite_maximo_e_cursor_invalido(test_client: TestClient):
+    """O limite é restringido no servidor e cursores inválidos retornam 400."""
+    from app.paginacao import LIMITE_MAXIMO
+
+    response = test_client.get("/produtos/", params={"limit": LIMITE_MAXIMO * 10})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = test_client.get("/produtos/", params={"cursor": "@@invalido@@"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_atualizar_e_deletar_em_um_unico_comando(
+    test_client: TestClient, contador_consultas
+):
+    """PUT e DELETE fazem um único comando e decidem o 404 pelo rowcount."""
+    dados = {"nome": "Régua", "preco": 3.5, "categoria": "papelaria", "qtd_estoque": 9}
+    produto = test_client.post("/produtos/", json=dados).json()
+    url = f"/produtos/{produto['id']}"
+    etag_antes = test_client.get(url).headers["ETag"]
+
+    contador_consultas.clear()
+    response = test_client.put(url, json={**dados, "qtd_estoque": 4})
+    assert response.status_code == 200
+    assert response.json() == {**dados, "qtd_estoque": 4, "id": produto["id"]}
+    assert len(contador_consultas) == 1
+    assert contador_consultas[0].startswith("UPDATE produtos")
+    assert test_client.get(url).headers["ETag"] != etag_antes
+
+    contador_consultas.clear()
+    assert test_client.delete(url).status_code == 200
+    assert len(contador_consultas) == 1
+    assert test_client.delete(url).status_code == 404
+    assert test_client.put(url, json=dados).status_code == 404
@@ -0,0 +1,86 @@
+"""Testes para o router de relatórios."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app import models
+
+
+def _popular_clientes(db_session):
+    """Cria três clientes, sendo um deles sem pedidos."""
+    clientes = [
+        models.Cliente(nome=nome, email=f"{nome.lower()}@exemplo.com")
+        for nome in ("Ana", "Bia", "Caio")
+    ]
+    db_session.add_all(clientes)
+    db_session.flush()
+    db_session.add_all(
+        [
+            models.Pedido(descricao="P1", cliente_id=clientes[0].id),
+            models.Pedido(descricao="P2", cliente_id=clientes[0].id),
+            models.Pedido(descricao="P3", cliente_id=clientes[1].id),
+        ]
+    )
+    db_session.commit()
+
+
+def test_pedidos_por_cliente_inclui_clientes_sem_pedidos(
+    test_client: TestClient, db_session, contador_consultas
+):
+    """O relatório usa uma única consulta e mantém clientes sem pedidos."""
+    _popular_clientes(db_session)
+
+    contador_consultas.clear()
+    response = test_client.get("/relatorios/pedidos-por-cliente")
+    assert response.status_code == 200
+    totais = {r["nome_cliente"]: r["total_pedidos"] for r in response.json()}
+    assert totais == {"Ana": 2, "Bia": 1, "Caio": 0}
+    assert len(contador_consultas) == 1
+
+
+def test_pedidos_por_cliente_paginado_e_ndjson(test_client: TestClient, db_session):
+    """O relatório pode ser paginado por cursor ou transmitido como NDJSON."""
+    _popular_clientes(db_session)
+
+    pagina = test_client.get("/relatorios/pedidos-por-cliente", params={"limit": 2})
+    assert len(pagina.json()) == 2
+    cursor = pagina.headers["X-Next-Cursor"]
+    resto = test_client.get(
+        "/relatorios/pedidos-por-cliente", params={"limit": 2, "cursor": cursor}
+    )
+    assert [r["nome_cliente"] for r in resto.json()] == ["Caio"]
+    assert "X-Next-Cursor" not in resto.headers
+
+    response = test_client.get(
+        "/relatorios/pedidos-por-cliente", params={"formato": "ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    linhas = [json.loads(linha) for linha in response.text.splitlines()]
+    assert [linha["total_pedidos"] for linha in linhas] == [2, 1, 0]
+
+
+def test_relatorios_em_cache_invalidados_por_escritas(
+    test_client: TestClient, contador_consultas
+):
+    """O segundo acesso vem do cache; escritas relevantes o invalidam."""
+    produto = {"nome": "Cabo", "preco": 9.9, "categoria": "Acessórios", "qtd_estoque": 2}
+    produto_id = test_client.post("/produtos/", json=produto).json()["id"]
+
+    response = test_client.get("/relatorios/produtos-estoque-baixo")
+    assert [p["qtd_estoque"] for p in response.json()] == [2]
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+    assert response.headers["Age"] == "0"
+
+    contador_consultas.clear()
+    assert test_client.get("/relatorios/produtos-estoque-baixo").json() == response.json()
+    assert contador_consultas == []
+
+    test_client.put(f"/produtos/{produto_id}", json={**produto, "qtd_estoque": 50})
+    assert test_client.get("/relatorios/produtos-estoque-baixo").json() == []
+
+    assert test_client.get("/relatorios/pedidos-por-cliente").json() == []
+    test_client.post("/clientes/", json={"nome": "Nova", "email": "nova@exemplo.com"})
+    relatorio = test_client.get("/relatorios/pedidos-por-cliente").json()
+    assert [r["nome_cliente"] for r in relatorio] == ["Nova"]
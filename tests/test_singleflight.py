@@ -0,0 +1,100 @@
+"""Testes para a coalescência de buscas concorrentes (single-flight)."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.singleflight import SingleFlight, SingleFlightAsync
+
+
+def test_singleflight_coalesce_threads():
+    """Vinte threads com a mesma chave disparam uma única busca."""
+    grupo = SingleFlight()
+    buscas = []
+
+    def buscar():
+        buscas.append(1)
+        # Segura a busca até todas as outras threads estarem esperando.
+        limite = time.monotonic() + 5
+        while grupo.metricas()["coalescidas"] < 19 and time.monotonic() < limite:
+            time.sleep(0.005)
+        return {"id": 1}
+
+    resultados = []
+    threads = [
+        threading.Thread(
+            target=lambda: resultados.append(grupo.executar("produto:1", buscar))
+        )
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(buscas) == 1
+    assert resultados == [{"id": 1}] * 20
+    assert grupo.metricas() == {"executadas": 1, "coalescidas": 19, "em_andamento": 0}
+
+
+def test_singleflight_propaga_erro_e_libera_a_chave():
+    """A exceção da busca chega a quem chamou e a chave pode ser buscada de novo."""
+    grupo = SingleFlight()
+
+    def falhar():
+        raise RuntimeError("banco fora do ar")
+
+    with pytest.raises(RuntimeError):
+        grupo.executar("pedido:1", falhar)
+    assert grupo.executar("pedido:1", lambda: "ok") == "ok"
+
+
+def test_singleflight_async_coalesce_corrotinas():
+    """Corrotinas concorrentes com a mesma chave aguardam a mesma busca."""
+    grupo = SingleFlightAsync()
+    buscas = []
+
+    async def buscar():
+        buscas.append(1)
+        await asyncio.sleep(0.01)
+        return "produto"
+
+    async def cenario():
+        return await asyncio.gather(
+            *(grupo.executar("produto:1", buscar) for _ in range(10)),
+            grupo.executar("produto:2", buscar),
+        )
+
+    assert asyncio.run(cenario()) == ["produto"] * 11
+    assert len(buscas) == 2
+    assert grupo.metricas()["coalescidas"] == 9
+
+
+def test_singleflight_async_cancelar_o_primeiro_nao_afeta_os_demais():
+    """Se a corrotina que iniciou a busca é cancelada, as demais recebem o resultado."""
+    grupo = SingleFlightAsync()
+    liberar = asyncio.Event()
+
+    async def buscar():
+        await liberar.wait()
+        return "produto"
+
+    async def cenario():
+        primeiro = asyncio.create_task(grupo.executar("produto:1", buscar))
+        await asyncio.sleep(0)
+        seguidores = [
+            asyncio.create_task(grupo.executar("produto:1", buscar)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        primeiro.cancel()
+        await asyncio.sleep(0)
+        liberar.set()
+        resultados = await asyncio.gather(primeiro, *seguidores, return_exceptions=True)
+        return [
+            type(r).__name__ if isinstance(r, BaseException) else r for r in resultados
+        ]
+
+    assert asyncio.run(cenario()) == ["CancelledError", "produto", "produto"]
+    assert grupo.metricas() == {"executadas": 1, "coalescidas": 2, "em_andamento": 0}
@@ -0,0 +1,94 @@
+"""Testes para o codec das mensagens da SQS."""
+
+import json
+import logging
+
+import pytest
+
+from app import sqs
+
+EVENTO = {"tipo": "pedido.criado", "pedido_id": 7, "valor_total": "12.5"}
+
+
+def test_codec_json_compacto_com_envelope():
+    """Sem compressão, o corpo é JSON compacto com a versão do envelope."""
+    corpo = sqs.codificar_mensagem(EVENTO, codec="json", comprimir_acima=0)
+
+    assert " " not in corpo
+    assert json.loads(corpo) == {
+        "v": sqs.VERSAO_ENVELOPE,
+        "tipo": "pedido.criado",
+        "dados": {"pedido_id": 7, "valor_total": "12.5"},
+    }
+    assert sqs.decodificar_mensagem(corpo) == EVENTO
+
+
+def test_codec_comprime_corpos_grandes():
+    """Corpos acima do limite são comprimidos e continuam decodificáveis."""
+    evento = {"tipo": "pedido.lote", "ids": list(range(2000))}
+    corpo = sqs.codificar_mensagem(evento, codec="json", comprimir_acima=1024)
+
+    assert corpo.startswith("json+zlib:")
+    assert len(corpo) < len(sqs.codificar_mensagem(evento, comprimir_acima=0))
+    assert sqs.decodificar_mensagem(corpo) == evento
+
+
+def test_codec_msgpack():
+    """Com msgpack instalado, o corpo é binário em base64."""
+    pytest.importorskip("msgpack")
+    corpo = sqs.codificar_mensagem(EVENTO, codec="msgpack", comprimir_acima=0)
+
+    assert corpo.startswith("msgpack:")
+    assert sqs.decodificar_mensagem(corpo) == EVENTO
+
+
+@pytest.mark.parametrize(
+    "corpo",
+    ["{'tipo': 'pedido.criado'}", '{"v": 99, "tipo": "x"}', "json+gzip:AAAA", "[]"],
+)
+def test_decodificar_rejeita_corpos_invalidos(corpo):
+    """Reprs de Python, versões e formatos desconhecidos são rejeitados."""
+    with pytest.raises(sqs.MensagemInvalida):
+        sqs.decodificar_mensagem(corpo)
+
+
+class FilaInstavel:
+    """Cliente SQS falso: o primeiro lote cai; no segundo, recusa a entrada 11."""
+
+    def __init__(self):
+        """Inicializa o contador de chamadas."""
+        self.chamadas = 0
+
+    def send_message_batch(self, QueueUrl, Entries):  # noqa: N803
+        """Levanta na primeira chamada; depois aceita tudo menos o Id 11."""
+        self.chamadas += 1
+        if self.chamadas == 1:
+            raise ConnectionError("SQS indisponível")
+        return {
+            "Successful": [{"Id": e["Id"]} for e in Entries if e["Id"] != "11"],
+            "Failed": [{"Id": "11", "Message": "recusada"}],
+        }
+
+
+def test_envio_em_lote_distingue_queda_de_recusa(monkeypatch):
+    """Lote que não chegou à fila: None; entrada em Failed: False."""
+    monkeypatch.setattr(sqs, "sqs_client", FilaInstavel())
+    monkeypatch.setattr(sqs, "SQS_QUEUE_URL", "https://fila")
+
+    resultados = sqs.enviar_mensagens_lote([{"tipo": "t", "n": n} for n in range(12)])
+
+    assert resultados == [None] * 10 + [True, False]
+
+
+def test_codec_msgpack_ausente_avisa_uma_vez(monkeypatch, caplog):
+    """Sem msgpack, SQS_CODEC=msgpack vira JSON ao resolver o codec, com um só aviso."""
+    monkeypatch.setattr(sqs, "msgpack", None)
+    with caplog.at_level(logging.WARNING, logger="app.sqs"):
+        monkeypatch.setattr(sqs, "SQS_CODEC", sqs._resolver_codec("msgpack"))
+        corpos = [sqs.codificar_mensagem(EVENTO, comprimir_acima=0) for _ in range(10)]
+
+    assert sqs.SQS_CODEC == "json"
+    assert all(json.loads(corpo)["tipo"] == "pedido.criado" for corpo in corpos)
+    assert len(caplog.records) == 1
+    with pytest.raises(ValueError):
+        sqs._resolver_codec("avro")